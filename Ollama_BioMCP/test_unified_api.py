@@ -10,40 +10,76 @@
 # https://biomcp.org/mcp_integration/
 
 import asyncio
+from contextlib import AsyncExitStack
 
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
-from mcp.types import TextContent
+from mcp.types import TextContent as McpTextContent
 
 import asyncio
+import httpx
 import ollama
 from dataclasses import dataclass
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Tuple, Union
 
-@dataclass
+OLLAMA_HOST = "http://localhost:11434"
+
+# Static catalogs advertised by both agents; shared rather than rebuilt per call
+PROMPTS: Tuple[str, ...] = ("Default prompt (internal)",)
+TOOLS: Tuple[str, ...] = ("think", "fetch")
+
+# (command, args) -> (prompts, resources, tools) from BioMCPAgent.discover
+_DISCOVERY_CACHE: Dict[Tuple, Tuple] = {}
+
+# One keep-alive connection pool shared by every OllamaAgent
+_ollama_client: Optional[ollama.AsyncClient] = None
+
+
+def shared_ollama_client() -> ollama.AsyncClient:
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = ollama.AsyncClient(
+            host=OLLAMA_HOST,
+            timeout=120,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+    return _ollama_client
+
+
+async def close_shared_ollama_client():
+    global _ollama_client
+    if _ollama_client is not None:
+        await _ollama_client.close()
+        _ollama_client = None
+
+# Explicit __slots__ rather than dataclass(slots=True), which needs Python 3.10+
+@dataclass(frozen=True)
 class TextContent:
+    __slots__ = ("type", "text")
     type: str
     text: str
 
 
 @dataclass
 class ToolResult:
+    __slots__ = ("isError", "content")
     isError: bool
     content: Union[str, List[TextContent]]
 
 
 class OllamaAgent:
-    def __init__(self, model: str = "phi3:mini"):
+    def __init__(self, model: str = "phi3:mini", client: Optional[ollama.AsyncClient] = None):
         self.model = model
+        self._client = client or shared_ollama_client()
 
     async def initialize(self):
         print("Ollama: Agent initialized.")
 
-    async def list_prompts(self) -> List[str]:
-        return ["Default prompt (internal)"]
+    async def list_prompts(self) -> Tuple[str, ...]:
+        return PROMPTS
 
-    async def list_tools(self) -> List[str]:
-        return ["think", "fetch"]
+    async def list_tools(self) -> Tuple[str, ...]:
+        return TOOLS
 
     async def call_tool(self, tool: str, args: dict) -> ToolResult:
         if tool == "think":
@@ -61,9 +97,10 @@ class OllamaAgent:
             return ToolResult(isError=True, content=f"Unknown tool: {tool}")
 
         try:
-            response = ollama.chat(
+            response = await self._client.chat(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
+                keep_alive="30m",
             )
             message = response["message"]["content"]
             return ToolResult(
@@ -75,7 +112,7 @@ class OllamaAgent:
 
 
 class BioMCPAgent:
-    def __init__(self):
+    def __init__(self, discover_on_init: bool = False):
         self.server_params = StdioServerParameters(
         command="uv",
         args=["run", "--with", "biomcp-python", "biomcp", "run"],
@@ -86,82 +123,79 @@ class BioMCPAgent:
     #     command="python",
     #     args=["-m", "biomcp", "run"],
     # )
+        self.discover_on_init = discover_on_init
         self.session = None
-
-    async def initialize(self):
-        async with (stdio_client(self.server_params) as (read, write),
-                    ClientSession(read, write) as session):
-            await session.initialize()
-            self.session = session
-            
-            # list prompts
+        self._exit_stack = None
+
+    async def connect(self):
+        # One server subprocess + handshake for the agent's lifetime
+        self._exit_stack = AsyncExitStack()
+        read, write = await self._exit_stack.enter_async_context(
+            stdio_client(self.server_params)
+        )
+        self.session = await self._exit_stack.enter_async_context(
+            ClientSession(read, write)
+        )
+        await self.session.initialize()
+        if self.discover_on_init:
+            await self.discover()
+
+    async def discover(self) -> Tuple:
+        # Prompts/resources/tools don't change within a run, so agents
+        # pointing at the same server share one discovery
+        key = (self.server_params.command, tuple(self.server_params.args))
+        if key not in _DISCOVERY_CACHE:
             prompts = await self.session.list_prompts()
-            print("Available prompts:", prompts)
-    
-            # list resources
             resources = await self.session.list_resources()
-            print("Available resources:", resources)
-    
-            # list tools
             tool_result = await self.session.list_tools()
-            tools = tool_result.tools
-            print("Available tools:", tools)
-
-    async def list_prompts(self) -> List[str]:
-        return ["Default prompt (internal)"]
-
-    async def list_tools(self) -> List[str]:
-        return ["think", "fetch"]
-
-    async def call_tool(self, tool: str, arg: dict):
-        async with (stdio_client(self.server_params) as (read, write),
-            ClientSession(read, write) as session):
-            await session.initialize()
-            if tool == "think":
-                try:
-                    think_result = await session.call_tool(
-                        tool,
-                        arg,
-                    )
-                    assert (
-                        think_result.isError is False
-                    )
-                except Exception as e:
-                    return ToolResult(isError=True, content=str(e))
-                return think_result
-            elif tool == "fetch":
-                try:
-                    result = await self.call_tool(tool, arg)
-                    assert result.isError is False, f"Error: {result.content}"
-            
-                    # --- Assertions ---
-                    # 1. Check the call was successful (not an error)
-                    assert (
-                        result.isError is False
-                    ), f"Tool call resulted in error: {result.content}"
-            
-                    # 2. Check there is content
-                    assert result.content is not None
-                    assert len(result.content) >= 1
-            
-                    # 3. Check the type of the first content block
-                    content_block = result.content[0]
-                    assert isinstance(content_block, TextContent)
-            
-                    markdown_output = content_block.text
-                    print(markdown_output)
-                    assert isinstance(markdown_output, str)
-                    assert "rs113488022" in markdown_output
-                    assert "BRAF" in markdown_output
-                    #assert "Pathogenic" in markdown_output
-                    print(f"Successfully called tool '{tool_name}' with args {tool_args}")
-                except Exception as e:
-                    return ToolResult(isError=True, content=str(e))
-    
-                return result
-            else:
-                return ToolResult(isError=True, content=f"Unknown tool: {tool}")
+            _DISCOVERY_CACHE[key] = (prompts, resources, tool_result.tools)
+        prompts, resources, tools = _DISCOVERY_CACHE[key]
+        print("Available prompts:", prompts)
+        print("Available resources:", resources)
+        print("Available tools:", tools)
+        return _DISCOVERY_CACHE[key]
+
+    async def disconnect(self):
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+        self.session = None
 
+    async def list_prompts(self) -> Tuple[str, ...]:
+        return PROMPTS
+
+    async def list_tools(self) -> Tuple[str, ...]:
+        return TOOLS
+
+    async def call_tool(self, tool: str, arg: dict, validate: bool = False):
+        if tool not in TOOLS:
+            return ToolResult(isError=True, content=f"Unknown tool: {tool}")
+        try:
+            result = await self.session.call_tool(tool, arg)
+            assert result.isError is False, f"Tool call resulted in error: {result.content}"
+            if validate and tool == "fetch":
+                self._validate_fetch(result)
+        except Exception as e:
+            return ToolResult(isError=True, content=str(e))
+        return result
+
+    @staticmethod
+    def _validate_fetch(result):
+        # 1. Check there is content
+        assert result.content is not None
+        assert len(result.content) >= 1
+
+        # 2. Check the type of the first content block (the MCP type, not
+        #    the local TextContent dataclass below)
+        content_block = result.content[0]
+        assert isinstance(content_block, McpTextContent)
+
+        markdown_output = content_block.text
+        print(markdown_output)
+        assert isinstance(markdown_output, str)
+        assert "rs113488022" in markdown_output
+        assert "BRAF" in markdown_output
+        #assert "Pathogenic" in markdown_output
 
 
 async def main():
@@ -169,25 +203,30 @@ async def main():
     await ollama_agent.initialize()
 
     bio_agent = BioMCPAgent()
-    await bio_agent.initialize()
+    await bio_agent.connect()
+    try:
+        await _run(ollama_agent, bio_agent)
+    finally:
+        await bio_agent.disconnect()
+        await close_shared_ollama_client()
+
 
+async def _run(ollama_agent: OllamaAgent, bio_agent: BioMCPAgent):
     print("Available tools in ollama:", await ollama_agent.list_tools())
     print("Available tools in biomcp:", await bio_agent.list_tools())
 
     
-    think_result_1 = await bio_agent.call_tool("think", {
+    think_args = {
         "thought": "rs113488022 in BRAF gene",
         "thoughtNumber": 1,
         "totalThoughts": 2,
         "nextThoughtNeeded": True,
-    })
-
-    think_result_2 = await ollama_agent.call_tool("think", {
-        "thought": "rs113488022 in BRAF gene",
-        "thoughtNumber": 1,
-        "totalThoughts": 2,
-        "nextThoughtNeeded": True,
-    })
+    }
+    # bio and ollama are independent services, so query them concurrently
+    think_result_1, think_result_2 = await asyncio.gather(
+        bio_agent.call_tool("think", think_args),
+        ollama_agent.call_tool("think", think_args),
+    )
 
     if think_result_2.isError:
         print("Think tool ollama failed:", think_result_2.content)
@@ -199,15 +238,14 @@ async def main():
     print("\nThink Output ollama:\n", think_result_2)
     
 
-    fetch_result_1 = await bio_agent.call_tool("fetch", {
+    fetch_args = {
         "domain": "variant",
         "id": "rs113488022",
-    })
-
-    fetch_result_2 = await ollama_agent.call_tool("fetch", {
-        "domain": "variant",
-        "id": "rs113488022",
-    })
+    }
+    fetch_result_1, fetch_result_2 = await asyncio.gather(
+        bio_agent.call_tool("fetch", fetch_args, validate=True),
+        ollama_agent.call_tool("fetch", fetch_args),
+    )
 
     if fetch_result_1.isError:
         print("Fetch tool failed bio:", fetch_result_1.content)
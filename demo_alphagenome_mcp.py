@@ -8,37 +8,279 @@ It showcases variant effect predictions combined with literature and clinical da
 """
 
 import asyncio
+import hashlib
+import io
+import json
 import logging
 import os
+import time
 from datetime import datetime
-from typing import Dict, List, Any
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from uuid import uuid4
 
 from bioagent import BiomedicalAgent
-from bioagent.core.models import AgentConfiguration, ResearchContext
+from bioagent.core.models import (
+    AgentConfiguration, AgentMessage, ResearchContext, ToolCall, ToolParameter, ToolResult
+)
 from bioagent.biomcp.tools import biomcp_tools
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Read once at import; every phase of the demo shares it
+ALPHAGENOME_API_KEY: Optional[str] = os.getenv('ALPHAGENOME_API_KEY')
+
+# Output rules, built once rather than per print
+SEP = "=" * 80
+RULE = "-" * 60
+DASH = "-" * 50
+DASH_NL = DASH + "\n"
+
+# Number of variants marshalled into a single LLM prompt per pipeline step
+DEFAULT_BATCH_SIZE = 3
+
+# Generation budget per variant for steps whose output is only previewed
+PREVIEW_TOKENS = 128
+
+# Prompt templates, built once and filled with str.format_map so identical
+# inputs always produce byte-identical prompts (stable LLM cache keys)
+VARIANT_ROW_TMPL = "{gene} {variant} - {description} ({disease})"
+BATCH_PROMPT_TMPL = (
+    "{instruction}\n\n"
+    "For each variant below, return a JSON array with one object per "
+    "variant, in the same order, with fields {{\"gene\", \"summary\"}}.\n"
+    "Variants:\n{rows}"
+)
+LITERATURE_TMPL = (
+    "Search for recent literature on each gene's variants in the associated disease. "
+    "Focus on pathogenicity, functional effects, and clinical significance. "
+    "Limit to the most relevant 5 papers per gene."
+)
+VARIANTDB_TMPL = (
+    "Search for variants in each gene using the variant database. "
+    "Focus on pathogenic and likely pathogenic variants. "
+    "Get detailed information about functional consequences."
+)
+ALPHAGENOME_TMPL = (
+    "Simulate an AlphaGenome prediction for each variant. "
+    "Note: AlphaGenome expects format like 'chr7:140753336 A>T' (chromosome:position ref>alt). "
+    "Based on the literature and variant data we've gathered, what would be the "
+    "expected pathogenicity score (0-1), functional impact, and molecular consequences? "
+    "Consider protein structure, domain effects, and evolutionary conservation. "
+    "Include confidence score and effect prediction."
+)
+TRIALS_TMPL = (
+    "Search for clinical trials targeting each gene-related disease. "
+    "What therapeutic strategies are being investigated? "
+    "Are there any precision medicine approaches?"
+)
+INTEGRATION_TMPL = (
+    "Integrate all the information we've gathered for each variant: "
+    "literature evidence, variant database information, AlphaGenome predictions, "
+    "and clinical trial data. What is the clinical significance of each variant? "
+    "What are the therapeutic implications?"
+)
+SYNTHESIS_TMPL = (
+    "Based on our analysis of {count} variants across different genes "
+    "({genes}), provide a comprehensive "
+    "research synthesis. How do AlphaGenome predictions complement traditional "
+    "biomedical database information? What are the key insights for precision medicine? "
+    "What experimental validation approaches would you recommend?"
+)
+
+# Sample values for probing AlphaGenome tools (BRAF V600E). Exact parameter
+# names are looked up first, then substring rules, then type fallbacks.
+PARAM_DEFAULTS: Dict[str, Any] = {
+    "variant": "chr7:140753336 A>T",
+    "gene": "BRAF",
+    "chromosome": "chr7",
+    "position": 140753336,  # Position should be integer, not string
+    "ref": "A",
+    "reference": "A",
+    "alt": "T",  # Nucleotide, not gene name
+    "alternative": "T",
+    "alternate": "T",
+}
+PARAM_SUBSTRING_RULES: Tuple[Tuple[str, Any], ...] = (
+    ("chr", "chr7"),
+    ("pos", 140753336),
+    ("ref", "A"),
+    ("alt", "T"),
+)
+PARAM_TYPE_DEFAULTS: Dict[str, Any] = {
+    "integer": 140753336,
+    "boolean": True,
+    "array": ["BRAF"],
+}
+API_KEY_PARAMS = frozenset({"api_key", "key"})
+
+# The tool catalog changes on deploys, not per call, so listings are reused
+TOOLS_CACHE_TTL = 300.0
+_tools_cache: Dict[str, Any] = {"t": 0.0, "v": None}
+
+
+def _mask_key(key: str) -> str:
+    """Show only a short prefix of an API key, and nothing of a short one."""
+    return f"{key[:8]}..." if len(key) > 8 else "***"
+
+
+def get_tools_cached(ttl: float = TOOLS_CACHE_TTL) -> List[Any]:
+    """Return the BioMCP tool listing, refreshed at most every ``ttl`` seconds."""
+    now = time.monotonic()
+    if _tools_cache["v"] is None or now - _tools_cache["t"] > ttl:
+        _tools_cache.update(v=biomcp_tools.get_available_tools(), t=now)
+    return _tools_cache["v"]
+
+
+# On-disk LLM reply cache, opt-in via ALPHAGENOME_DEMO_CACHE=1
+DEMO_CACHE_DIR = Path.home() / ".cache" / "alphagenome_demo"
+
+
+class CachedAgent:
+    """Memoize ``BiomedicalAgent.process_message`` replies on disk.
+
+    Replies are keyed on ``(model_name, max_tokens, prompt)`` so re-running
+    the demo does not repeat identical LLM calls. Error replies are never
+    stored. All other attributes are delegated to the wrapped agent.
+    """
+    
+    def __init__(self, 
+                 agent: BiomedicalAgent, 
+                 cache_dir: Path = DEMO_CACHE_DIR,
+                 enabled: Optional[bool] = None):
+        self._agent = agent
+        self._cache_dir = Path(cache_dir)
+        if enabled is None:
+            enabled = os.getenv('ALPHAGENOME_DEMO_CACHE') == '1'
+        self.enabled = enabled
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._agent, name)
+    
+    def _cache_path(self, prompt: str, max_tokens: Optional[int] = None) -> Path:
+        key = hashlib.blake2b(
+            f"{self._agent.config.model_name}\x00{max_tokens}\x00{prompt}".encode()
+        ).hexdigest()
+        return self._cache_dir / f"{key}.json"
+    
+    @staticmethod
+    def _load(path: Path) -> Optional[Dict[str, Any]]:
+        return json.loads(path.read_text()) if path.exists() else None
+    
+    @staticmethod
+    def _write(path: Path, response: AgentMessage) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "content": response.content,
+            "tool_calls": [call.model_dump(mode="json") for call in response.tool_calls],
+            "tool_results": [result.model_dump(mode="json") for result in response.tool_results]
+        }, default=str))
+    
+    async def _store(self, path: Path, response: AgentMessage) -> None:
+        # A failed call (e.g. Ollama not running) must not be replayed on later runs
+        if not response.metadata.get("error"):
+            await asyncio.to_thread(self._write, path, response)
+    
+    async def process_message(self, 
+                              message: str, 
+                              session_id: Optional[str] = None,
+                              max_tokens: Optional[int] = None) -> AgentMessage:
+        """Return the cached reply for ``message`` or ask the wrapped agent."""
+        if not self.enabled:
+            return await self._agent.process_message(message, session_id, max_tokens)
+        
+        path = self._cache_path(message, max_tokens)
+        cached = await asyncio.to_thread(self._load, path)
+        if cached is not None:
+            logger.debug("LLM cache hit: %s", path.name)
+            return await self._replay(message, cached, session_id)
+        
+        response = await self._agent.process_message(message, session_id, max_tokens)
+        await self._store(path, response)
+        return response
+    
+    async def process_messages(self, 
+                               messages: List[str], 
+                               session_id: Optional[str] = None,
+                               max_tokens: Optional[int] = None) -> List[AgentMessage]:
+        """Like ``BiomedicalAgent.process_messages``, replaying cached replies.
+        
+        Uncached messages are answered together by the wrapped agent; the
+        cached exchanges are recorded in the session after theirs.
+        """
+        if not self.enabled:
+            return await self._agent.process_messages(messages, session_id, max_tokens)
+        
+        paths = [self._cache_path(message, max_tokens) for message in messages]
+        cached = await asyncio.gather(*(asyncio.to_thread(self._load, path) for path in paths))
+        misses = [message for message, entry in zip(messages, cached) if entry is None]
+        fresh = iter(await self._agent.process_messages(misses, session_id, max_tokens) if misses else [])
+        
+        responses = []
+        for message, path, entry in zip(messages, paths, cached):
+            if entry is None:
+                response = next(fresh)
+                await self._store(path, response)
+            else:
+                logger.debug("LLM cache hit: %s", path.name)
+                response = await self._replay(message, entry, session_id)
+            responses.append(response)
+        return responses
+    
+    async def _replay(self, message: str, cached: Dict[str, Any], session_id: Optional[str]) -> AgentMessage:
+        """Record a cached exchange in the session as if it had just happened."""
+        if self._agent.session is None or (session_id and self._agent.session.session_id != session_id):
+            await self._agent.start_session(session_id)
+        
+        self._agent.session.add_message(AgentMessage(
+            id=uuid4().hex,
+            timestamp=datetime.now(),
+            role="user",
+            content=message
+        ))
+        response = AgentMessage(
+            id=uuid4().hex,
+            timestamp=datetime.now(),
+            role="assistant",
+            content=cached["content"],
+            tool_calls=[ToolCall(**call) for call in cached["tool_calls"]],
+            tool_results=[ToolResult(**result) for result in cached.get("tool_results", [])]
+        )
+        self._agent.session.add_message(response)
+        return response
+    
+    def delete(self, prompt: str, max_tokens: Optional[int] = None) -> None:
+        """Drop the cached reply for a single prompt."""
+        self._cache_path(prompt, max_tokens).unlink(missing_ok=True)
+    
+    def clear(self) -> None:
+        """Drop every cached reply."""
+        if self._cache_dir.exists():
+            for path in self._cache_dir.glob("*.json"):
+                path.unlink()
+
 
 async def demonstrate_alphagenome_biomcp_integration():
     """Demonstrate AlphaGenome + BioMCP integration for variant analysis."""
     
-    print("🧬 ALPHAGENOME + BioMCP INTEGRATION DEMONSTRATION")
-    print("=" * 80)
-    print("🔬 BioMCP: Live access to biomedical databases")
-    print("🤖 AlphaGenome: AI-powered variant effect predictions")
-    print("🦙 Ollama: LLM reasoning and research synthesis")
-    print("=" * 80)
+    logger.info(
+        "🧬 ALPHAGENOME + BioMCP INTEGRATION DEMONSTRATION\n%s\n"
+        "🔬 BioMCP: Live access to biomedical databases\n"
+        "🤖 AlphaGenome: AI-powered variant effect predictions\n"
+        "🦙 Ollama: LLM reasoning and research synthesis\n%s",
+        SEP, SEP
+    )
     
     # Check for AlphaGenome API key
-    alphagenome_api_key = os.getenv('ALPHAGENOME_API_KEY')
-    if alphagenome_api_key:
-        print(f"✅ AlphaGenome API key found: {alphagenome_api_key[:8]}...")
+    if ALPHAGENOME_API_KEY:
+        logger.info("✅ AlphaGenome API key found: %s", _mask_key(ALPHAGENOME_API_KEY))
     else:
-        print("⚠️  AlphaGenome API key not found in environment (ALPHAGENOME_API_KEY)")
-        print("   Demo will continue with simulated predictions")
+        logger.info(
+            "⚠️  AlphaGenome API key not found in environment (ALPHAGENOME_API_KEY)\n"
+            "   Demo will continue with simulated predictions"
+        )
     
     # Define target variants for analysis (using proper AlphaGenome format)
     target_variants = [
@@ -62,15 +304,21 @@ async def demonstrate_alphagenome_biomcp_integration():
         }
     ]
     
-    print(f"\n🎯 Target Variants for Analysis: {len(target_variants)} variants")
-    for i, var in enumerate(target_variants, 1):
-        print(f"  {i}. {var['gene']} ({var['variant']}) - {var['disease']}")
+    logger.info(
+        "🎯 Target Variants for Analysis: %d variants\n%s",
+        len(target_variants),
+        "\n".join(
+            f"  {i}. {var['gene']} ({var['variant']}) - {var['disease']}"
+            for i, var in enumerate(target_variants, 1)
+        )
+    )
     
     # Show available BioMCP tools
-    print("\n🔧 Available BioMCP Tools:")
-    available_tools = biomcp_tools.get_available_tools()
-    for tool in available_tools:
-        print(f"  • {tool.name}: {tool.description}")
+    available_tools = get_tools_cached()
+    logger.info(
+        "🔧 Available BioMCP Tools:\n%s",
+        "\n".join(f"  • {tool.name}: {tool.description}" for tool in available_tools)
+    )
     
     # Create research context focused on variant analysis
     research_context = ResearchContext(
@@ -80,7 +328,7 @@ async def demonstrate_alphagenome_biomcp_integration():
         keywords=["variant analysis", "AlphaGenome", "precision medicine", "pathogenicity prediction"]
     )
     
-    print(f"\n🎯 Research Question: {research_context.research_question}")
+    logger.info("🎯 Research Question: %s", research_context.research_question)
     
     # Configure agent with Ollama
     config = AgentConfiguration(
@@ -88,190 +336,304 @@ async def demonstrate_alphagenome_biomcp_integration():
         model_name="llama3.1:latest",
         temperature=0.7,
         max_tokens=3000,
-        research_context=research_context
+        research_context=research_context,
+        keep_alive="30m"
     )
     
     # Initialize the biomedical agent
-    agent = BiomedicalAgent(config)
+    agent = CachedAgent(BiomedicalAgent(config))
     
     try:
-        print("\n🚀 Initializing Biomedical Research Agent...")
+        logger.info("🚀 Initializing Biomedical Research Agent...")
         await agent.initialize()
         
-        # Process each variant through the complete pipeline
-        for i, variant_info in enumerate(target_variants, 1):
-            print(f"\n" + "="*80)
-            print(f"VARIANT {i}: {variant_info['gene']} ANALYSIS PIPELINE")
-            print("="*80)
-            
-            await analyze_variant_with_alphagenome_biomcp(
-                agent, variant_info, i
-            )
+        # Process all variants through the complete pipeline, batching
+        # the variants of each step into a single prompt
+        await analyze_variants_with_alphagenome_biomcp(agent, target_variants)
         
-        print("\n" + "="*80)
-        print("COMPARATIVE ANALYSIS & RESEARCH SYNTHESIS")
-        print("="*80)
+        logger.info("\n%s\nCOMPARATIVE ANALYSIS & RESEARCH SYNTHESIS\n%s", SEP, SEP)
         
         # Generate comprehensive research synthesis
-        synthesis_response = await agent.process_message(
-            f"Based on our analysis of {len(target_variants)} variants across different genes "
-            f"({', '.join([v['gene'] for v in target_variants])}), provide a comprehensive "
-            f"research synthesis. How do AlphaGenome predictions complement traditional "
-            f"biomedical database information? What are the key insights for precision medicine? "
-            f"What experimental validation approaches would you recommend?"
-        )
+        synthesis_response = await agent.process_message(SYNTHESIS_TMPL.format_map({
+            "count": len(target_variants),
+            "genes": ", ".join(v['gene'] for v in target_variants)
+        }))
         
-        print("🤖 Research Synthesis:")
-        print("-" * 60)
-        print(synthesis_response.content)
-        print("-" * 60)
+        logger.info(
+            "🤖 Research Synthesis:\n%s\n%s\n%s",
+            RULE, synthesis_response.content, RULE
+        )
         
         # Display session analytics
         await display_session_analytics(agent)
         
-        print(f"\n🕒 AlphaGenome-BioMCP demo completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("✅ Successfully demonstrated:")
-        print("  🧬 Multi-variant analysis pipeline")
-        print("  🔬 BioMCP database integration")
-        print("  🤖 AlphaGenome prediction simulation") 
-        print("  🦙 LLM-powered research synthesis")
-        print("  📊 Cross-variant comparative analysis")
+        logger.info(
+            "🕒 AlphaGenome-BioMCP demo completed: %s\n"
+            "✅ Successfully demonstrated:\n"
+            "  🧬 Multi-variant analysis pipeline\n"
+            "  🔬 BioMCP database integration\n"
+            "  🤖 AlphaGenome prediction simulation\n"
+            "  🦙 LLM-powered research synthesis\n"
+            "  📊 Cross-variant comparative analysis",
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
         
     except Exception as e:
-        logger.error(f"Error in AlphaGenome-BioMCP demonstration: {e}")
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error in AlphaGenome-BioMCP demonstration: %s", e)
         
     finally:
         await agent.shutdown()
 
 
-async def analyze_variant_with_alphagenome_biomcp(
-    agent: BiomedicalAgent, 
-    variant_info: Dict[str, str], 
-    variant_num: int
-) -> None:
-    """Analyze a single variant through the complete AlphaGenome + BioMCP pipeline."""
-    
-    gene = variant_info['gene']
-    variant = variant_info['variant']
-    disease = variant_info['disease']
-    
-    print(f"\n🧬 STEP {variant_num}.1: Literature Analysis for {gene}")
-    print("-" * 50)
-    
-    # Literature search using BioMCP
-    lit_response = await agent.process_message(
-        f"Search for recent literature on {gene} variants in {disease}. "
-        f"Focus on pathogenicity, functional effects, and clinical significance. "
-        f"Limit to the most relevant 5 papers."
+def _format_variant_rows(variants: List[Dict[str, str]]) -> str:
+    """Render variants as numbered prompt rows."""
+    return "\n".join(
+        f"{i}) " + VARIANT_ROW_TMPL.format_map(v)
+        for i, v in enumerate(variants, 1)
     )
-    
-    print("📚 Literature Analysis Results:")
-    print(f"  Query: {gene} variants in {disease}")
-    print(f"  Response: {lit_response.content[:200]}...")
-    if lit_response.tool_calls:
-        print(f"  Tools used: {[call.tool_name for call in lit_response.tool_calls]}")
-    
-    print(f"\n🔬 STEP {variant_num}.2: Variant Database Search")
-    print("-" * 50)
-    
-    # Variant database search
-    var_response = await agent.process_message(
-        f"Search for variants in the {gene} gene using the variant database. "
-        f"Focus on pathogenic and likely pathogenic variants. "
-        f"Get detailed information about functional consequences."
-    )
-    
-    print("🧪 Variant Database Results:")
-    print(f"  Gene: {gene}")
-    print(f"  Response: {var_response.content[:200]}...")
-    if var_response.tool_calls:
-        print(f"  Tools used: {[call.tool_name for call in var_response.tool_calls]}")
-    
-    print(f"\n🤖 STEP {variant_num}.3: AlphaGenome Prediction Simulation")
-    print("-" * 50)
-    
-    # Simulate AlphaGenome prediction with proper format
-    alpha_response = await agent.process_message(
-        f"Simulate an AlphaGenome prediction for variant {variant} in gene {gene}. "
-        f"Note: AlphaGenome expects format like 'chr7:140753336 A>T' (chromosome:position ref>alt). "
-        f"Based on the literature and variant data we've gathered, what would be the "
-        f"expected pathogenicity score (0-1), functional impact, and molecular consequences? "
-        f"Consider protein structure, domain effects, and evolutionary conservation. "
-        f"Include confidence score and effect prediction."
-    )
-    
-    print("🧬 AlphaGenome Prediction Simulation:")
-    print(f"  Variant: {variant}")
-    print(f"  Gene: {gene}")
-    print(f"  Prediction: {alpha_response.content[:300]}...")
-    
-    print(f"\n🏥 STEP {variant_num}.4: Clinical Trials Search")
-    print("-" * 50)
-    
-    # Clinical trials search
-    trial_response = await agent.process_message(
-        f"Search for clinical trials targeting {gene}-related {disease}. "
-        f"What therapeutic strategies are being investigated? "
-        f"Are there any precision medicine approaches?"
+
+
+def _parse_batch_rows(content: str, count: int) -> List[str]:
+    """Split a batched JSON-array reply back into one summary per variant.
+
+    Falls back to the raw reply for every row when the model did not
+    return a well-formed array of the expected length.
+    """
+    start, end = content.find("["), content.rfind("]")
+    if start != -1 and end > start:
+        try:
+            rows = json.loads(content[start:end + 1])
+        except json.JSONDecodeError:
+            rows = None
+        if isinstance(rows, list) and len(rows) == count:
+            return [
+                str(row.get("summary", row)) if isinstance(row, dict) else str(row)
+                for row in rows
+            ]
+    return [content] * count
+
+
+async def _run_batched_steps(
+    agent: BiomedicalAgent,
+    variants: List[Dict[str, str]],
+    instructions: List[str],
+    batch_size: int,
+    preview_tokens: Optional[int] = None
+) -> List[Tuple[List[str], List[List[str]]]]:
+    """Run independent pipeline steps with ``batch_size`` variants per LLM call.
+
+    Every prompt goes to ``process_messages`` as one concurrent batch, so
+    no prompt sees the others in its conversation history.
+    ``preview_tokens`` is a per-variant generation budget, since decode
+    time grows with output length and previewed replies should not pay
+    for the full budget; ``None`` keeps the agent's configured
+    ``max_tokens``. Returns, per step, the per-variant summaries and the
+    per-variant tool names used.
+    """
+    batches = [variants[i:i + batch_size] for i in range(0, len(variants), batch_size)]
+    prompts = [
+        BATCH_PROMPT_TMPL.format_map({
+            "instruction": instruction,
+            "rows": _format_variant_rows(batch)
+        })
+        for instruction in instructions
+        for batch in batches
+    ]
+    responses = await agent.process_messages(
+        prompts, max_tokens=preview_tokens * len(batches[0]) if preview_tokens else None
     )
     
-    print("🔬 Clinical Trials Results:")
-    print(f"  Focus: {gene}-related {disease}")
-    print(f"  Response: {trial_response.content[:200]}...")
-    if trial_response.tool_calls:
-        print(f"  Tools used: {[call.tool_name for call in trial_response.tool_calls]}")
-    
-    print(f"\n📊 STEP {variant_num}.5: Integrated Analysis")
-    print("-" * 50)
-    
-    # Integrated analysis combining all data sources
-    integration_response = await agent.process_message(
-        f"Integrate all the information we've gathered for {gene} variant {variant}: "
-        f"literature evidence, variant database information, AlphaGenome predictions, "
-        f"and clinical trial data. What is the clinical significance of this variant? "
-        f"What are the therapeutic implications?"
+    results = []
+    for step in range(len(instructions)):
+        summaries: List[str] = []
+        tools_used: List[List[str]] = []
+        step_responses = responses[step * len(batches):(step + 1) * len(batches)]
+        for batch, response in zip(batches, step_responses):
+            summaries.extend(_parse_batch_rows(response.content, len(batch)))
+            tool_names = [call.tool_name for call in response.tool_calls]
+            tools_used.extend([tool_names] * len(batch))
+        results.append((summaries, tools_used))
+    return results
+
+
+async def _run_batched_step(
+    agent: BiomedicalAgent,
+    variants: List[Dict[str, str]],
+    instruction: str,
+    batch_size: int,
+    preview_tokens: Optional[int] = None
+) -> Tuple[List[str], List[List[str]]]:
+    """Run one pipeline step; see ``_run_batched_steps``."""
+    return (await _run_batched_steps(agent, variants, [instruction], batch_size, preview_tokens))[0]
+
+
+async def batch_literature_step(
+    agent: BiomedicalAgent,
+    variants: List[Dict[str, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Tuple[List[str], List[List[str]]]:
+    """Literature search for each variant's gene and disease."""
+    return await _run_batched_step(agent, variants, LITERATURE_TMPL, batch_size, PREVIEW_TOKENS)
+
+
+async def batch_variantdb_step(
+    agent: BiomedicalAgent,
+    variants: List[Dict[str, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Tuple[List[str], List[List[str]]]:
+    """Variant database search for each variant's gene."""
+    return await _run_batched_step(agent, variants, VARIANTDB_TMPL, batch_size, PREVIEW_TOKENS)
+
+
+async def batch_alphagenome_step(
+    agent: BiomedicalAgent,
+    variants: List[Dict[str, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Tuple[List[str], List[List[str]]]:
+    """Simulated AlphaGenome prediction for each variant."""
+    return await _run_batched_step(agent, variants, ALPHAGENOME_TMPL, batch_size)
+
+
+async def batch_trials_step(
+    agent: BiomedicalAgent,
+    variants: List[Dict[str, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Tuple[List[str], List[List[str]]]:
+    """Clinical trials search for each gene-related disease."""
+    return await _run_batched_step(agent, variants, TRIALS_TMPL, batch_size, PREVIEW_TOKENS)
+
+
+async def batch_integration_step(
+    agent: BiomedicalAgent,
+    variants: List[Dict[str, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Tuple[List[str], List[List[str]]]:
+    """Integrated clinical interpretation of each variant."""
+    return await _run_batched_step(agent, variants, INTEGRATION_TMPL, batch_size)
+
+
+async def analyze_variants_with_alphagenome_biomcp(
+    agent: BiomedicalAgent, 
+    variants: List[Dict[str, str]], 
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> None:
+    """Analyze variants through the complete AlphaGenome + BioMCP pipeline.
+
+    Each step marshals ``batch_size`` variants into one LLM prompt. The
+    literature, variant database and clinical trial steps are independent
+    and run concurrently as one batch; the AlphaGenome simulation and
+    integration steps build on their results.
+    """
+    (lit, lit_tools), (var, var_tools), (trials, trial_tools) = await _run_batched_steps(
+        agent, variants, [LITERATURE_TMPL, VARIANTDB_TMPL, TRIALS_TMPL], batch_size, PREVIEW_TOKENS
     )
-    
-    print("🔗 Integrated Analysis:")
-    print(f"  Variant: {gene} {variant}")
-    print(f"  Clinical significance: {integration_response.content[:250]}...")
+    alpha, _ = await batch_alphagenome_step(agent, variants, batch_size)
+    integration, _ = await batch_integration_step(agent, variants, batch_size)
+    
+    for i, variant_info in enumerate(variants):
+        variant_num = i + 1
+        gene = variant_info['gene']
+        variant = variant_info['variant']
+        disease = variant_info['disease']
+        # Buffer each variant's report and emit it as one log record
+        buf = io.StringIO()
+        buf.write(f"\n{SEP}\nVARIANT {variant_num}: {gene} ANALYSIS PIPELINE\n{SEP}\n")
+        
+        buf.write(f"\n🧬 STEP {variant_num}.1: Literature Analysis for {gene}\n")
+        buf.write(DASH_NL)
+        buf.write("📚 Literature Analysis Results:\n")
+        buf.write(f"  Query: {gene} variants in {disease}\n")
+        buf.write(f"  Response: {lit[i][:200]}...\n")
+        if lit_tools[i]:
+            buf.write(f"  Tools used: {lit_tools[i]}\n")
+        
+        buf.write(f"\n🔬 STEP {variant_num}.2: Variant Database Search\n")
+        buf.write(DASH_NL)
+        buf.write("🧪 Variant Database Results:\n")
+        buf.write(f"  Gene: {gene}\n")
+        buf.write(f"  Response: {var[i][:200]}...\n")
+        if var_tools[i]:
+            buf.write(f"  Tools used: {var_tools[i]}\n")
+        
+        buf.write(f"\n🤖 STEP {variant_num}.3: AlphaGenome Prediction Simulation\n")
+        buf.write(DASH_NL)
+        buf.write("🧬 AlphaGenome Prediction Simulation:\n")
+        buf.write(f"  Variant: {variant}\n")
+        buf.write(f"  Gene: {gene}\n")
+        buf.write(f"  Prediction: {alpha[i][:300]}...\n")
+        
+        buf.write(f"\n🏥 STEP {variant_num}.4: Clinical Trials Search\n")
+        buf.write(DASH_NL)
+        buf.write("🔬 Clinical Trials Results:\n")
+        buf.write(f"  Focus: {gene}-related {disease}\n")
+        buf.write(f"  Response: {trials[i][:200]}...\n")
+        if trial_tools[i]:
+            buf.write(f"  Tools used: {trial_tools[i]}\n")
+        
+        buf.write(f"\n📊 STEP {variant_num}.5: Integrated Analysis\n")
+        buf.write(DASH_NL)
+        buf.write("🔗 Integrated Analysis:\n")
+        buf.write(f"  Variant: {gene} {variant}\n")
+        buf.write(f"  Clinical significance: {integration[i][:250]}...\n")
+        
+        logger.info("%s", buf.getvalue().rstrip("\n"))
 
 
 async def display_session_analytics(agent: BiomedicalAgent) -> None:
     """Display comprehensive session analytics."""
     
-    print("\n" + "="*60)
-    print("SESSION ANALYTICS")
-    print("="*60)
+    logger.info("\n%s\nSESSION ANALYTICS\n%s", "=" * 60, "=" * 60)
     
     if agent.session:
         try:
             # Get conversation summary
             session_summary = agent.session.get_conversation_summary()
-            print("📊 Conversation Summary:")
-            print(session_summary)
+            logger.info("📊 Conversation Summary:\n%s", session_summary)
             
             # Export the research session
-            conversation_md = agent.session.export_conversation("markdown")
             filename = f"alphagenome_biomcp_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            with open(filename, "w") as f:
-                f.write(conversation_md)
-            print(f"\n💾 Full research session exported to: {filename}")
+            await agent.session.export_to_file(filename, "markdown")
+            logger.info("💾 Full research session exported to: %s", filename)
             
             # Analyze research progress
             progress = await agent.session.analyze_research_progress()
-            print(f"\n📈 Research Progress Analysis:")
-            print(f"  • Duration: {progress['duration_minutes']:.1f} minutes")
-            print(f"  • Messages exchanged: {progress['message_count']}")
-            print(f"  • Tools used: {progress['tool_usage']}")
-            print(f"  • Research themes: {progress['research_themes']}")
+            logger.info(
+                "📈 Research Progress Analysis:\n"
+                "  • Duration: %.1f minutes\n"
+                "  • Messages exchanged: %s\n"
+                "  • Tools used: %s\n"
+                "  • Research themes: %s",
+                progress['duration_minutes'],
+                progress['message_count'],
+                progress['tool_usage'],
+                progress['research_themes']
+            )
             
         except Exception as e:
-            logger.warning(f"Could not generate session analytics: {e}")
-            print("⚠️  Session analytics unavailable")
+            logger.warning("⚠️  Session analytics unavailable: %s", e)
     else:
-        print("❌ No active session found")
+        logger.warning("❌ No active session found")
+
+
+def _sample_param_value(param: ToolParameter, api_key: Optional[str]) -> Any:
+    """Pick a test value for a tool parameter, or None to leave it unset."""
+    value = PARAM_DEFAULTS.get(param.name)
+    if value is not None:
+        return value
+    if param.name in API_KEY_PARAMS:
+        # Use API key from environment if available
+        return api_key or "YOUR_KEY_HERE"
+    if not param.required or param.default is not None:
+        return None
+    
+    lname = param.name.lower()
+    for fragment, sample in PARAM_SUBSTRING_RULES:
+        if fragment in lname:
+            return sample
+    if param.type in PARAM_TYPE_DEFAULTS:
+        return PARAM_TYPE_DEFAULTS[param.type]
+    # For string params, default to a gene symbol or a nucleotide
+    return "BRAF" if lname in ("gene", "symbol") else "A"
 
 
 async def test_alphagenome_tool_availability():
@@ -281,13 +643,12 @@ async def test_alphagenome_tool_availability():
     print("=" * 60)
     
     # Check for API key
-    alphagenome_api_key = os.getenv('ALPHAGENOME_API_KEY')
-    if alphagenome_api_key:
-        print(f"🔑 Using AlphaGenome API key: {alphagenome_api_key[:8]}...")
+    if ALPHAGENOME_API_KEY:
+        print(f"🔑 Using AlphaGenome API key: {_mask_key(ALPHAGENOME_API_KEY)}")
     else:
         print("⚠️  No AlphaGenome API key found (set ALPHAGENOME_API_KEY environment variable)")
     
-    available_tools = biomcp_tools.get_available_tools()
+    available_tools = get_tools_cached()
     alphagenome_tools = [tool for tool in available_tools if 'alpha' in tool.name.lower()]
     
     if alphagenome_tools:
@@ -301,47 +662,9 @@ async def test_alphagenome_tool_availability():
                 # Create sample parameters based on tool requirements
                 test_params = {}
                 for param in tool.parameters:
-                    if param.name == "variant":
-                        test_params[param.name] = "chr7:140753336 A>T"  # BRAF V600E
-                    elif param.name == "gene":
-                        test_params[param.name] = "BRAF"
-                    elif param.name == "chromosome":
-                        test_params[param.name] = "chr7"
-                    elif param.name == "position":
-                        # Position should be integer, not string
-                        test_params[param.name] = 140753336
-                    elif param.name == "ref" or param.name == "reference":
-                        test_params[param.name] = "A"
-                    elif param.name == "alt" or param.name == "alternative" or param.name == "alternate":
-                        test_params[param.name] = "T"  # Nucleotide, not gene name
-                    elif param.name == "api_key" or param.name == "key":
-                        # Use API key from environment if available
-                        if alphagenome_api_key:
-                            test_params[param.name] = alphagenome_api_key
-                        else:
-                            test_params[param.name] = "YOUR_KEY_HERE"
-                    elif param.required and param.default is None:
-                        # Use appropriate defaults for common parameter names with correct types
-                        if "chr" in param.name.lower():
-                            test_params[param.name] = "chr7"
-                        elif "pos" in param.name.lower():
-                            test_params[param.name] = 140753336  # Integer for position
-                        elif "ref" in param.name.lower():
-                            test_params[param.name] = "A"  # Reference nucleotide
-                        elif "alt" in param.name.lower():
-                            test_params[param.name] = "T"  # Alternate nucleotide
-                        elif param.type == "integer":
-                            test_params[param.name] = 140753336
-                        elif param.type == "boolean":
-                            test_params[param.name] = True
-                        elif param.type == "array":
-                            test_params[param.name] = ["BRAF"]
-                        else:
-                            # For string params, use appropriate defaults
-                            if param.name.lower() in ["gene", "symbol"]:
-                                test_params[param.name] = "BRAF"
-                            else:
-                                test_params[param.name] = "A"  # Default to nucleotide for unknown string params
+                    value = _sample_param_value(param, ALPHAGENOME_API_KEY)
+                    if value is not None:
+                        test_params[param.name] = value
                 
                 print(f"    Parameters: {test_params}")
                 result = await biomcp_tools.call_tool(tool.name, test_params)
@@ -375,10 +698,9 @@ async def setup_alphagenome_environment():
     print("=" * 50)
     
     # Check for API key
-    api_key = os.getenv('ALPHAGENOME_API_KEY')
-    if api_key:
-        print(f"✅ AlphaGenome API key configured: {api_key[:8]}...")
-        return api_key
+    if ALPHAGENOME_API_KEY:
+        print(f"✅ AlphaGenome API key configured: {_mask_key(ALPHAGENOME_API_KEY)}")
+        return ALPHAGENOME_API_KEY
     else:
         print("❌ AlphaGenome API key not found!")
         print("\n📋 To use AlphaGenome predictions, set your API key:")
@@ -389,17 +711,22 @@ async def setup_alphagenome_environment():
         return None
 
 
-if __name__ == "__main__":
-    print("🚀 Starting AlphaGenome + BioMCP Integration Demonstration...")
-    
+async def _main():
+    """Run every demo phase in one event loop so connections and caches carry over."""
     # Setup environment
-    asyncio.run(setup_alphagenome_environment())
+    await setup_alphagenome_environment()
     
     # First test tool availability
-    asyncio.run(test_alphagenome_tool_availability())
+    await test_alphagenome_tool_availability()
     
     # Then run full demonstration
-    asyncio.run(demonstrate_alphagenome_biomcp_integration())
+    await demonstrate_alphagenome_biomcp_integration()
+
+
+if __name__ == "__main__":
+    print("🚀 Starting AlphaGenome + BioMCP Integration Demonstration...")
+    
+    asyncio.run(_main())
     
     print("\n🎉 AlphaGenome + BioMCP Integration Demonstration Complete!")
     print("The integration showcases:")
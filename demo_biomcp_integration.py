@@ -8,10 +8,13 @@ to perform a complete research loop with actual biomedical databases.
 
 import asyncio
 import logging
+import textwrap
 from datetime import datetime
+from typing import List, Optional, Tuple
 
 from bioagent import BiomedicalAgent
 from bioagent.core.models import AgentConfiguration, ResearchContext
+from bioagent.biomcp.cache import cached_call
 from bioagent.biomcp.tools import biomcp_tools
 
 # Configure logging
@@ -19,6 +22,20 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
+def head_lines(text: str, n: int) -> List[str]:
+    """Return the first ``n`` lines of ``text`` without splitting all of it."""
+    lines = []
+    start = 0
+    for _ in range(n):
+        end = text.find('\n', start)
+        if end < 0:
+            lines.append(text[start:])
+            break
+        lines.append(text[start:end])
+        start = end + 1
+    return lines
+
+
 async def demonstrate_biomcp_integration():
     """Demonstrate real BioMCP integration with live database queries."""
     
@@ -59,70 +76,88 @@ async def demonstrate_biomcp_integration():
     agent = BiomedicalAgent(config)
     
     try:
+        # The five database queries are independent of each other, so issue
+        # them concurrently and only serialize the printing below.
+        (
+            literature_results,
+            variant_results,
+            trial_results,
+            cbioportal_results,
+            alphgenome_results,
+        ) = await asyncio.gather(
+            # Search PubMed for Parkinson's disease genetics
+            cached_call(
+                "article_searcher",
+                {"keywords": "Parkinson's disease genetics SNCA LRRK2", "page_size": 5}
+            ),
+            # Search for SNCA variants
+            cached_call(
+                "variant_searcher",
+                {"gene": "SNCA", "page_size": 3}
+            ),
+            # Search for Parkinson's disease clinical trials
+            cached_call(
+                "trial_searcher",
+                {"conditions": "Parkinson disease", "interventions": "gene therapy", "page_size": 3}
+            ),
+            # Get cBioPortal summary for Parkinson's-related genes
+            cached_call(
+                "get_cbioportal_summary_for_genes",
+                {"genes": ["SNCA", "LRRK2", "GBA"]}
+            ),
+            # Try AlphaGenome prediction for a known SNCA variant
+            cached_call(
+                "alphagenome_predictor",
+                {
+                    "variant": "chr4:89724099:A:G",  # Example SNCA variant
+                    "gene": "SNCA"
+                }
+            ),
+            return_exceptions=True,
+        )
+
         print("\n🚀 STEP 1: Literature Search")
         print("-" * 40)
-        
-        # Search PubMed for Parkinson's disease genetics
-        literature_results = await biomcp_tools.call_tool(
-            "article_searcher", 
-            {"keywords": "Parkinson's disease genetics SNCA LRRK2", "page_size": 5}
-        )
+        if isinstance(literature_results, Exception):
+            raise literature_results
         
         print("📚 Literature Search Results:")
-        print("\n".join(["  " + line for line in literature_results.split('\n')[:10]]))
+        print(textwrap.indent("\n".join(head_lines(literature_results, 10)), "  "))
         print("  ...")
         
         print("\n🧬 STEP 2: Genetic Variant Analysis")
         print("-" * 40)
-        
-        # Search for SNCA variants
-        variant_results = await biomcp_tools.call_tool(
-            "variant_searcher",
-            {"gene": "SNCA", "page_size": 3}
-        )
+        if isinstance(variant_results, Exception):
+            raise variant_results
         
         print("🔬 SNCA Variant Search Results:")
-        print("\n".join(["  " + line for line in variant_results.split('\n')[:8]]))
+        print(textwrap.indent("\n".join(head_lines(variant_results, 8)), "  "))
         print("  ...")
         
         print("\n🏥 STEP 3: Clinical Trials Search")
         print("-" * 40)
-        
-        # Search for Parkinson's disease clinical trials
-        trial_results = await biomcp_tools.call_tool(
-            "trial_searcher",
-            {"conditions": "Parkinson disease", "interventions": "gene therapy", "page_size": 3}
-        )
+        if isinstance(trial_results, Exception):
+            raise trial_results
         
         print("🔬 Clinical Trials Search Results:")
-        print("\n".join(["  " + line for line in trial_results.split('\n')[:8]]))
+        print(textwrap.indent("\n".join(head_lines(trial_results, 8)), "  "))
         print("  ...")
         
         print("\n🧪 STEP 4: Cancer Genomics Analysis")
         print("-" * 40)
-        
-        # Get cBioPortal summary for Parkinson's-related genes
-        cbioportal_results = await biomcp_tools.call_tool(
-            "get_cbioportal_summary_for_genes",
-            {"genes": ["SNCA", "LRRK2", "GBA"]}
-        )
+        if isinstance(cbioportal_results, Exception):
+            raise cbioportal_results
         
         print("🔬 cBioPortal Cancer Genomics Summary:")
-        print("\n".join(["  " + line for line in cbioportal_results.split('\n')[:8]]))
+        print(textwrap.indent("\n".join(head_lines(cbioportal_results, 8)), "  "))
         print("  ...")
         
         print("\n🤖 STEP 5: AlphaGenome Variant Prediction")
         print("-" * 40)
         
-        # Try AlphaGenome prediction for a known SNCA variant
         try:
-            alphgenome_results = await biomcp_tools.call_tool(
-                "alphagenome_predictor",
-                {
-                    "variant": "chr4:89724099:A:G",  # Example SNCA variant
-                    "gene": "SNCA"
-                }
-            )
+            if isinstance(alphgenome_results, Exception):
+                raise alphgenome_results
             
             print("🧬 AlphaGenome Prediction Results:")
             print(f"  Variant: chr4:89724099:A:G (SNCA)")
@@ -152,63 +187,62 @@ async def demonstrate_biomcp_integration():
         print(f"\n🕒 Analysis completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
     except Exception as e:
-        logger.error(f"Error in BioMCP demonstration: {e}")
+        logger.error("Error in BioMCP demonstration: %s", e)
         print(f"❌ Error: {e}")
         
     finally:
         await agent.shutdown()
 
 
+async def _probe(tool_name: str, params: dict) -> Tuple[str, Optional[int], Optional[Exception]]:
+    """Call one tool and return ``(tool_name, line_count, error)``."""
+    try:
+        result = await cached_call(tool_name, params)
+        return tool_name, result.count('\n') + 1, None
+    except Exception as e:
+        return tool_name, None, e
+
+
 async def test_individual_tools():
     """Test individual BioMCP tools to ensure they work."""
     
     print("\n🧪 TESTING INDIVIDUAL BioMCP TOOLS")
     print("=" * 50)
     
-    # Test article search
-    try:
-        print("Testing article_searcher...")
-        result = await biomcp_tools.call_tool(
-            "article_searcher", 
-            {"keywords": "CRISPR gene editing", "page_size": 2}
-        )
-        lines = result.split('\n')
-        print(f"✅ Article search successful: {len(lines)} lines of output")
-    except Exception as e:
-        print(f"❌ Article search failed: {e}")
+    labels = {
+        "article_searcher": "Article",
+        "trial_searcher": "Trial",
+        "variant_searcher": "Variant",
+    }
+    for tool_name in labels:
+        print(f"Testing {tool_name}...")
     
-    # Test clinical trial search
-    try:
-        print("Testing trial_searcher...")
-        result = await biomcp_tools.call_tool(
-            "trial_searcher",
-            {"conditions": "COVID-19", "interventions": "vaccine", "page_size": 2}
-        )
-        lines = result.split('\n')
-        print(f"✅ Trial search successful: {len(lines)} lines of output")
-    except Exception as e:
-        print(f"❌ Trial search failed: {e}")
+    # The probes are independent connectivity checks, so run them together
+    results = await asyncio.gather(
+        _probe("article_searcher", {"keywords": "CRISPR gene editing", "page_size": 2}),
+        _probe("trial_searcher", {"conditions": "COVID-19", "interventions": "vaccine", "page_size": 2}),
+        _probe("variant_searcher", {"gene": "BRCA1", "page_size": 2})
+    )
     
-    # Test variant search
-    try:
-        print("Testing variant_searcher...")
-        result = await biomcp_tools.call_tool(
-            "variant_searcher",
-            {"gene": "BRCA1", "page_size": 2}
-        )
-        lines = result.split('\n')
-        print(f"✅ Variant search successful: {len(lines)} lines of output")
-    except Exception as e:
-        print(f"❌ Variant search failed: {e}")
+    for tool_name, line_count, error in results:
+        if error is None:
+            print(f"✅ {labels[tool_name]} search successful: {line_count} lines of output")
+        else:
+            print(f"❌ {labels[tool_name]} search failed: {error}")
 
 
-if __name__ == "__main__":
-    print("Starting BioMCP Integration Demonstration...")
-    
+async def _main():
+    """Run both demo phases in one event loop so connections and caches carry over."""
     # First test individual tools
-    asyncio.run(test_individual_tools())
+    await test_individual_tools()
     
     # Then run full demonstration
-    asyncio.run(demonstrate_biomcp_integration())
+    await demonstrate_biomcp_integration()
+
+
+if __name__ == "__main__":
+    print("Starting BioMCP Integration Demonstration...")
+    
+    asyncio.run(_main())
     
     print("\n🎉 BioMCP Integration Demonstration Complete!")
@@ -11,9 +11,12 @@ The demo simulates integration with biomcp servers and alphagenome for structura
 """
 
 import asyncio
+import functools
 import logging
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 from bioagent import BiomedicalAgent
 from bioagent.core.models import (
@@ -25,144 +28,198 @@ from bioagent.core.models import (
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+# Mock payloads are built once at import time and shared read-only.
+_HELICOBACTER_PUBMED_RESULT = MappingProxyType({
+    "papers_found": 156,
+    "key_findings": [
+        "H. pylori infection is 2.4x more prevalent in PD patients",
+        "Eradication therapy may slow PD progression",  
+        "H. pylori lipopolysaccharide triggers neuroinflammation",
+        "Association with increased alpha-synuclein aggregation"
+    ],
+    "top_papers": [
+        "Helicobacter pylori infection and Parkinson's disease: A meta-analysis (2019)",
+        "Gut-brain axis in neurodegeneration: Role of H. pylori (2021)"
+    ]
+})
+
+_MICROBIOME_PUBMED_RESULT = MappingProxyType({
+    "papers_found": 234,
+    "key_findings": [
+        "Reduced microbial diversity in PD patients",
+        "Decreased Prevotella and increased Enterobacteriaceae",
+        "SCFA-producing bacteria are depleted",
+        "Gut dysbiosis precedes motor symptoms by years"
+    ],
+    "top_papers": [
+        "The gut microbiome in Parkinson's disease (Nature, 2017)",
+        "Temporal dynamics of the gut microbiome in people with Parkinson's disease (2021)"
+    ]
+})
+
+_SNCA_STRING_RESULT = MappingProxyType({
+    "direct_interactions": 0,
+    "indirect_interactions": 3,
+    "pathways": [
+        "Neuroinflammation signaling",
+        "Autophagy regulation", 
+        "Immune response activation"
+    ],
+    "confidence_score": 0.65,
+    "evidence": "No direct protein-protein interactions found, but both proteins are involved in inflammatory cascades"
+})
+
+_UREASE_STRUCT = MappingProxyType({
+    "structure_confidence": 0.87,
+    "predicted_domains": [
+        {"name": "Urease alpha subunit", "residues": "1-238", "confidence": 0.92},
+        {"name": "Nickel binding site", "residues": "134-137", "confidence": 0.89}
+    ],
+    "active_sites": ["His134", "His136", "Lys217"],
+    "potential_binding_sites": [
+        {"site": "Surface pocket A", "druggability": 0.78},
+        {"site": "Allosteric site B", "druggability": 0.64}
+    ],
+    "pdb_template": "4H5P",
+    "model_file": "/tmp/h_pylori_urease_predicted.pdb"
+})
+
+_SNCA_UNIPROT = MappingProxyType({
+    "uniprot_id": "P37840",
+    "name": "Alpha-synuclein",
+    "organism": "Homo sapiens",
+    "function": "Neuronal protein involved in synaptic vesicle trafficking and membrane stability",
+    "subcellular_location": ["Cytoplasm", "Nucleus", "Membrane"],
+    "disease_associations": ["Parkinson's disease", "Lewy body dementia", "Multiple system atrophy"],
+    "sequence_length": 140,
+    "molecular_weight": "14.5 kDa"
+})
+
+_UREASE_UNIPROT = MappingProxyType({
+    "uniprot_id": "P69996",
+    "name": "Urease subunit alpha",
+    "organism": "Helicobacter pylori",
+    "function": "Catalyzes the hydrolysis of urea into ammonia and carbon dioxide",
+    "subcellular_location": ["Cytoplasm"],
+    "disease_associations": ["Gastric ulcers", "Gastric cancer"],
+    "sequence_length": 238,
+    "molecular_weight": "26.5 kDa"
+})
+
+_PUBMED_DEFAULT = MappingProxyType({
+    "papers_found": 89,
+    "key_findings": ["General neuroinflammation research"],
+    "top_papers": []
+})
+
+_STRING_DEFAULT = MappingProxyType({
+    "direct_interactions": 0,
+    "indirect_interactions": 0,
+    "pathways": [],
+    "confidence_score": 0.1,
+    "evidence": "No significant interactions found"
+})
+
+_STRUCTURE_DEFAULT = MappingProxyType({
+    "structure_confidence": 0.72,
+    "predicted_domains": [{"name": "Unknown domain", "residues": "1-200", "confidence": 0.72}],
+    "active_sites": [],
+    "potential_binding_sites": [],
+    "pdb_template": None,
+    "model_file": "/tmp/generic_structure.pdb"
+})
+
+# Mock dispatch tables: each entry is (token groups, result). An entry
+# matches when every group has at least one token in the lowercased key.
+_PUBMED_TABLE = [
+    ((("helicobacter", "h. pylori"),), _HELICOBACTER_PUBMED_RESULT),
+    ((("microbiome",), ("parkinson",)), _MICROBIOME_PUBMED_RESULT),
+]
+
+_STRING_TABLE = [
+    ((("snca", "alpha-synuclein"),), _SNCA_STRING_RESULT),
+]
+
+_STRUCTURE_TABLE = [
+    ((("urease",),), _UREASE_STRUCT),
+]
+
+_UNIPROT_TABLE = [
+    ((("snca", "alpha-synuclein"),), _SNCA_UNIPROT),
+    ((("urease",),), _UREASE_UNIPROT),
+]
+
+
+def _lookup(table: list, key: str) -> Optional[Mapping[str, Any]]:
+    """Return the first table result whose token groups all match ``key``."""
+    for groups, result in table:
+        if all(any(tok in key for tok in toks) for toks in groups):
+            return result
+    return None
+
+
+# The mock lookups are pure functions of their (normalized) arguments, so
+# memoize them and keep the async wrappers thin.
+@functools.cache
+def _pubmed_search(q: str) -> Mapping[str, Any]:
+    """Mock PubMed results for a lowercased query."""
+    return _lookup(_PUBMED_TABLE, q) or _PUBMED_DEFAULT
+
+
+@functools.cache
+def _string_interaction_search(p1: str, p2: str) -> Mapping[str, Any]:
+    """Mock STRING results for lowercased protein names."""
+    return _lookup(_STRING_TABLE, p1) or _STRING_DEFAULT
+
+
+@functools.cache
+def _alphagenome_predict_structure(p: str, organism: str) -> Mapping[str, Any]:
+    """Mock AlphaGenome prediction for a lowercased protein id."""
+    return _lookup(_STRUCTURE_TABLE, p) or _STRUCTURE_DEFAULT
+
+
+@functools.cache
+def _uniprot_protein_info(protein_name: str) -> Mapping[str, Any]:
+    """Mock UniProt entry; keyed on the raw name since the fallback echoes it."""
+    return _lookup(_UNIPROT_TABLE, protein_name.lower()) or MappingProxyType({
+        "uniprot_id": "Unknown",
+        "name": protein_name,
+        "organism": "Unknown",
+        "function": "Unknown protein function",
+        "subcellular_location": [],
+        "disease_associations": [],
+        "sequence_length": 0,
+        "molecular_weight": "Unknown"
+    })
+
+
 class MockMCPTools:
     """Mock MCP tools to simulate real biomcp and alphagenome integrations."""
     
     @staticmethod
-    async def pubmed_search(query: str) -> dict:
+    async def pubmed_search(query: str) -> Mapping[str, Any]:
         """Simulate PubMed literature search."""
-        logger.info(f"🔍 Searching PubMed for: {query}")
-        
-        # Simulate findings based on query
-        if "helicobacter" in query.lower() or "h. pylori" in query.lower():
-            return {
-                "papers_found": 156,
-                "key_findings": [
-                    "H. pylori infection is 2.4x more prevalent in PD patients",
-                    "Eradication therapy may slow PD progression",  
-                    "H. pylori lipopolysaccharide triggers neuroinflammation",
-                    "Association with increased alpha-synuclein aggregation"
-                ],
-                "top_papers": [
-                    "Helicobacter pylori infection and Parkinson's disease: A meta-analysis (2019)",
-                    "Gut-brain axis in neurodegeneration: Role of H. pylori (2021)"
-                ]
-            }
-        elif "microbiome" in query.lower() and "parkinson" in query.lower():
-            return {
-                "papers_found": 234,
-                "key_findings": [
-                    "Reduced microbial diversity in PD patients",
-                    "Decreased Prevotella and increased Enterobacteriaceae",
-                    "SCFA-producing bacteria are depleted",
-                    "Gut dysbiosis precedes motor symptoms by years"
-                ],
-                "top_papers": [
-                    "The gut microbiome in Parkinson's disease (Nature, 2017)",
-                    "Temporal dynamics of the gut microbiome in people with Parkinson's disease (2021)"
-                ]
-            }
-        else:
-            return {
-                "papers_found": 89,
-                "key_findings": ["General neuroinflammation research"],
-                "top_papers": []
-            }
+        logger.info("🔍 Searching PubMed for: %s", query)
+        return _pubmed_search(query.lower())
     
     @staticmethod
-    async def string_interaction_search(protein1: str, protein2: str) -> dict:
+    async def string_interaction_search(protein1: str, protein2: str) -> Mapping[str, Any]:
         """Simulate STRING protein interaction database search."""
-        logger.info(f"🔗 Searching STRING for interactions: {protein1} - {protein2}")
-        
-        if "snca" in protein1.lower() or "alpha-synuclein" in protein1.lower():
-            return {
-                "direct_interactions": 0,
-                "indirect_interactions": 3,
-                "pathways": [
-                    "Neuroinflammation signaling",
-                    "Autophagy regulation", 
-                    "Immune response activation"
-                ],
-                "confidence_score": 0.65,
-                "evidence": "No direct protein-protein interactions found, but both proteins are involved in inflammatory cascades"
-            }
-        else:
-            return {
-                "direct_interactions": 0,
-                "indirect_interactions": 0,
-                "pathways": [],
-                "confidence_score": 0.1,
-                "evidence": "No significant interactions found"
-            }
+        logger.info("🔗 Searching STRING for interactions: %s - %s", protein1, protein2)
+        return _string_interaction_search(protein1.lower(), protein2.lower())
     
     @staticmethod 
-    async def alphagenome_predict_structure(protein_id: str, organism: str) -> dict:
+    async def alphagenome_predict_structure(protein_id: str, organism: str) -> Mapping[str, Any]:
         """Simulate AlphaGenome structural prediction."""
-        logger.info(f"🧬 Predicting structure with AlphaGenome: {protein_id} ({organism})")
-        
-        if "urease" in protein_id.lower():
-            return {
-                "structure_confidence": 0.87,
-                "predicted_domains": [
-                    {"name": "Urease alpha subunit", "residues": "1-238", "confidence": 0.92},
-                    {"name": "Nickel binding site", "residues": "134-137", "confidence": 0.89}
-                ],
-                "active_sites": ["His134", "His136", "Lys217"],
-                "potential_binding_sites": [
-                    {"site": "Surface pocket A", "druggability": 0.78},
-                    {"site": "Allosteric site B", "druggability": 0.64}
-                ],
-                "pdb_template": "4H5P",
-                "model_file": "/tmp/h_pylori_urease_predicted.pdb"
-            }
-        else:
-            return {
-                "structure_confidence": 0.72,
-                "predicted_domains": [{"name": "Unknown domain", "residues": "1-200", "confidence": 0.72}],
-                "active_sites": [],
-                "potential_binding_sites": [],
-                "pdb_template": None,
-                "model_file": "/tmp/generic_structure.pdb"
-            }
+        logger.info("🧬 Predicting structure with AlphaGenome: %s (%s)", protein_id, organism)
+        return _alphagenome_predict_structure(protein_id.lower(), organism)
     
     @staticmethod
-    async def uniprot_protein_info(protein_name: str) -> dict:
+    async def uniprot_protein_info(protein_name: str) -> Mapping[str, Any]:
         """Simulate UniProt protein information lookup."""
-        logger.info(f"🧪 Looking up protein info: {protein_name}")
-        
-        if "snca" in protein_name.lower() or "alpha-synuclein" in protein_name.lower():
-            return {
-                "uniprot_id": "P37840",
-                "name": "Alpha-synuclein",
-                "organism": "Homo sapiens",
-                "function": "Neuronal protein involved in synaptic vesicle trafficking and membrane stability",
-                "subcellular_location": ["Cytoplasm", "Nucleus", "Membrane"],
-                "disease_associations": ["Parkinson's disease", "Lewy body dementia", "Multiple system atrophy"],
-                "sequence_length": 140,
-                "molecular_weight": "14.5 kDa"
-            }
-        elif "urease" in protein_name.lower():
-            return {
-                "uniprot_id": "P69996",
-                "name": "Urease subunit alpha",
-                "organism": "Helicobacter pylori",
-                "function": "Catalyzes the hydrolysis of urea into ammonia and carbon dioxide",
-                "subcellular_location": ["Cytoplasm"],
-                "disease_associations": ["Gastric ulcers", "Gastric cancer"],
-                "sequence_length": 238,
-                "molecular_weight": "26.5 kDa"
-            }
-        else:
-            return {
-                "uniprot_id": "Unknown",
-                "name": protein_name,
-                "organism": "Unknown",
-                "function": "Unknown protein function",
-                "subcellular_location": [],
-                "disease_associations": [],
-                "sequence_length": 0,
-                "molecular_weight": "Unknown"
-            }
+        logger.info("🧪 Looking up protein info: %s", protein_name)
+        return _uniprot_protein_info(protein_name)
 
 
 async def simulate_research_loop():
@@ -225,14 +282,21 @@ async def simulate_research_loop():
         print("\n🔬 Step 2: HYPOTHESIS VALIDATION")
         print("-" * 50)
         
+        # The validation lookups are independent, so run them concurrently
+        hp_search, interaction_result, snca_info, urease_info, structure_pred = await asyncio.gather(
+            mock_tools.pubmed_search("Helicobacter pylori Parkinson's disease"),
+            mock_tools.string_interaction_search("H. pylori urease", "human alpha-synuclein"),
+            mock_tools.uniprot_protein_info("alpha-synuclein"),
+            mock_tools.uniprot_protein_info("H. pylori urease"),
+            mock_tools.alphagenome_predict_structure("H. pylori urease", "Helicobacter pylori")
+        )
+        
         # Search for H. pylori specific research
-        hp_search = await mock_tools.pubmed_search("Helicobacter pylori Parkinson's disease")
         print(f"📚 H. pylori-PD Research: {hp_search['papers_found']} papers found")
         for finding in hp_search['key_findings']:
             print(f"  • {finding}")
         
         # Check protein interactions
-        interaction_result = await mock_tools.string_interaction_search("H. pylori urease", "human alpha-synuclein")
         print(f"\n🔗 Protein Interaction Analysis:")
         print(f"  Direct interactions: {interaction_result['direct_interactions']}")
         print(f"  Indirect interactions: {interaction_result['indirect_interactions']}")
@@ -240,15 +304,11 @@ async def simulate_research_loop():
         print(f"  Involved pathways: {', '.join(interaction_result['pathways'])}")
         
         # Get protein information
-        snca_info = await mock_tools.uniprot_protein_info("alpha-synuclein")
-        urease_info = await mock_tools.uniprot_protein_info("H. pylori urease")
-        
         print(f"\n🧪 Target Proteins:")
         print(f"  • Alpha-synuclein ({snca_info['uniprot_id']}): {snca_info['function']}")
         print(f"  • H. pylori Urease ({urease_info['uniprot_id']}): {urease_info['function']}")
         
         # Predict structure using AlphaGenome
-        structure_pred = await mock_tools.alphagenome_predict_structure("H. pylori urease", "Helicobacter pylori")
         print(f"\n🧬 AlphaGenome Structure Prediction:")
         print(f"  Confidence: {structure_pred['structure_confidence']:.2%}")
         print(f"  Active sites: {', '.join(structure_pred['active_sites'])}")
@@ -366,7 +426,7 @@ async def simulate_research_loop():
         print("=" * 80)
         
     except Exception as e:
-        logger.error(f"Error in research loop: {e}")
+        logger.error("Error in research loop: %s", e)
         raise
     
     finally:
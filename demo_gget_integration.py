@@ -8,29 +8,131 @@ for gene analysis, sequence retrieval, and bioinformatics workflows.
 """
 
 import asyncio
+import importlib
+import io
+import json
 import logging
 import os
+import reprlib
+import sys
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
-from bioagent import BiomedicalAgent
-from bioagent.core.models import AgentConfiguration, ResearchContext
-from bioagent.biomcp.tools import biomcp_tools
+if TYPE_CHECKING:
+    from bioagent import BiomedicalAgent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# The framework (pydantic, httpx, biomcp, gget) is imported by the functions
+# that need it, so the banner prints before the heavy imports run
+_LAZY_IMPORTS = {
+    "BiomedicalAgent": "bioagent",
+    "AgentConfiguration": "bioagent.core.models",
+    "ResearchContext": "bioagent.core.models",
+    "gget_result_cache": "bioagent.biomcp.cache",
+    "biomcp_tools": "bioagent.biomcp.tools",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve framework names on first access (PEP 562)."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+async def cached_call_tool(tool_name: str, params: Dict[str, Any]) -> Any:
+    """Call a gget tool through the on-disk gget result cache."""
+    from bioagent.biomcp.cache import gget_result_cache
+    return await gget_result_cache.call(tool_name, params)
+
+
+def _preview(obj: Any, n: int = 200) -> str:
+    """Render at most ``n`` characters of a tool result.
+    
+    gget payloads can be megabytes, so bound the repr of containers
+    instead of stringifying everything and slicing.
+    """
+    if isinstance(obj, str):
+        return obj[:n]
+    r = reprlib.Repr()
+    r.maxstring = r.maxother = n
+    r.maxdict = r.maxlist = 4
+    return r.repr(obj)[:n]
+
+
+# One prompt interprets every gene, so the shared instructions are
+# processed once instead of once per gene
+GENE_BATCH_PROMPT_TMPL = (
+    "Provide a comprehensive interpretation of our gget analysis for each gene "
+    "below. The input is a JSON array of {{symbol, description, gget_results_summary}} "
+    "entries built from gene search, gene info, sequence analysis, structure data, "
+    "expression patterns, and pathway enrichment. For each gene, what are the key "
+    "biological insights, and how does this data contribute to our understanding of "
+    "its function and clinical significance?\n"
+    "Respond with a JSON object of the form "
+    "{{\"interpretations\": [{{\"symbol\": \"...\", \"analysis\": \"...\"}}]}} "
+    "containing one entry per gene, in the same order.\n\n"
+    "{genes_json}"
+)
+
+
+# Static banners are rendered once and written with a single call each
+OPENING_BANNER = "\n".join([
+    "🧬 GGET GENOMIC TOOLS INTEGRATION DEMONSTRATION",
+    "=" * 80,
+    "🔬 gget: Efficient querying of genomic databases",
+    "🧪 BioMCP: Biomedical database access",
+    "🦙 Ollama: LLM reasoning and synthesis",
+    "=" * 80,
+]) + "\n"
+
+COMPARATIVE_HEADER = "\n".join([
+    "",
+    "=" * 80,
+    "COMPARATIVE GENOMIC ANALYSIS",
+    "=" * 80,
+    "🤖 Comparative Analysis:",
+    "-" * 60,
+]) + "\n"
+
+DEMONSTRATED_BLOCK = "\n".join([
+    "✅ Successfully demonstrated:",
+    "  🧬 Gene ID search and retrieval",
+    "  📝 Gene information and annotation",
+    "  🔍 Sequence analysis and alignment",
+    "  🏗️ Protein structure retrieval",
+    "  📊 Gene expression analysis",
+    "  🛤️ Pathway enrichment analysis",
+]) + "\n"
+
+CLOSING_BANNER = "\n".join([
+    "",
+    "🎉 gget Integration Demonstration Complete!",
+    "The integration showcases:",
+    "• Gene search and ID retrieval",
+    "• Sequence analysis and alignment",
+    "• Protein structure access",
+    "• Expression data analysis",
+    "• Pathway enrichment analysis",
+    "• LLM-powered result interpretation",
+    "",
+    "💡 Tip: Install gget with 'pip install gget' for full functionality",
+]) + "\n"
+
 
 async def demonstrate_gget_integration():
     """Demonstrate gget integration with comprehensive genomic analysis."""
     
-    print("🧬 GGET GENOMIC TOOLS INTEGRATION DEMONSTRATION")
-    print("=" * 80)
-    print("🔬 gget: Efficient querying of genomic databases")
-    print("🧪 BioMCP: Biomedical database access")
-    print("🦙 Ollama: LLM reasoning and synthesis")
-    print("=" * 80)
+    sys.stdout.write(OPENING_BANNER)
+    
+    from bioagent import BiomedicalAgent
+    from bioagent.core.models import AgentConfiguration, ResearchContext
+    from bioagent.biomcp.tools import biomcp_tools
     
     # Define target genes for comprehensive analysis
     target_genes = [
@@ -58,7 +160,7 @@ async def demonstrate_gget_integration():
     # Show available gget tools
     print("\n🔧 Available gget Tools:")
     available_tools = biomcp_tools.get_available_tools()
-    gget_tools = [tool for tool in available_tools if tool.name.startswith('gget_')]
+    gget_tools = biomcp_tools.get_tools_by_prefix("gget_")
     
     for tool in gget_tools:
         print(f"  • {tool.name}: {tool.description}")
@@ -81,7 +183,8 @@ async def demonstrate_gget_integration():
         model_name="llama3.1:latest",
         temperature=0.7,
         max_tokens=3000,
-        research_context=research_context
+        research_context=research_context,
+        reuse_llm_context=True  # the comparative analysis continues from the interpretation call
     )
     
     # Initialize the biomedical agent
@@ -91,43 +194,49 @@ async def demonstrate_gget_integration():
         print("\n🚀 Initializing Biomedical Research Agent...")
         await agent.initialize()
         
-        # Process each gene through the gget analysis pipeline
-        for i, gene_info in enumerate(target_genes, 1):
-            print(f"\n" + "="*80)
-            print(f"GENE {i}: {gene_info['symbol']} ANALYSIS PIPELINE")
-            print("="*80)
-            
-            await analyze_gene_with_gget(agent, gene_info, i)
+        # gget's search, info, seq and enrichr tools all take lists, so
+        # prefetch them once for every target gene and hand each pipeline
+        # its share of the results
+        prefetched = await prefetch_gget_results([g["symbol"] for g in target_genes])
         
-        print("\n" + "="*80)
-        print("COMPARATIVE GENOMIC ANALYSIS")
-        print("="*80)
+        # Process all genes through the gget analysis pipeline concurrently
+        summaries = await asyncio.gather(*[
+            analyze_gene_with_gget(gene_info, i, prefetched[gene_info["symbol"]])
+            for i, gene_info in enumerate(target_genes, 1)
+        ])
         
-        # Generate comparative analysis using LLM
-        comparative_response = await agent.process_message(
+        # Interpret every gene with a single LLM call
+        interpretations = await interpret_genes(agent, target_genes, summaries)
+        
+        sys.stdout.write("".join(
+            f"\n🧠 STEP {i}.7: LLM Integration and Interpretation\n"
+            f"{'-' * 50}\n"
+            f"🧠 LLM Interpretation:\n"
+            f"  Gene: {gene_info['symbol']}\n"
+            f"  Analysis: {interpretations[gene_info['symbol']][:300]}...\n"
+            for i, gene_info in enumerate(target_genes, 1)
+        ))
+        sys.stdout.write(COMPARATIVE_HEADER)
+        
+        # Generate comparative analysis using LLM, building on the per-gene
+        # interpretations it has just produced, and print it as it streams in
+        async for chunk in agent.process_message_stream(
             f"Based on our gget analysis of {len(target_genes)} genes "
             f"({', '.join([g['symbol'] for g in target_genes])}), provide a comparative "
             f"genomic analysis. What are the key insights about gene function, "
             f"evolutionary conservation, and clinical significance? How do these genes "
-            f"relate to each other in terms of pathways and disease associations?"
-        )
-        
-        print("🤖 Comparative Analysis:")
-        print("-" * 60)
-        print(comparative_response.content)
+            f"relate to each other in terms of pathways and disease associations?\n\n"
+            f"Per-gene interpretations:\n{json.dumps(interpretations, indent=2)}"
+        ):
+            print(chunk, end="", flush=True)
+        print()
         print("-" * 60)
         
         # Display session analytics
         await display_session_analytics(agent)
         
         print(f"\n🕒 gget integration demo completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("✅ Successfully demonstrated:")
-        print("  🧬 Gene ID search and retrieval")
-        print("  📝 Gene information and annotation")
-        print("  🔍 Sequence analysis and alignment")
-        print("  🏗️ Protein structure retrieval")
-        print("  📊 Gene expression analysis")
-        print("  🛤️ Pathway enrichment analysis")
+        sys.stdout.write(DEMONSTRATED_BLOCK)
         
     except Exception as e:
         logger.error(f"Error in gget integration demonstration: {e}")
@@ -137,142 +246,294 @@ async def demonstrate_gget_integration():
         await agent.shutdown()
 
 
+async def _skipped() -> None:
+    return None
+
+
+def ensembl_ids_by_symbol(search_result: Any, symbols: List[str]) -> Dict[str, Optional[str]]:
+    """Map each gene symbol to its Ensembl ID in a multi-gene gget_search result."""
+    ids: Dict[str, Optional[str]] = {symbol: None for symbol in symbols}
+    if not isinstance(search_result, dict):
+        return ids
+    
+    # Keyed by symbol
+    for symbol in symbols:
+        entry = search_result.get(symbol)
+        if isinstance(entry, dict) and entry.get('ensembl_id'):
+            ids[symbol] = entry['ensembl_id']
+    
+    # Column-oriented DataFrame.to_dict() output
+    names, ens_ids = search_result.get('gene_name'), search_result.get('ensembl_id')
+    if isinstance(names, dict) and isinstance(ens_ids, dict):
+        for row, name in names.items():
+            if name in ids and ids[name] is None:
+                ids[name] = ens_ids.get(row)
+    return ids
+
+
+def split_by_ensembl_id(result: Any, ens_ids: List[str]) -> Dict[str, Any]:
+    """Demultiplex a column-oriented multi-ID gget result into per-ID rows."""
+    if not isinstance(result, dict) or "error" in result:
+        # Errors and unstructured payloads are shared by every ID
+        return {ens_id: result for ens_id in ens_ids}
+    return {
+        ens_id: {
+            column: values[ens_id]
+            for column, values in result.items()
+            if isinstance(values, dict) and ens_id in values
+        }
+        for ens_id in ens_ids
+    }
+
+
+async def prefetch_gget_results(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Run the list-capable gget lookups once for all genes and split them per gene."""
+    try:
+        search_result = await cached_call_tool(
+            "gget_search",
+            {"searchwords": symbols, "species": "homo_sapiens"}
+        )
+    except Exception as e:
+        search_result = e
+    ensembl_ids = ensembl_ids_by_symbol(search_result, symbols)
+    found_ids = [ens_id for ens_id in ensembl_ids.values() if ens_id]
+    
+    # Info and seq need the Ensembl IDs; enrichment only needs symbols
+    info_result, seq_result, enrichr_result = await asyncio.gather(
+        cached_call_tool(
+            "gget_info",
+            {"ens_ids": found_ids, "expand": True}
+        ) if found_ids else _skipped(),
+        cached_call_tool(
+            "gget_seq",
+            {"ens_ids": found_ids, "translate": True, "seqtype": "transcript"}
+        ) if found_ids else _skipped(),
+        cached_call_tool(
+            "gget_enrichr",
+            {
+                "genes": symbols,
+                "database": "GO_Biological_Process_2023"
+            }
+        ),
+        return_exceptions=True
+    )
+    info_map = split_by_ensembl_id(info_result, found_ids)
+    seq_map = split_by_ensembl_id(seq_result, found_ids)
+    if isinstance(enrichr_result, Exception):
+        enrichment_map = {symbol: enrichr_result for symbol in symbols}
+    else:
+        enrichment_map = split_enrichment_by_gene(enrichr_result, symbols)
+    
+    prefetched = {}
+    for symbol in symbols:
+        ensembl_id = ensembl_ids[symbol]
+        search_entry = search_result
+        if isinstance(search_result, dict) and isinstance(search_result.get(symbol), dict):
+            search_entry = search_result[symbol]
+        prefetched[symbol] = {
+            "search": search_entry,
+            "ensembl_id": ensembl_id,
+            "info": info_map.get(ensembl_id),
+            "seq": seq_map.get(ensembl_id),
+            "enrichment": enrichment_map.get(symbol)
+        }
+    return prefetched
+
+
+def split_enrichment_by_gene(enrichment: Any, symbols: List[str]) -> Dict[str, Any]:
+    """Demultiplex a multi-gene gget_enrichr result into per-gene results."""
+    overlaps = enrichment.get("overlapping_genes") if isinstance(enrichment, dict) else None
+    if not isinstance(overlaps, dict):
+        # Errors and unexpected payloads are shared by every gene
+        return {symbol: enrichment for symbol in symbols}
+    
+    per_gene = {}
+    for symbol in symbols:
+        rows = [idx for idx, genes in overlaps.items() if symbol in genes]
+        per_gene[symbol] = {
+            column: {idx: values[idx] for idx in rows if idx in values}
+            for column, values in enrichment.items()
+            if isinstance(values, dict)
+        }
+    return per_gene
+
+
+async def interpret_genes(
+    agent: "BiomedicalAgent",
+    target_genes: List[Dict[str, str]],
+    summaries: List[Dict[str, str]]
+) -> Dict[str, str]:
+    """Interpret all genes' gget results with one JSON-formatted LLM call."""
+    genes_json = json.dumps([
+        {
+            "symbol": gene_info['symbol'],
+            "description": gene_info['description'],
+            "gget_results_summary": summary
+        }
+        for gene_info, summary in zip(target_genes, summaries)
+    ], indent=2)
+    
+    response = await agent.process_message(
+        GENE_BATCH_PROMPT_TMPL.format(genes_json=genes_json),
+        response_format="json"
+    )
+    
+    try:
+        parsed = json.loads(response.content)
+    except json.JSONDecodeError:
+        parsed = None
+    if isinstance(parsed, dict):
+        parsed = parsed.get("interpretations")
+    if not isinstance(parsed, list):
+        # Fall back to showing the raw reply for every gene
+        return {g['symbol']: response.content for g in target_genes}
+    
+    entries = [e for e in parsed if isinstance(e, dict)]
+    by_symbol = {str(e.get("symbol", "")).upper(): e for e in entries}
+    interpretations = {}
+    for i, gene_info in enumerate(target_genes):
+        symbol = gene_info['symbol']
+        entry = by_symbol.get(symbol.upper()) or (entries[i] if i < len(entries) else {})
+        interpretations[symbol] = str(entry.get("analysis", "No interpretation returned"))
+    return interpretations
+
+
 async def analyze_gene_with_gget(
-    agent: BiomedicalAgent, 
     gene_info: Dict[str, str], 
-    gene_num: int
-) -> None:
-    """Analyze a single gene through the complete gget pipeline."""
+    gene_num: int,
+    prefetched: Dict[str, Any]
+) -> Dict[str, str]:
+    """Analyze a single gene through the gget pipeline and summarize the results.
+    
+    ``prefetched`` holds this gene's share of the batched search, info, seq
+    and enrichment lookups from ``prefetch_gget_results``.
+    """
     
     symbol = gene_info['symbol']
-    description = gene_info['description']
     uniprot_id = gene_info['uniprot_id']
+    summary: Dict[str, str] = {}
     
-    print(f"\n🔍 STEP {gene_num}.1: Gene Search and ID Retrieval")
-    print("-" * 50)
+    # Genes are analyzed concurrently, so buffer this gene's report and
+    # write it out in one piece at the end
+    out = io.StringIO()
     
-    # Search for Ensembl IDs using gget_search
-    try:
-        search_result = await biomcp_tools.call_tool(
-            "gget_search", 
-            {"searchwords": [symbol], "species": "homo_sapiens"}
-        )
-        print(f"📋 Gene Search Results for {symbol}:")
-        print(f"  Result: {str(search_result)[:200]}...")
-        
-        # Extract Ensembl ID if available
-        ensembl_id = None
-        if isinstance(search_result, dict) and symbol in search_result:
-            ensembl_id = search_result[symbol].get('ensembl_id') if isinstance(search_result[symbol], dict) else None
+    print(f"\n" + "="*80, file=out)
+    print(f"GENE {gene_num}: {symbol} ANALYSIS PIPELINE", file=out)
+    print("="*80, file=out)
+    
+    print(f"\n🔍 STEP {gene_num}.1: Gene Search and ID Retrieval", file=out)
+    print("-" * 50, file=out)
+    
+    # Ensembl IDs were looked up for all genes in one gget_search call
+    search_result = prefetched["search"]
+    ensembl_id = prefetched["ensembl_id"]
+    if isinstance(search_result, Exception):
+        print(f"  ❌ Gene search failed: {search_result}", file=out)
+        summary["search"] = f"failed: {search_result}"
+    else:
+        print(f"📋 Gene Search Results for {symbol}:", file=out)
+        summary["search"] = _preview(search_result)
+        print(f"  Result: {summary['search']}...", file=out)
         
         if ensembl_id:
-            print(f"  ✅ Found Ensembl ID: {ensembl_id}")
+            print(f"  ✅ Found Ensembl ID: {ensembl_id}", file=out)
         else:
-            print(f"  ⚠️  Ensembl ID not found, using gene symbol")
-            
-    except Exception as e:
-        print(f"  ❌ Gene search failed: {e}")
-        ensembl_id = None
+            print(f"  ⚠️  Ensembl ID not found, using gene symbol", file=out)
     
-    print(f"\n📖 STEP {gene_num}.2: Gene Information Retrieval")
-    print("-" * 50)
+    # Structure and expression lookups are per gene and independent
+    alphafold_result, archs4_result = await asyncio.gather(
+        cached_call_tool(
+            "gget_alphafold",
+            {"uniprot_id": uniprot_id, "save": False}
+        ),
+        cached_call_tool(
+            "gget_archs4",
+            {"gene": symbol, "which": "tissue"}
+        ),
+        return_exceptions=True
+    )
+    info_result = prefetched["info"]
+    seq_result = prefetched["seq"]
+    enrichr_result = prefetched["enrichment"]
+    
+    print(f"\n📖 STEP {gene_num}.2: Gene Information Retrieval", file=out)
+    print("-" * 50, file=out)
     
     # Get detailed gene information
-    if ensembl_id:
-        try:
-            info_result = await biomcp_tools.call_tool(
-                "gget_info",
-                {"ens_ids": [ensembl_id], "expand": True}
-            )
-            print(f"📚 Gene Information for {symbol} ({ensembl_id}):")
-            print(f"  Details: {str(info_result)[:300]}...")
-        except Exception as e:
-            print(f"  ❌ Gene info retrieval failed: {e}")
+    if not ensembl_id:
+        print(f"  ⚠️  Skipping gene info (no Ensembl ID)", file=out)
+        summary["info"] = "skipped (no Ensembl ID)"
+    elif isinstance(info_result, Exception):
+        print(f"  ❌ Gene info retrieval failed: {info_result}", file=out)
+        summary["info"] = f"failed: {info_result}"
     else:
-        print(f"  ⚠️  Skipping gene info (no Ensembl ID)")
+        summary["info"] = _preview(info_result, 300)
+        print(f"📚 Gene Information for {symbol} ({ensembl_id}):", file=out)
+        print(f"  Details: {summary['info']}...", file=out)
     
-    print(f"\n🧬 STEP {gene_num}.3: Sequence Analysis")
-    print("-" * 50)
+    print(f"\n🧬 STEP {gene_num}.3: Sequence Analysis", file=out)
+    print("-" * 50, file=out)
     
     # Get gene sequences
-    if ensembl_id:
-        try:
-            seq_result = await biomcp_tools.call_tool(
-                "gget_seq",
-                {"ens_ids": [ensembl_id], "translate": True, "seqtype": "transcript"}
-            )
-            print(f"🧪 Sequence Analysis for {symbol}:")
-            print(f"  Sequences: {str(seq_result)[:200]}...")
-        except Exception as e:
-            print(f"  ❌ Sequence retrieval failed: {e}")
+    if not ensembl_id:
+        print(f"  ⚠️  Skipping sequence analysis (no Ensembl ID)", file=out)
+        summary["sequence"] = "skipped (no Ensembl ID)"
+    elif isinstance(seq_result, Exception):
+        print(f"  ❌ Sequence retrieval failed: {seq_result}", file=out)
+        summary["sequence"] = f"failed: {seq_result}"
     else:
-        print(f"  ⚠️  Skipping sequence analysis (no Ensembl ID)")
+        summary["sequence"] = _preview(seq_result)
+        print(f"🧪 Sequence Analysis for {symbol}:", file=out)
+        print(f"  Sequences: {summary['sequence']}...", file=out)
     
-    print(f"\n🏗️ STEP {gene_num}.4: Protein Structure Retrieval")
-    print("-" * 50)
+    print(f"\n🏗️ STEP {gene_num}.4: Protein Structure Retrieval", file=out)
+    print("-" * 50, file=out)
     
     # Get AlphaFold protein structure
-    try:
-        alphafold_result = await biomcp_tools.call_tool(
-            "gget_alphafold",
-            {"uniprot_id": uniprot_id, "save": False}
-        )
-        print(f"🏗️ AlphaFold Structure for {symbol} ({uniprot_id}):")
-        print(f"  Structure info: {str(alphafold_result)[:200]}...")
-    except Exception as e:
-        print(f"  ❌ AlphaFold structure retrieval failed: {e}")
+    if isinstance(alphafold_result, Exception):
+        print(f"  ❌ AlphaFold structure retrieval failed: {alphafold_result}", file=out)
+        summary["structure"] = f"failed: {alphafold_result}"
+    else:
+        summary["structure"] = _preview(alphafold_result)
+        print(f"🏗️ AlphaFold Structure for {symbol} ({uniprot_id}):", file=out)
+        print(f"  Structure info: {summary['structure']}...", file=out)
     
-    print(f"\n📊 STEP {gene_num}.5: Gene Expression Analysis")
-    print("-" * 50)
+    print(f"\n📊 STEP {gene_num}.5: Gene Expression Analysis", file=out)
+    print("-" * 50, file=out)
     
     # Get expression data from ARCHS4
-    try:
-        archs4_result = await biomcp_tools.call_tool(
-            "gget_archs4",
-            {"gene": symbol, "which": "tissue"}
-        )
-        print(f"📈 Expression Analysis for {symbol}:")
-        print(f"  Expression data: {str(archs4_result)[:200]}...")
-    except Exception as e:
-        print(f"  ❌ Expression analysis failed: {e}")
+    if isinstance(archs4_result, Exception):
+        print(f"  ❌ Expression analysis failed: {archs4_result}", file=out)
+        summary["expression"] = f"failed: {archs4_result}"
+    else:
+        summary["expression"] = _preview(archs4_result)
+        print(f"📈 Expression Analysis for {symbol}:", file=out)
+        print(f"  Expression data: {summary['expression']}...", file=out)
     
-    print(f"\n🛤️ STEP {gene_num}.6: Pathway Enrichment Analysis")
-    print("-" * 50)
+    print(f"\n🛤️ STEP {gene_num}.6: Pathway Enrichment Analysis", file=out)
+    print("-" * 50, file=out)
     
-    # Perform enrichment analysis
-    try:
-        enrichr_result = await biomcp_tools.call_tool(
-            "gget_enrichr",
-            {
-                "genes": [symbol], 
-                "database": "GO_Biological_Process_2023"
-            }
-        )
-        print(f"🛤️ Pathway Enrichment for {symbol}:")
-        print(f"  Enrichment results: {str(enrichr_result)[:200]}...")
-    except Exception as e:
-        print(f"  ❌ Enrichment analysis failed: {e}")
-    
-    print(f"\n🧠 STEP {gene_num}.7: LLM Integration and Interpretation")
-    print("-" * 50)
-    
-    # Use LLM to interpret and synthesize gget results
-    interpretation_response = await agent.process_message(
-        f"Provide a comprehensive interpretation of our gget analysis for {symbol}. "
-        f"This gene is described as: {description}. Based on the genomic data we've "
-        f"gathered through gget tools (gene search, sequence analysis, structure data, "
-        f"expression patterns, and pathway enrichment), what are the key biological "
-        f"insights? How does this data contribute to our understanding of {symbol}'s "
-        f"function and clinical significance?"
-    )
+    # Enrichment analysis was run once for all genes
+    if isinstance(enrichr_result, Exception):
+        print(f"  ❌ Enrichment analysis failed: {enrichr_result}", file=out)
+        summary["enrichment"] = f"failed: {enrichr_result}"
+    else:
+        summary["enrichment"] = _preview(enrichr_result)
+        print(f"🛤️ Pathway Enrichment for {symbol}:", file=out)
+        print(f"  Enrichment results: {summary['enrichment']}...", file=out)
     
-    print("🧠 LLM Interpretation:")
-    print(f"  Gene: {symbol}")
-    print(f"  Analysis: {interpretation_response.content[:300]}...")
+    sys.stdout.write(out.getvalue())
+    return summary
 
 
-async def test_gget_tools():
-    """Test individual gget tools to ensure they work properly."""
+async def test_gget_tools(tools: Any = None):
+    """Test individual gget tools to ensure they work properly.
+    
+    ``tools`` is the ``biomcp_tools`` registry to check the tools against;
+    it is imported when not given.
+    """
+    if tools is None:
+        from bioagent.biomcp.tools import biomcp_tools as tools
     
     print("\n🧪 TESTING INDIVIDUAL GGET TOOLS")
     print("=" * 60)
@@ -297,14 +558,21 @@ async def test_gget_tools():
     
     for i, test_case in enumerate(test_cases, 1):
         print(f"\n{i}. Testing {test_case['tool']}: {test_case['description']}")
+        if tools.get_tool(test_case['tool']) is None:
+            print("   ⚠️  Not registered (is gget installed?)")
+            continue
         try:
-            result = await biomcp_tools.call_tool(test_case['tool'], test_case['params'])
-            print(f"   ✅ Success: {str(result)[:100]}...")
+            # Straight to the tool: a cached success would hide a backend that is down
+            result = await tools.call_tool(test_case['tool'], test_case['params'])
+            if isinstance(result, dict) and "error" in result:
+                print(f"   ❌ Failed: {result['error']}")
+            else:
+                print(f"   ✅ Success: {_preview(result, 100)}...")
         except Exception as e:
             print(f"   ❌ Failed: {e}")
 
 
-async def display_session_analytics(agent: BiomedicalAgent) -> None:
+async def display_session_analytics(agent: "BiomedicalAgent") -> None:
     """Display comprehensive session analytics."""
     
     print("\n" + "="*60)
@@ -319,10 +587,8 @@ async def display_session_analytics(agent: BiomedicalAgent) -> None:
             print(session_summary)
             
             # Export the research session
-            conversation_md = agent.session.export_conversation("markdown")
             filename = f"gget_integration_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            with open(filename, "w") as f:
-                f.write(conversation_md)
+            await agent.session.export_to_file(filename, "markdown")
             print(f"\n💾 Full research session exported to: {filename}")
             
             # Analyze research progress
@@ -340,21 +606,24 @@ async def display_session_analytics(agent: BiomedicalAgent) -> None:
         print("❌ No active session found")
 
 
-if __name__ == "__main__":
-    print("🚀 Starting gget Integration Demonstration...")
+async def run_all() -> None:
+    """Test the individual tools, then run the full demonstration.
+    
+    Both phases share one event loop, so the tool concurrency pools,
+    worker threads and warm caches carry over from the tests.
+    """
+    from bioagent.biomcp.tools import biomcp_tools
     
     # First test individual tools
-    asyncio.run(test_gget_tools())
+    await test_gget_tools(biomcp_tools)
     
     # Then run full demonstration
-    asyncio.run(demonstrate_gget_integration())
-    
-    print("\n🎉 gget Integration Demonstration Complete!")
-    print("The integration showcases:")
-    print("• Gene search and ID retrieval")
-    print("• Sequence analysis and alignment") 
-    print("• Protein structure access")
-    print("• Expression data analysis")
-    print("• Pathway enrichment analysis")
-    print("• LLM-powered result interpretation")
-    print("\n💡 Tip: Install gget with 'pip install gget' for full functionality")
\ No newline at end of file
+    await demonstrate_gget_integration()
+
+
+if __name__ == "__main__":
+    from bioagent.runtime import run
+    
+    print("🚀 Starting gget Integration Demonstration...")
+    run(run_all())
+    sys.stdout.write(CLOSING_BANNER)
\ No newline at end of file
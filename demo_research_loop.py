@@ -6,36 +6,40 @@ This script simulates a research investigation into the connection between
 the gut microbiome and Parkinson's disease, using the `bioagent` CLI.
 """
 
+import asyncio
+import os
 import subprocess
-import time
 
+from bioagent.runtime import run
 
-def run_command(command: str):
-    """Run a shell command and print the output."""
+# Set BIOAGENT_DEMO_EXECUTE=1 to run the queries through the real CLI
+# instead of printing the simulated responses.
+EXECUTE_COMMANDS = os.getenv("BIOAGENT_DEMO_EXECUTE") == "1"
+
+
+async def run_command(command: str) -> str:
+    """Run a shell command and return its output."""
     print(f"\n🚀 Running: {command}")
     
-    # In a real scenario, you would use subprocess to run the command.
-    # Here, we will simulate the output.
-    # process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    # stdout, stderr = process.communicate()
-    # 
-    # if process.returncode != 0:
-    #     print(f"Error: {stderr.decode()}")
-    # else:
-    #     print(stdout.decode())
+    if not EXECUTE_COMMANDS:
+        # Simulate a delay for realism
+        await asyncio.sleep(1)
+        return ""
     
-    # Simulate a delay for realism
-    time.sleep(1)
+    process = await asyncio.create_subprocess_shell(
+        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
     
+    if process.returncode != 0:
+        return f"Error: {stderr.decode()}"
+    return stdout.decode()
+
 
 # --- Step 1: Hypothesis Generation ---
-print("--- Step 1: Hypothesis Generation ---")
 hypothesis_query = "Research Question: What is the current evidence linking the gut microbiome to Parkinson\'s disease, and can you formulate a specific, testable hypothesis about one bacterial species?"
 
-run_command(f"bioagent query \"{hypothesis_query}\" --config demo_config.yaml")
-
-# --- Simulated Output 1 ---
-print("""🤖 Agent Response (Simulated):
+HYPOTHESIS_RESPONSE = """🤖 Agent Response (Simulated):
 
 Based on a review of current literature from the BioMCP PubMed Server, there is strong evidence linking gut dysbiosis to Parkinson's disease (PD). Several studies suggest that pro-inflammatory bacteria are enriched in PD patients, while beneficial short-chain fatty acid (SCFA) producing bacteria are depleted.
 
@@ -46,16 +50,12 @@ The bacterium *Helicobacter pylori*, known for causing gastric inflammation, exa
 🔧 Tools Used:
   • biomcp_pubmed_search
   • biomcp_microbiome_search
-""")
+"""
 
 # --- Step 2: Hypothesis Validation ---
-print("\n--- Step 2: Hypothesis Validation ---")
 validation_query = "Research Question: To validate the hypothesis, can you check for known interactions between *H. pylori* proteins and human alpha-synuclein (SNCA)? Additionally, can we predict the structure of a key *H. pylori* protein, such as Urease, that may be involved?"
 
-run_command(f"bioagent query \"{validation_query}\" --config demo_config.yaml")
-
-# --- Simulated Output 2 ---
-print("""🤖 Agent Response (Simulated):
+VALIDATION_RESPONSE = """🤖 Agent Response (Simulated):
 
 Querying the BioMCP STRING database reveals no direct, experimentally-verified interactions between *H. pylori* proteins and human alpha-synuclein (SNCA). However, there are indirect associations through immune pathways.
 
@@ -67,16 +67,12 @@ Using the AlphaGenome Structural Predictions server, I have generated a predicte
   • biomcp_string_interaction_search
   • alphagenome_predict_structure
   • biomcp_uniprot_protein_info
-""")
+"""
 
 # --- Step 3: Experimental Suggestion ---
-print("\n--- Step 3: Experimental Suggestion ---")
 experiment_query = "Research Question: Based on the validation, suggest a set of in vitro and in vivo experiments to test the hypothesis that *H. pylori* influences alpha-synuclein aggregation."
 
-run_command(f"bioagent query \"{experiment_query}\" --config demo_config.yaml")
-
-# --- Simulated Output 3 ---
-print("""🤖 Agent Response (Simulated):
+EXPERIMENT_RESPONSE = """🤖 Agent Response (Simulated):
 
 Based on the analysis, here are some suggested experiments to test the hypothesis:
 
@@ -93,7 +89,26 @@ These experiments would provide strong evidence to support or refute the propose
 🔧 Tools Used:
   • biomcp_pubmed_search (for experimental protocols)
   • biomcp_gwas_catalog (for relevant genetic markers)
-""")
+"""
+
+STEPS = [
+    ("--- Step 1: Hypothesis Generation ---", hypothesis_query, HYPOTHESIS_RESPONSE),
+    ("--- Step 2: Hypothesis Validation ---", validation_query, VALIDATION_RESPONSE),
+    ("--- Step 3: Experimental Suggestion ---", experiment_query, EXPERIMENT_RESPONSE),
+]
+
+
+async def main():
+    """Run the research loop queries concurrently and print each step in order."""
+    commands = [f"bioagent query \"{query}\" --config demo_config.yaml" for _, query, _ in STEPS]
+    outputs = await asyncio.gather(*(run_command(command) for command in commands))
+    
+    for i, ((title, _, simulated), output) in enumerate(zip(STEPS, outputs)):
+        print(f"\n{title}" if i else title)
+        print(output or simulated)
+    
+    print("\n✅ Research loop demonstration complete.")
 
-print("\n✅ Research loop demonstration complete.")
 
+if __name__ == "__main__":
+    run(main())
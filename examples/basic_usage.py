@@ -11,8 +11,10 @@ This example demonstrates how to:
 
 import asyncio
 import logging
+
 from bioagent import BiomedicalAgent
 from bioagent.core.models import AgentConfiguration, MCPServer, ResearchContext
+from bioagent.runtime import run
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -84,25 +86,34 @@ async def main():
             "Summarize the role of amyloid beta in neurodegeneration"
         ]
         
-        for i, query in enumerate(research_queries, 1):
-            print(f"\n📝 Query {i}: {query}")
-            print("🤔 Processing...")
-            
+        async def answer(i, query):
             try:
-                response = await agent.process_message(query)
-                
-                print("🤖 Response:")
-                print("-" * 60)
-                print(response.content)
-                print("-" * 60)
-                
-                if response.tool_calls:
-                    print(f"🔧 Used {len(response.tool_calls)} tools:")
-                    for tool_call in response.tool_calls:
-                        print(f"  • {tool_call.tool_name}")
-                
+                return i, query, await agent.process_message(query), None
             except Exception as e:
-                print(f"❌ Error processing query: {e}")
+                return i, query, None, e
+        
+        # The queries are independent, so run them together and print each
+        # response as soon as it arrives
+        print(f"\n🤔 Processing {len(research_queries)} queries...")
+        pending = [answer(i, query) for i, query in enumerate(research_queries, 1)]
+        
+        for next_done in asyncio.as_completed(pending):
+            i, query, response, error = await next_done
+            print(f"\n📝 Query {i}: {query}")
+            
+            if error:
+                print(f"❌ Error processing query: {error}")
+                continue
+            
+            print("🤖 Response:")
+            print("-" * 60)
+            print(response.content)
+            print("-" * 60)
+            
+            if response.tool_calls:
+                print(f"🔧 Used {len(response.tool_calls)} tools:")
+                for tool_call in response.tool_calls:
+                    print(f"  • {tool_call.tool_name}")
         
         # Show session summary
         print("\n📊 Session Summary:")
@@ -111,14 +122,11 @@ async def main():
         # Export conversation
         print("\n💾 Exporting conversation...")
         try:
-            conversation_json = session.export_conversation("json")
-            with open("example_conversation.json", "w") as f:
-                f.write(conversation_json)
+            await asyncio.gather(
+                session.export_to_file("example_conversation.json", "json"),
+                session.export_to_file("example_conversation.md", "markdown")
+            )
             print("✅ Exported to example_conversation.json")
-            
-            conversation_md = session.export_conversation("markdown")
-            with open("example_conversation.md", "w") as f:
-                f.write(conversation_md)
             print("✅ Exported to example_conversation.md")
             
         except Exception as e:
@@ -146,4 +154,4 @@ async def main():
 
 if __name__ == "__main__":
     # Run the example
-    asyncio.run(main())
+    run(main())
@@ -8,20 +8,24 @@ This demonstrates the full biomedical agent framework with:
 3. Ollama for LLM reasoning and synthesis
 """
 
-import asyncio
 import logging
 from datetime import datetime
+from typing import Optional
+
+import httpx
 
 from bioagent import BiomedicalAgent
+from bioagent.core.agent import create_ollama_client
 from bioagent.core.models import AgentConfiguration, ResearchContext
 from bioagent.biomcp.tools import biomcp_tools
+from bioagent.runtime import run
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-async def run_integrated_research_demo():
+async def run_integrated_research_demo(llm_client: Optional[httpx.AsyncClient] = None):
     """Run a complete research demonstration integrating all components."""
     
     print("🧬 INTEGRATED BIOMEDICAL RESEARCH DEMONSTRATION")
@@ -47,109 +51,92 @@ async def run_integrated_research_demo():
         model_name="llama3.1:latest",
         temperature=0.7,
         max_tokens=2000,
-        research_context=research_context
+        research_context=research_context,
+        keep_alive="30m",  # keep the model, and the cached BRCA1 prompt prefix, loaded across steps
+        semantic_cache_threshold=0.85  # repeat runs skip the LLM (paraphrases too, with sentence-transformers)
     )
     
     # Initialize the biomedical agent
-    agent = BiomedicalAgent(config)
+    agent = BiomedicalAgent(config, llm_client=llm_client)
     
     try:
         print("\n🚀 Initializing Biomedical Research Agent...")
         await agent.initialize()
+        await agent.warm_prompt_cache()
         
         # Show available tools
         tools = await agent.get_available_tools()
         print(f"📦 Available tools: {len(tools)} BioMCP tools + Ollama LLM")
         
-        print("\n" + "="*60)
-        print("STEP 1: LITERATURE ANALYSIS WITH LLM SYNTHESIS")
-        print("="*60)
-        
-        # Let the agent process a research query about BRCA1
-        response1 = await agent.process_message(
-            "Search for recent literature on BRCA1 variants and their clinical significance. "
-            "Focus on therapeutic implications and precision medicine approaches."
-        )
-        
-        print("🤖 Agent Response (Literature Analysis):")
-        print("-" * 50)
-        print(response1.content)
-        print("-" * 50)
-        
-        if response1.tool_calls:
-            print(f"\n🔧 Tools Used: {[call.tool_name for call in response1.tool_calls]}")
-        
-        print("\n" + "="*60)
-        print("STEP 2: VARIANT ANALYSIS WITH AI PREDICTIONS")
-        print("="*60)
-        
-        # Analyze specific BRCA1 variants
-        response2 = await agent.process_message(
-            "Now search for specific BRCA1 variants in the variant database. "
-            "Focus on pathogenic variants and their functional consequences. "
-            "If possible, get AI predictions for variant effects."
-        )
-        
-        print("🤖 Agent Response (Variant Analysis):")
-        print("-" * 50)
-        print(response2.content)
-        print("-" * 50)
-        
-        if response2.tool_calls:
-            print(f"\n🔧 Tools Used: {[call.tool_name for call in response2.tool_calls]}")
-        
-        print("\n" + "="*60)
-        print("STEP 3: CLINICAL TRIALS AND THERAPEUTIC OPTIONS")
-        print("="*60)
-        
-        # Search for clinical trials
-        response3 = await agent.process_message(
-            "Search for current clinical trials targeting BRCA1-related cancers. "
-            "What therapeutic strategies are being investigated? "
-            "Summarize the most promising approaches."
+        # Steps 1-4 gather data independently, so run them concurrently;
+        # only the synthesis in step 5 depends on their results
+        data_steps = [
+            (
+                "STEP 1: LITERATURE ANALYSIS WITH LLM SYNTHESIS",
+                "Literature Analysis",
+                "Search for recent literature on BRCA1 variants and their clinical significance. "
+                "Focus on therapeutic implications and precision medicine approaches."
+            ),
+            (
+                "STEP 2: VARIANT ANALYSIS WITH AI PREDICTIONS",
+                "Variant Analysis",
+                "Now search for specific BRCA1 variants in the variant database. "
+                "Focus on pathogenic variants and their functional consequences. "
+                "If possible, get AI predictions for variant effects."
+            ),
+            (
+                "STEP 3: CLINICAL TRIALS AND THERAPEUTIC OPTIONS",
+                "Clinical Trials",
+                "Search for current clinical trials targeting BRCA1-related cancers. "
+                "What therapeutic strategies are being investigated? "
+                "Summarize the most promising approaches."
+            ),
+            (
+                "STEP 4: CROSS-CANCER GENOMICS ANALYSIS",
+                "Cancer Genomics",
+                "Get a comprehensive cancer genomics summary for BRCA1 from cBioPortal. "
+                "What are the mutation patterns across different cancer types? "
+                "How does this inform therapeutic strategies?"
+            ),
+        ]
+        
+        synthesis_prompt = (
+            "Based on all the research we've conducted - literature, variants, clinical trials, "
+            "and cancer genomics - provide a comprehensive synthesis. What are the key insights "
+            "for BRCA1-based precision medicine? What experimental approaches would you recommend?"
         )
         
-        print("🤖 Agent Response (Clinical Trials):")
-        print("-" * 50)
-        print(response3.content)
-        print("-" * 50)
-        
-        if response3.tool_calls:
-            print(f"\n🔧 Tools Used: {[call.tool_name for call in response3.tool_calls]}")
-        
-        print("\n" + "="*60)
-        print("STEP 4: CROSS-CANCER GENOMICS ANALYSIS")
-        print("="*60)
-        
-        # cBioPortal analysis
-        response4 = await agent.process_message(
-            "Get a comprehensive cancer genomics summary for BRCA1 from cBioPortal. "
-            "What are the mutation patterns across different cancer types? "
-            "How does this inform therapeutic strategies?"
-        )
+        # Embed every prompt for the semantic cache in one batch up front
+        await agent.embed_prompts([prompt for _, _, prompt in data_steps] + [synthesis_prompt])
         
-        print("🤖 Agent Response (Cancer Genomics):")
-        print("-" * 50)
-        print(response4.content)
-        print("-" * 50)
+        # The steps are independent: each sees the history before them, not each other
+        print("\n⚡ Running steps 1-4 concurrently...")
+        responses = await agent.process_messages([prompt for _, _, prompt in data_steps])
         
-        if response4.tool_calls:
-            print(f"\n🔧 Tools Used: {[call.tool_name for call in response4.tool_calls]}")
+        for (title, label, _), response in zip(data_steps, responses):
+            print("\n" + "="*60)
+            print(title)
+            print("="*60)
+            
+            print(f"🤖 Agent Response ({label}):")
+            print("-" * 50)
+            print(response.content)
+            print("-" * 50)
+            
+            if response.tool_calls:
+                print(f"\n🔧 Tools Used: {[call.tool_name for call in response.tool_calls]}")
         
         print("\n" + "="*60)
         print("STEP 5: RESEARCH SYNTHESIS AND RECOMMENDATIONS")
         print("="*60)
         
-        # Final synthesis
-        response5 = await agent.process_message(
-            "Based on all the research we've conducted - literature, variants, clinical trials, "
-            "and cancer genomics - provide a comprehensive synthesis. What are the key insights "
-            "for BRCA1-based precision medicine? What experimental approaches would you recommend?"
-        )
-        
         print("🤖 Agent Response (Research Synthesis):")
         print("-" * 50)
-        print(response5.content)
+        
+        # Final synthesis, printed as it is generated
+        async for chunk in agent.process_message_stream(synthesis_prompt):
+            print(chunk, end="", flush=True)
+        print()
         print("-" * 50)
         
         # Show session summary
@@ -162,9 +149,7 @@ async def run_integrated_research_demo():
             print(session_summary)
             
             # Export the research session
-            conversation_md = agent.session.export_conversation("markdown")
-            with open("integrated_research_session.md", "w") as f:
-                f.write(conversation_md)
+            await agent.session.export_to_file("integrated_research_session.md", "markdown")
             print(f"\n💾 Full research session exported to: integrated_research_session.md")
             
             # Analyze research progress
@@ -190,20 +175,22 @@ async def run_integrated_research_demo():
         await agent.shutdown()
 
 
-async def test_ollama_biomcp_integration():
+async def test_ollama_biomcp_integration(llm_client: Optional[httpx.AsyncClient] = None):
     """Test the integration between Ollama and BioMCP tools."""
     
     print("\n🧪 TESTING OLLAMA + BioMCP INTEGRATION")
     print("=" * 50)
     
-    # Quick integration test
+    # Quick integration test; tool selection is keyword-based, so a small
+    # quantized model is enough to exercise the Ollama + BioMCP path
     config = AgentConfiguration(
         model_provider="ollama",
         model_name="llama3.1:latest",
-        temperature=0.7
+        temperature=0.7,
+        smoke_test=True
     )
     
-    agent = BiomedicalAgent(config)
+    agent = BiomedicalAgent(config, llm_client=llm_client)
     
     try:
         await agent.initialize()
@@ -228,15 +215,25 @@ async def test_ollama_biomcp_integration():
         await agent.shutdown()
 
 
+async def main():
+    """Run the integration test and the full demonstration on one event loop.
+    
+    Both agents share one Ollama client, so the second reuses its
+    keep-alive connections instead of dialing the server again.
+    """
+    async with create_ollama_client() as llm_client:
+        # First run integration test
+        await test_ollama_biomcp_integration(llm_client)
+        
+        # Then run full demonstration
+        await run_integrated_research_demo(llm_client)
+
+
 if __name__ == "__main__":
     print("🚀 Starting Integrated Biomedical Research Demonstration...")
     print("Components: BioMCP + AlphaGenome + Ollama")
     
-    # First run integration test
-    asyncio.run(test_ollama_biomcp_integration())
-    
-    # Then run full demonstration
-    asyncio.run(run_integrated_research_demo())
+    run(main())
     
     print("\n🎉 Integrated Demonstration Complete!")
     print("The biomedical agent framework is now fully operational with:")
@@ -5,13 +5,35 @@ A Python framework for building interactive biomedical research agents
 that integrate with MCP (Model Context Protocol) servers.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 __author__ = "Your Name"
 
-from .core.agent import BiomedicalAgent
-from .core.session import AgentSession
-from .mcp.client import MCPClient
-from .mcp.registry import MCPRegistry
+# Resolved on first access (PEP 562), so importing a light submodule such as
+# bioagent.cli does not pull in the agent, httpx, aiohttp and pydantic
+_LAZY_IMPORTS = {
+    "BiomedicalAgent": ".core.agent",
+    "AgentSession": ".core.session",
+    "MCPClient": ".mcp.client",
+    "MCPRegistry": ".mcp.registry",
+}
+
+if TYPE_CHECKING:
+    from .core.agent import BiomedicalAgent
+    from .core.session import AgentSession
+    from .mcp.client import MCPClient
+    from .mcp.registry import MCPRegistry
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "BiomedicalAgent",
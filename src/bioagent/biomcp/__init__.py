@@ -2,7 +2,8 @@
 BioMCP integration package for direct access to biomedical databases.
 """
 
+from .cache import ToolResultCache, cached_call
 from .client import BioMCPClient
 from .tools import BioMCPTools
 
-__all__ = ["BioMCPClient", "BioMCPTools"]
+__all__ = ["BioMCPClient", "BioMCPTools", "ToolResultCache", "cached_call"]
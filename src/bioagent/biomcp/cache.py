@@ -0,0 +1,157 @@
+"""
+Persistent result cache for BioMCP tool calls.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shelve
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .tools import biomcp_tools
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "bioagent" / "tool_results"
+DEFAULT_TTL = 24 * 60 * 60
+
+# gget backends (Ensembl, AlphaFold, ARCHS4, Enrichr) change rarely
+GGET_CACHE_PATH = Path.home() / ".cache" / "bioagent" / "gget" / "results"
+GGET_TTL = 7 * 24 * 60 * 60
+
+
+class ToolResultCache:
+    """Memoize ``biomcp_tools.call_tool`` results in memory and on disk.
+
+    Entries are keyed on the tool name plus a hash of the canonicalized
+    parameters and expire after ``ttl`` seconds (or the tool's entry in
+    ``tool_ttls``, keyed by bare tool name even for ``server/tool`` keys)
+    so literature searches stay reasonably fresh. Error results are never
+    stored. With ``refresh`` (default: the
+    ``BIOAGENT_CACHE_REFRESH=1`` env var) lookups are skipped and every
+    call goes to the tool, refreshing the stored result.
+    """
+
+    def __init__(self, 
+                 path: Path = DEFAULT_CACHE_PATH, 
+                 ttl: float = DEFAULT_TTL,
+                 tool_ttls: Optional[Dict[str, float]] = None,
+                 refresh: Optional[bool] = None):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.tool_ttls = tool_ttls or {}
+        if refresh is None:
+            refresh = os.getenv("BIOAGENT_CACHE_REFRESH") == "1"
+        self.refresh = refresh
+        self._memory: Dict[str, Tuple[float, Any]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def make_key(tool_name: str, params: Dict[str, Any]) -> str:
+        """Build a stable cache key for a tool call."""
+        canonical = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+        return f"{tool_name}:{digest}"
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _fresh(self, key: str, entry: Optional[Tuple[float, Any]]) -> bool:
+        if entry is None:
+            return False
+        # Registry keys carry a "server/" prefix; tool_ttls is keyed by bare tool name
+        tool_name = key.partition(":")[0].rpartition("/")[2]
+        return time.time() - entry[0] < self.tool_ttls.get(tool_name, self.ttl)
+
+    def _load(self, key: str) -> Optional[Tuple[float, Any]]:
+        if not self.path.parent.exists():
+            return None
+        with shelve.open(str(self.path)) as db:
+            return db.get(key)
+
+    def _store(self, key: str, entry: Tuple[float, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with shelve.open(str(self.path)) as db:
+            db[key] = entry
+
+    def _truncate(self, prefix: Optional[str] = None) -> None:
+        if not self.path.parent.exists():
+            return
+        if prefix is None:
+            with shelve.open(str(self.path), flag="n"):
+                pass
+            return
+        with shelve.open(str(self.path)) as db:
+            for key in [key for key in db.keys() if key.startswith(prefix)]:
+                del db[key]
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(hit, value)`` for ``key``.
+
+        In-memory hits skip the disk entirely; the shelve is read in a
+        worker thread so a miss does not block the event loop.
+        """
+        entry = self._memory.get(key)
+        if self._fresh(key, entry):
+            return True, entry[1]
+
+        async with self._get_lock():
+            entry = await asyncio.to_thread(self._load, key)
+            if not self._fresh(key, entry):
+                return False, None
+            self._memory[key] = entry
+            return True, entry[1]
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``."""
+        entry = (time.time(), value)
+        self._memory[key] = entry
+        async with self._get_lock():
+            await asyncio.to_thread(self._store, key, entry)
+
+    async def call(self,
+                   tool_name: str,
+                   params: Dict[str, Any],
+                   fetch: Optional[Callable[[str, Dict[str, Any]], Awaitable[Any]]] = None) -> Any:
+        """Call ``tool_name`` through the cache.
+
+        ``fetch`` performs the call on a miss; it defaults to
+        ``biomcp_tools.call_tool``.
+        """
+        key = self.make_key(tool_name, params)
+        if not self.refresh:
+            hit, value = await self.get(key)
+            if hit:
+                logger.debug("Tool cache hit: %s", key)
+                return value
+
+        result = await (fetch or biomcp_tools.call_tool)(tool_name, params)
+        if not (isinstance(result, dict) and "error" in result):
+            await self.set(key, result)
+        return result
+
+    async def clear(self, prefix: Optional[str] = None) -> None:
+        """Drop every cached result, or only those whose key starts with ``prefix``."""
+        if prefix is None:
+            self._memory.clear()
+        else:
+            for key in [key for key in self._memory if key.startswith(prefix)]:
+                del self._memory[key]
+        async with self._get_lock():
+            await asyncio.to_thread(self._truncate, prefix)
+
+
+# Singleton instances of ToolResultCache
+tool_result_cache = ToolResultCache()
+gget_result_cache = ToolResultCache(path=GGET_CACHE_PATH, ttl=GGET_TTL)
+
+
+async def cached_call(tool_name: str, params: Dict[str, Any]) -> Any:
+    """Call a BioMCP or gget tool, reusing a cached result when available."""
+    return await tool_result_cache.call(tool_name, params)
@@ -6,116 +6,162 @@ This client uses the biomcp-python package to directly invoke BioMCP tools.
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional
-
-from biomcp.individual_tools import (
-    article_searcher, article_getter, 
-    trial_searcher, trial_getter,
-    variant_searcher, variant_getter,
-    get_cbioportal_summary_for_genes
-)
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
 
 from ..core.models import Tool, ToolParameter, ToolCall, ToolResult
+from .cache import ToolResultCache
 
 logger = logging.getLogger(__name__)
 
+BIOMCP_CACHE_PATH = Path.home() / ".cache" / "bioagent" / "biomcp" / "results"
+
+# Literature and variant records change slowly; trial recruitment status does not
+BIOMCP_CACHE_TTLS: Dict[str, float] = {
+    "clinical_trial_search": 60 * 60,
+    "get_clinical_trial": 60 * 60,
+}
+
+
+def _build_tools() -> Dict[str, Tool]:
+    """Build the catalog of available BioMCP tools."""
+    tools = {
+        "pubmed_search": Tool(
+            name="pubmed_search",
+            description="Search PubMed for biomedical literature",
+            server_id="biomcp_direct",
+            parameters=[
+                ToolParameter(name="query", type="string", required=True),
+                ToolParameter(name="limit", type="integer", default=10)
+            ]
+        ),
+        "get_article": Tool(
+            name="get_article",
+            description="Get details of a specific PubMed article by ID",
+            server_id="biomcp_direct",
+            parameters=[
+                ToolParameter(name="pmid", type="string", required=True)
+            ]
+        ),
+        "clinical_trial_search": Tool(
+            name="clinical_trial_search",
+            description="Search ClinicalTrials.gov for relevant studies",
+            server_id="biomcp_direct",
+            parameters=[
+                ToolParameter(name="query", type="string", required=True),
+                ToolParameter(name="limit", type="integer", default=10)
+            ]
+        ),
+        "get_clinical_trial": Tool(
+            name="get_clinical_trial",
+            description="Get details of a specific clinical trial by ID",
+            server_id="biomcp_direct",
+            parameters=[
+                ToolParameter(name="nct_id", type="string", required=True)
+            ]
+        ),
+        "variant_search": Tool(
+            name="variant_search",
+            description="Search MyVariant.info for genomic variants",
+            server_id="biomcp_direct",
+            parameters=[
+                ToolParameter(name="query", type="string", required=True),
+                ToolParameter(name="limit", type="integer", default=10)
+            ]
+        ),
+        "get_variant": Tool(
+            name="get_variant",
+            description="Get details of a specific genomic variant by ID",
+            server_id="biomcp_direct",
+            parameters=[
+                ToolParameter(name="variant_id", type="string", required=True)
+            ]
+        ),
+        "cbioportal_summary": Tool(
+            name="cbioportal_summary",
+            description="Get cancer genomics summary from cBioPortal for a list of genes",
+            server_id="biomcp_direct",
+            parameters=[
+                ToolParameter(name="genes", type="list", required=True)
+            ]
+        )
+    }
+    return tools
+
+
+# Built once at import; the catalog is the same for every client and read-only
+_BIOMCP_TOOLS: Mapping[str, Tool] = MappingProxyType(_build_tools())
+
 
 class BioMCPClient:
     """Client for direct communication with BioMCP tools via biomcp-python."""
     
-    def __init__(self):
-        self._tools = self._discover_tools()
+    def __init__(self, cache: Optional[ToolResultCache] = None):
+        """Create the client.
+        
+        Results are cached on disk when ``cache`` is given or the
+        ``BIOMCP_CACHE=1`` env var is set.
+        """
+        # Imported here so importing bioagent.biomcp does not load biomcp itself
+        from biomcp.individual_tools import (
+            article_searcher, article_getter, 
+            trial_searcher, trial_getter,
+            variant_searcher, variant_getter,
+            get_cbioportal_summary_for_genes
+        )
+        
+        self._tools = _BIOMCP_TOOLS
+        self._dispatch: Dict[str, Callable[..., Awaitable[Any]]] = {
+            "pubmed_search": article_searcher,
+            "get_article": article_getter,
+            "clinical_trial_search": trial_searcher,
+            "get_clinical_trial": trial_getter,
+            "variant_search": variant_searcher,
+            "get_variant": variant_getter,
+            "cbioportal_summary": get_cbioportal_summary_for_genes,
+        }
+        # Calls currently running, so identical concurrent requests share one
+        self._inflight: Dict[str, asyncio.Future] = {}
+        if cache is None and os.getenv("BIOMCP_CACHE") == "1":
+            cache = ToolResultCache(path=BIOMCP_CACHE_PATH, tool_ttls=BIOMCP_CACHE_TTLS)
+        self._cache = cache
         logger.info("BioMCP client initialized with direct tool access")
 
-    def _discover_tools(self) -> Dict[str, Tool]:
-        """Discover available BioMCP tools."""
-        tools = {
-            "pubmed_search": Tool(
-                name="pubmed_search",
-                description="Search PubMed for biomedical literature",
-                server_id="biomcp_direct",
-                parameters=[
-                    ToolParameter(name="query", type="string", required=True),
-                    ToolParameter(name="limit", type="integer", default=10)
-                ]
-            ),
-            "get_article": Tool(
-                name="get_article",
-                description="Get details of a specific PubMed article by ID",
-                server_id="biomcp_direct",
-                parameters=[
-                    ToolParameter(name="pmid", type="string", required=True)
-                ]
-            ),
-            "clinical_trial_search": Tool(
-                name="clinical_trial_search",
-                description="Search ClinicalTrials.gov for relevant studies",
-                server_id="biomcp_direct",
-                parameters=[
-                    ToolParameter(name="query", type="string", required=True),
-                    ToolParameter(name="limit", type="integer", default=10)
-                ]
-            ),
-            "get_clinical_trial": Tool(
-                name="get_clinical_trial",
-                description="Get details of a specific clinical trial by ID",
-                server_id="biomcp_direct",
-                parameters=[
-                    ToolParameter(name="nct_id", type="string", required=True)
-                ]
-            ),
-            "variant_search": Tool(
-                name="variant_search",
-                description="Search MyVariant.info for genomic variants",
-                server_id="biomcp_direct",
-                parameters=[
-                    ToolParameter(name="query", type="string", required=True),
-                    ToolParameter(name="limit", type="integer", default=10)
-                ]
-            ),
-            "get_variant": Tool(
-                name="get_variant",
-                description="Get details of a specific genomic variant by ID",
-                server_id="biomcp_direct",
-                parameters=[
-                    ToolParameter(name="variant_id", type="string", required=True)
-                ]
-            ),
-            "cbioportal_summary": Tool(
-                name="cbioportal_summary",
-                description="Get cancer genomics summary from cBioPortal for a list of genes",
-                server_id="biomcp_direct",
-                parameters=[
-                    ToolParameter(name="genes", type="list", required=True)
-                ]
-            )
-        }
-        return tools
-    
+    async def __aenter__(self) -> "BioMCPClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the keep-alive connections biomcp pools per event loop.
+        
+        biomcp already shares one ``httpx.AsyncClient`` across all tool
+        calls on a loop; this releases it once the caller is done.
+        """
+        from biomcp.connection_pool import close_all_pools
+        
+        await close_all_pools()
+
     async def call_tool(self, tool_call: ToolCall) -> ToolResult:
         """Call a BioMCP tool directly."""
         tool_name = tool_call.tool_name
         params = tool_call.parameters
         
         try:
-            logger.info(f"Calling BioMCP tool: {tool_name} with params: {params}")
-            
-            if tool_name == "pubmed_search":
-                result = await article_searcher(**params)
-            elif tool_name == "get_article":
-                result = await article_getter(**params)
-            elif tool_name == "clinical_trial_search":
-                result = await trial_searcher(**params)
-            elif tool_name == "get_clinical_trial":
-                result = await trial_getter(**params)
-            elif tool_name == "variant_search":
-                result = await variant_searcher(**params)
-            elif tool_name == "get_variant":
-                result = await variant_getter(**params)
-            elif tool_name == "cbioportal_summary":
-                result = await get_cbioportal_summary_for_genes(**params)
+            key = ToolResultCache.make_key(tool_name, params)
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._fetch(tool_name, params))
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
             else:
-                raise NotImplementedError(f"Tool {tool_name} not implemented in BioMCP client")
+                logger.debug("Joining in-flight BioMCP call: %s", tool_name)
+            
+            # Shielded so one caller giving up does not cancel the others
+            result = await asyncio.shield(task)
                 
             return ToolResult(
                 call_id=tool_call.call_id,
@@ -124,13 +170,28 @@ class BioMCPClient:
             )
             
         except Exception as e:
-            logger.error(f"Error calling BioMCP tool {tool_name}: {e}")
+            logger.error("Error calling BioMCP tool %s: %s", tool_name, e)
             return ToolResult(
                 call_id=tool_call.call_id,
                 success=False,
                 error=str(e)
             )
     
+    async def _fetch(self, tool_name: str, params: Dict[str, Any]) -> Any:
+        """Get a tool result from the cache, if enabled, or the tool itself."""
+        if self._cache:
+            return await self._cache.call(tool_name, params, self._invoke)
+        return await self._invoke(tool_name, params)
+    
+    async def _invoke(self, tool_name: str, params: Dict[str, Any]) -> Any:
+        """Run a BioMCP tool function."""
+        logger.info("Calling BioMCP tool: %s with params: %s", tool_name, params)
+        
+        func = self._dispatch.get(tool_name)
+        if func is None:
+            raise NotImplementedError(f"Tool {tool_name} not implemented in BioMCP client")
+        return await func(**params)
+    
     def get_available_tools(self) -> List[Tool]:
         """Get the list of available BioMCP tools."""
         return list(self._tools.values())
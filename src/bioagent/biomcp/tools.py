@@ -2,96 +2,230 @@
 BioMCP Tools wrapper to expose biomcp-python tools to the agent.
 """
 
+import asyncio
+import functools
 import inspect
 import logging
-from typing import Any, Callable, Coroutine, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Mapping, Optional, Tuple
 
-from biomcp import individual_tools
 from ..core.models import Tool, ToolParameter
 from .gget_tools import gget_tools
 
 logger = logging.getLogger(__name__)
 
+# Max in-flight calls per tool, so concurrent fan-outs stay under each
+# remote service's rate limits. Tools not listed get DEFAULT_POOL_LIMIT.
+SOURCE_POOL_LIMITS: Dict[str, int] = {
+    "gget_search": 8,
+    "gget_info": 4,
+    "gget_seq": 4,
+    "gget_archs4": 4,
+    "gget_enrichr": 4,
+    "gget_alphafold": 2,
+    "gget_blast": 2,
+}
+DEFAULT_POOL_LIMIT = 4
+
+# Per-call time limits in seconds, so one slow backend cannot stall a
+# gathered batch. Tools not listed get DEFAULT_TOOL_TIMEOUT (None: no limit).
+TOOL_TIMEOUTS: Dict[str, float] = {
+    "gget_search": 10,
+    "gget_info": 15,
+    "gget_seq": 15,
+    "gget_enrichr": 20,
+    "gget_alphafold": 30,
+}
+DEFAULT_TOOL_TIMEOUT: Optional[float] = None
+
+ToolFunction = Callable[..., Coroutine[Any, Any, Any]]
+# A call taking the tool's parameter dict
+ToolRoute = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Python annotation -> JSON schema type; anything else is described as "string"
+_TYPE_MAP: Dict[Any, str] = {
+    int: "integer",
+    bool: "boolean",
+    list: "array",
+    float: "number",
+    str: "string",
+}
+_EMPTY = inspect.Parameter.empty
+
+
+def _create_tool_from_function(name: str, func: Callable[..., Any]) -> Tool:
+    """Create a Tool object from an async function."""
+    sig = inspect.signature(func)
+    # Only the first line is used, so skip inspect.getdoc's full cleandoc pass
+    # and take just that line instead of splitting the whole docstring
+    description = (func.__doc__ or "").lstrip().partition('\n')[0].rstrip() or f"BioMCP tool: {name}"
+    
+    # Built from the function's own signature, so skip pydantic validation
+    parameters = []
+    for param_name, param in sig.parameters.items():
+        default = param.default
+        parameters.append(ToolParameter.model_construct(
+            name=param_name,
+            type=_TYPE_MAP.get(param.annotation, "string"),
+            description=None,  # Not easily available from signature
+            required=default is _EMPTY,
+            default=None if default is _EMPTY else default
+        ))
+    
+    return Tool.model_construct(
+        name=name,
+        description=description,
+        server_id="biomcp_direct",
+        parameters=parameters
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _discover_tools() -> Tuple[Mapping[str, Tool], Mapping[str, ToolFunction]]:
+    """Discover all available tools from biomcp.individual_tools.
+    
+    Runs on first use rather than at import: importing biomcp pulls in the
+    whole MCP server stack, which commands that never call a tool should
+    not pay for. The read-only catalog is then shared by every instance.
+    """
+    from biomcp import individual_tools
+    
+    tools: Dict[str, Tool] = {}
+    functions: Dict[str, ToolFunction] = {}
+    # A plain namespace scan; inspect.getmembers would getattr every attribute
+    candidates = sorted(
+        (name, func) for name, func in vars(individual_tools).items()
+        if not name.startswith('_') and inspect.iscoroutinefunction(func)
+    )
+    for name, func in candidates:
+        try:
+            tools[name] = _create_tool_from_function(name, func)
+            functions[name] = func
+            logger.debug("Discovered BioMCP tool: %s", name)
+        except Exception as e:
+            logger.warning("Could not create tool for %s: %s", name, e)
+    return MappingProxyType(tools), MappingProxyType(functions)
+
+
+def _biomcp_route(func: ToolFunction) -> ToolRoute:
+    return lambda params: func(**params)
+
+
+@functools.lru_cache(maxsize=None)
+def _routing_table() -> Tuple[Mapping[str, Tool], Mapping[str, ToolRoute]]:
+    """Map every BioMCP and gget tool name to its Tool and to its call.
+    
+    Built once, so resolving a tool is a single dict lookup.
+    """
+    biomcp_catalog, functions = _discover_tools()
+    tools: Dict[str, Tool] = dict(biomcp_catalog)
+    routes: Dict[str, ToolRoute] = {name: _biomcp_route(func) for name, func in functions.items()}
+    for tool in gget_tools.get_available_tools():
+        tools[tool.name] = tool
+        routes[tool.name] = functools.partial(gget_tools.call_tool, tool.name)
+    return MappingProxyType(tools), MappingProxyType(routes)
+
+
+def _release_slot(pool: asyncio.Semaphore, call: "asyncio.Future[Any]") -> None:
+    """Free a call's pool slot once it is done."""
+    pool.release()
+    # Retrieve the error of a call nobody awaits any more, so asyncio does not warn
+    if not call.cancelled():
+        call.exception()
+
 
 class BioMCPTools:
     """Wrapper for discovering and exposing BioMCP tools."""
     
     def __init__(self):
-        self._tools: Dict[str, Tool] = {}
-        self._tool_functions: Dict[str, Callable[..., Coroutine[Any, Any, Any]]] = {}
-        self._discover_tools()
-
-    def _discover_tools(self):
-        """Discover all available tools from biomcp.individual_tools."""
-        for name, func in inspect.getmembers(individual_tools, inspect.iscoroutinefunction):
-            if not name.startswith('_'):
-                try:
-                    tool = self._create_tool_from_function(name, func)
-                    self._tools[name] = tool
-                    self._tool_functions[name] = func
-                    logger.info(f"Discovered BioMCP tool: {name}")
-                except Exception as e:
-                    logger.warning(f"Could not create tool for {name}: {e}")
+        self._pool_limits: Dict[str, int] = dict(SOURCE_POOL_LIMITS)
+        self._default_pool_limit = DEFAULT_POOL_LIMIT
+        self._pools: Dict[str, asyncio.Semaphore] = {}
+        self._pools_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tools_by_prefix: Dict[str, List[Tool]] = {}
     
-    def _create_tool_from_function(self, name: str, func: Callable[..., Any]) -> Tool:
-        """Create a Tool object from an async function."""
-        sig = inspect.signature(func)
-        doc = inspect.getdoc(func) or f"BioMCP tool: {name}"
-        
-        parameters = []
-        for param_name, param in sig.parameters.items():
-            # Map python types to JSON schema types
-            param_type = "string"
-            if param.annotation == int:
-                param_type = "integer"
-            elif param.annotation == bool:
-                param_type = "boolean"
-            elif param.annotation == list:
-                param_type = "array"
-                
-            parameters.append(ToolParameter(
-                name=param_name,
-                type=param_type,
-                description=None,  # Not easily available from signature
-                required=param.default == inspect.Parameter.empty,
-                default=param.default if param.default != inspect.Parameter.empty else None
-            ))
+    def set_concurrency_limits(self, limits: Dict[str, int], default: Optional[int] = None) -> None:
+        """Override the per-tool limits on concurrent in-flight calls."""
+        self._pool_limits.update(limits)
+        if default is not None:
+            self._default_pool_limit = default
+        self._pools.clear()
+
+    def _get_pool(self, tool_name: str) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent calls to a tool."""
+        # Semaphores bind to the loop they first wait on, so start over
+        # whenever a new event loop is driving the calls
+        loop = asyncio.get_running_loop()
+        if loop is not self._pools_loop:
+            self._pools.clear()
+            self._pools_loop = loop
         
-        return Tool(
-            name=name,
-            description=doc.split('\n')[0],
-            server_id="biomcp_direct",
-            parameters=parameters
-        )
+        pool = self._pools.get(tool_name)
+        if pool is None:
+            pool = asyncio.Semaphore(self._pool_limits.get(tool_name, self._default_pool_limit))
+            self._pools[tool_name] = pool
+        return pool
     
     async def call_tool(self, tool_name: str, params: Dict[str, Any]) -> Any:
-        """Call a discovered BioMCP or gget tool."""
-        # Check if it's a gget tool first
-        if tool_name.startswith('gget_'):
-            return await gget_tools.call_tool(tool_name, params)
+        """Call a discovered BioMCP or gget tool.
         
-        # Otherwise, use BioMCP tools
-        if tool_name not in self._tool_functions:
-            raise NotImplementedError(f"Tool {tool_name} not found in BioMCP tools")
+        Raises ``asyncio.TimeoutError`` if the call outlives the tool's
+        time limit; time spent waiting for a pool slot does not count.
+        Only the caller stops waiting: gget work in a worker thread cannot
+        be interrupted, so the call runs on in the background and keeps
+        its pool slot until it finishes. The pool thus bounds the work
+        actually in flight, not just the callers still waiting.
+        """
+        timeout = TOOL_TIMEOUTS.get(tool_name, DEFAULT_TOOL_TIMEOUT)
+        pool = self._get_pool(tool_name)
+        await pool.acquire()
+        call = asyncio.ensure_future(self._dispatch(tool_name, params))
+        call.add_done_callback(functools.partial(_release_slot, pool))
+        try:
+            return await asyncio.wait_for(asyncio.shield(call), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Tool %s timed out after %ss", tool_name, timeout)
+            raise asyncio.TimeoutError(f"{tool_name} timed out after {timeout}s") from None
+
+    @property
+    def _tools(self) -> Mapping[str, Tool]:
+        return _routing_table()[0]
+
+    async def _dispatch(self, tool_name: str, params: Dict[str, Any]) -> Any:
+        """Route a call to the gget wrapper or the BioMCP tool function."""
+        route = _routing_table()[1].get(tool_name)
+        if route is not None:
+            return await route(params)
         
-        func = self._tool_functions[tool_name]
-        return await func(**params)
+        # Without gget installed there are no gget routes; its wrapper reports that
+        if tool_name.startswith('gget_'):
+            return await gget_tools.call_tool(tool_name, params)
+        raise NotImplementedError(f"Tool {tool_name} not found in BioMCP tools")
 
     def get_available_tools(self) -> List[Tool]:
         """Get all discovered BioMCP and gget tools."""
-        all_tools = list(self._tools.values())
-        all_tools.extend(gget_tools.get_available_tools())
-        return all_tools
+        return list(self._tools.values())
+    
+    def get_tools_by_prefix(self, prefix: str) -> List[Tool]:
+        """Get the tools whose names start with ``prefix`` (e.g. "gget_").
+        
+        The tool set is fixed after discovery, so each prefix is scanned once
+        and the returned list is shared between callers.
+        """
+        if prefix not in self._tools_by_prefix:
+            self._tools_by_prefix[prefix] = [
+                tool for tool in self.get_available_tools() if tool.name.startswith(prefix)
+            ]
+        return self._tools_by_prefix[prefix]
     
     def get_tool(self, tool_name: str) -> Optional[Tool]:
         """Get a specific tool by name."""
-        # Check gget tools first
-        if tool_name.startswith('gget_'):
-            return gget_tools.get_tool(tool_name)
-        
-        # Otherwise check BioMCP tools
         return self._tools.get(tool_name)
 
+    def close(self) -> None:
+        """Release resources held by the gget wrapper."""
+        gget_tools.close()
+
 
 # Singleton instance of BioMCPTools
 biomcp_tools = BioMCPTools()
@@ -6,18 +6,27 @@ import asyncio
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 import click
 import yaml
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
-from .core.agent import BiomedicalAgent
-from .core.models import AgentConfiguration, MCPServer, ResearchContext
-from .ui.interactive import InteractiveSession
+# The agent stack (httpx, aiohttp, pydantic models) is imported by the commands
+# that run it, so --help, init-config and list-servers start quickly
+if TYPE_CHECKING:
+    from .core.models import AgentConfiguration
+
+# Prefer the libyaml-backed loader/dumper, fall back to pure Python if not built
+try:
+    from yaml import CSafeDumper as YAMLDumper, CSafeLoader as YAMLLoader
+except ImportError:
+    from yaml import SafeDumper as YAMLDumper, SafeLoader as YAMLLoader
 
 console = Console()
 logger = logging.getLogger(__name__)
@@ -42,7 +51,7 @@ def cli(ctx, config: Optional[str], verbose: bool):
         config_path = Path(config)
         if config_path.exists():
             with open(config_path, 'r') as f:
-                config_data = yaml.safe_load(f)
+                config_data = yaml.load(f, Loader=YAMLLoader)
             ctx.obj = config_data
         else:
             console.print(f"[red]Configuration file not found: {config}[/red]")
@@ -58,6 +67,7 @@ def cli(ctx, config: Optional[str], verbose: bool):
 @click.pass_context
 def interactive(ctx, model: str, provider: str, temperature: float):
     """Start an interactive research session"""
+    from .core.models import AgentConfiguration
     
     config_data = ctx.obj
     
@@ -73,8 +83,11 @@ def interactive(ctx, model: str, provider: str, temperature: float):
     asyncio.run(_run_interactive_session(agent_config, config_data))
 
 
-async def _run_interactive_session(agent_config: AgentConfiguration, config_data: dict):
+async def _run_interactive_session(agent_config: 'AgentConfiguration', config_data: dict):
     """Run the interactive session"""
+    from .core.agent import BiomedicalAgent
+    from .core.models import MCPServer
+    from .ui.interactive import InteractiveSession
     
     console.print(Panel.fit(
         "[bold blue]Biomedical Agent Framework[/bold blue]\n"
@@ -176,6 +189,8 @@ def test_server(ctx, server_id: str):
 
 async def _test_server_connection(server_id: str, server_config: dict):
     """Test connection to a server"""
+    from .core.models import MCPServer
+    from .mcp.client import MCPClient
     
     console.print(f"[yellow]Testing connection to {server_id}...[/yellow]")
     
@@ -186,8 +201,6 @@ async def _test_server_connection(server_id: str, server_config: dict):
         description=server_config.get('description', '')
     )
     
-    from .mcp.client import MCPClient
-    
     client = MCPClient(server)
     
     try:
@@ -249,7 +262,7 @@ def init_config(output: Optional[str]):
     output_path = Path(output) if output else Path('agent_config.yaml')
     
     with open(output_path, 'w') as f:
-        yaml.dump(config_template, f, default_flow_style=False, indent=2)
+        yaml.dump(config_template, f, Dumper=YAMLDumper, default_flow_style=False, indent=2)
     
     console.print(f"[green]Configuration template created: {output_path}[/green]")
     console.print("[blue]Edit the configuration file to match your setup[/blue]")
@@ -262,24 +275,24 @@ def init_config(output: Optional[str]):
 @click.pass_context
 def query(ctx, message: str, session_id: Optional[str], context_domain: Optional[str]):
     """Send a single query to the agent"""
+    from .core.models import AgentConfiguration, ResearchContext
     
     config_data = ctx.obj
     
     agent_config = AgentConfiguration(
-        enabled_servers=config_data.get('enabled_servers', [])
+        enabled_servers=config_data.get('enabled_servers', []),
+        research_context=ResearchContext(domain=context_domain) if context_domain else None
     )
     
-    if context_domain:
-        agent_config.research_context = ResearchContext(domain=context_domain)
-    
     asyncio.run(_run_single_query(agent_config, config_data, message, session_id))
 
 
-async def _run_single_query(agent_config: AgentConfiguration, 
+async def _run_single_query(agent_config: 'AgentConfiguration', 
                            config_data: dict, 
                            message: str, 
                            session_id: Optional[str]):
     """Run a single query"""
+    from .core.agent import BiomedicalAgent
     
     agent = BiomedicalAgent(agent_config)
     
@@ -291,15 +304,20 @@ async def _run_single_query(agent_config: AgentConfiguration,
             # Similar to interactive mode but simplified
             pass
         
-        # Process message
-        response = await agent.process_message(message, session_id)
-        
-        # Display response
-        console.print(Panel(
-            Markdown(response.content),
-            title="Agent Response",
-            border_style="green"
-        ))
+        # Process message, showing the raw text as it is generated; Live
+        # redraws it at most refresh_per_second times, and the Markdown is
+        # parsed once the response is complete
+        text = Text()
+        with Live(Panel(text, title="Agent Response", border_style="green"),
+                  console=console, refresh_per_second=8) as live:
+            async for chunk in agent.process_message_stream(message, session_id):
+                text.append(chunk)
+            live.update(Panel(
+                Markdown(text.plain),
+                title="Agent Response",
+                border_style="green"
+            ), refresh=True)
+        response = agent.session.messages[-1]
         
         if response.tool_calls:
             console.print("[blue]Tools used:[/blue]")
@@ -2,13 +2,29 @@
 Core components of the biomedical agent framework.
 """
 
-from .agent import BiomedicalAgent
+from typing import TYPE_CHECKING, Any
+
 from .models import (
     AgentConfiguration, AgentMessage, ResearchContext,
     MCPServer, Tool, ToolCall, ToolResult
 )
+from .semantic_cache import SemanticCache
 from .session import AgentSession
 
+# The agent imports bioagent.biomcp, whose modules import these models, so it
+# is resolved on first access (PEP 562) to keep that import order-independent
+if TYPE_CHECKING:
+    from .agent import BiomedicalAgent
+
+
+def __getattr__(name: str) -> Any:
+    if name != "BiomedicalAgent":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from .agent import BiomedicalAgent
+    globals()[name] = BiomedicalAgent
+    return BiomedicalAgent
+
+
 __all__ = [
     "BiomedicalAgent",
     "AgentConfiguration", 
@@ -18,5 +34,6 @@ __all__ = [
     "Tool",
     "ToolCall", 
     "ToolResult",
-    "AgentSession"
+    "AgentSession",
+    "SemanticCache"
 ]
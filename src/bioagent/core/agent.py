@@ -3,10 +3,11 @@ Main biomedical agent that orchestrates MCP tools and LLM interactions.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import uuid4
 
 import httpx
@@ -14,25 +15,122 @@ from pydantic import ValidationError
 
 from .models import (
     AgentConfiguration, AgentMessage, ResearchContext, 
-    ToolCall, ToolResult, MCPServer
+    Tool, ToolCall, ToolResult, MCPServer
 )
+from .semantic_cache import Embedding, SemanticCache
 from .session import AgentSession
 from ..mcp.registry import MCPRegistry
 from ..biomcp.tools import biomcp_tools
 
 logger = logging.getLogger(__name__)
 
+# Prefer orjson for serializing (often large) tool results into prompts and
+# for Ollama request/response bodies, which carry long texts and token contexts
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+OLLAMA_BASE_URL = "http://localhost:11434"
+
+# Generations are minutes apart at most, so keep idle connections around well
+# past httpx's 5 s default instead of reconnecting for each turn
+OLLAMA_POOL_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=16,
+    keepalive_expiry=300.0
+)
+
+
+class LLMError(Exception):
+    """An LLM call failed; the message is shown to the user as the reply."""
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _json_body(payload: Dict[str, Any]) -> bytes:
+    return orjson.dumps(payload) if ORJSON_AVAILABLE else json.dumps(payload).encode()
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _format_tool_result(result: Any) -> str:
+    """Render a tool result for the prompt, as JSON when it is structured."""
+    if isinstance(result, str):
+        return result
+    try:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(result, default=str, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return str(result)
+
+
+def _new_message(role: str, content: str, **fields: Any) -> AgentMessage:
+    """Create an agent-built message, skipping pydantic validation."""
+    return AgentMessage.model_construct(
+        id=uuid4().hex,
+        timestamp=datetime.now(),
+        role=role,
+        content=content,
+        **fields
+    )
+
+
+def create_ollama_client(limits: Optional[httpx.Limits] = None) -> httpx.AsyncClient:
+    """Create an HTTP client for the local Ollama server.
+    
+    Pass one to several agents (``BiomedicalAgent(config, llm_client=...)``)
+    to share its connection pool; the caller then closes it.
+    """
+    return httpx.AsyncClient(
+        base_url=OLLAMA_BASE_URL,
+        timeout=httpx.Timeout(180.0),  # 180 second timeout
+        limits=limits or OLLAMA_POOL_LIMITS
+    )
+
 
 class BiomedicalAgent:
     """
     Main biomedical research agent that integrates MCP tools with LLM capabilities.
     """
     
-    def __init__(self, config: AgentConfiguration):
+    def __init__(self, config: AgentConfiguration, llm_client: Optional[httpx.AsyncClient] = None):
         self.config = config
         self.mcp_registry = MCPRegistry()
         self.session: Optional[AgentSession] = None
+        self.llm_client = llm_client  # shared Ollama client, owned by the caller
         self._llm_client: Optional[httpx.AsyncClient] = None
+        # Token context returned by Ollama for the current session (reuse_llm_context)
+        self._ollama_context: Optional[List[int]] = None
+        
+        # (cache key, prompt prefix); the prefix only changes with its inputs
+        self._prompt_prefix_cache: Optional[Tuple[Tuple[Any, ...], str]] = None
+        
+        # Keyword -> positions of matching tools, rebuilt when the registry's tools change
+        self._tool_index: Dict[str, List[int]] = {}
+        self._tool_index_tools: List[Tool] = []
+        self._tool_index_version = -1
+        
+        # BioMCP/gget tools are fixed after discovery, so their descriptions are built once;
+        # MCP tool descriptions are kept until the registry's tools change
+        self._biomcp_tool_info: Optional[List[Dict[str, Any]]] = None
+        self._mcp_tool_info: List[Dict[str, Any]] = []
+        self._mcp_tool_info_version = -1
+        
+        self.response_cache: Optional[SemanticCache] = None
+        if config.semantic_cache_threshold is not None:
+            self.response_cache = SemanticCache(threshold=config.semantic_cache_threshold)
+        # Embeddings computed ahead of time by embed_prompts, used up by the cache
+        self._prompt_embeddings: Dict[str, Embedding] = {}
+        
+        if config.tool_concurrency or config.default_tool_concurrency is not None:
+            biomcp_tools.set_concurrency_limits(config.tool_concurrency, config.default_tool_concurrency)
         
         # Default biomedical system prompt
         self.system_prompt = config.system_prompt or self._get_default_system_prompt()
@@ -76,6 +174,10 @@ When using tools:
         elif self.config.model_provider in ["openai", "anthropic"]:
             await self._initialize_api_client()
         
+        # Load the semantic cache's embedding model now rather than on the first message
+        if self.response_cache:
+            await asyncio.to_thread(self.response_cache.warm_up)
+        
         # Register enabled MCP servers
         for server_id in self.config.enabled_servers:
             # This would typically load from configuration
@@ -83,10 +185,7 @@ When using tools:
     
     async def _initialize_ollama(self) -> None:
         """Initialize Ollama client."""
-        self._llm_client = httpx.AsyncClient(
-            base_url="http://localhost:11434",
-            timeout=httpx.Timeout(180.0)  # 180 second timeout
-        )
+        self._llm_client = self.llm_client or create_ollama_client()
         
         # Test connection
         try:
@@ -98,6 +197,25 @@ When using tools:
             logger.error(f"Failed to connect to Ollama: {e}")
             raise
     
+    async def warm_prompt_cache(self) -> None:
+        """Prefill the shared prompt prefix so the first real turn starts warm.
+        
+        Ollama keeps the KV state of the last prompt while the model stays
+        loaded, so set ``keep_alive`` for this to last between turns.
+        """
+        if self.config.model_provider != "ollama" or self._llm_client is None:
+            return
+        payload = self._ollama_payload(self._prompt_prefix(), max_tokens=1)
+        payload.pop("context", None)
+        try:
+            response = await self._llm_client.post(
+                "/api/generate", content=_json_body(payload), headers=JSON_HEADERS
+            )
+            response.raise_for_status()
+            logger.info("Warmed Ollama prompt cache")
+        except httpx.HTTPError as e:
+            logger.warning("Could not warm Ollama prompt cache: %s", e)
+    
     async def _initialize_api_client(self) -> None:
         """Initialize API client for OpenAI/Anthropic."""
         # This would be implemented based on the specific provider
@@ -124,38 +242,211 @@ When using tools:
             agent=self,
             context=context or self.config.research_context
         )
+        self._ollama_context = None
         
         return self.session
     
-    async def process_message(self, message: str, session_id: Optional[str] = None) -> AgentMessage:
-        """Process a user message and return the agent's response."""
+    async def process_message(self, 
+                            message: str, 
+                            session_id: Optional[str] = None,
+                            max_tokens: Optional[int] = None,
+                            response_format: Optional[str] = None) -> AgentMessage:
+        """Process a user message and return the agent's response.
+        
+        ``max_tokens`` and ``response_format`` override ``config.max_tokens``
+        and ``config.response_format`` for this message only.
+        """
         if self.session is None or (session_id and self.session.session_id != session_id):
             await self.start_session(session_id)
         
-        # Create user message
-        user_message = AgentMessage(
-            id=str(uuid4()),
-            timestamp=datetime.now(),
-            role="user",
-            content=message
-        )
+        # Snapshot the history before this message, so concurrent calls
+        # never see each other's questions in their prompts
+        history = list(self.session.messages)
         
-        # Add to session
-        self.session.add_message(user_message)
+        # Create user message and add it to the session
+        self.session.add_message(_new_message("user", message))
         
-        # Generate response
-        response = await self._generate_response(message)
+        response = await self._respond(message, history, max_tokens, response_format)
         
         # Add response to session
         self.session.add_message(response)
         
         return response
     
-    async def _generate_response(self, user_input: str) -> AgentMessage:
+    async def process_messages(self, 
+                               messages: List[str], 
+                               session_id: Optional[str] = None,
+                               max_tokens: Optional[int] = None) -> List[AgentMessage]:
+        """Process independent user messages concurrently.
+        
+        Each message sees the history from before the batch but not its
+        siblings; the question/answer pairs are added to the session in
+        the order given once every response is ready.
+        """
+        if self.session is None or (session_id and self.session.session_id != session_id):
+            await self.start_session(session_id)
+        
+        history = list(self.session.messages)
+        questions = [_new_message("user", message) for message in messages]
+        responses = await asyncio.gather(
+            *(self._respond(message, history, max_tokens) for message in messages)
+        )
+        
+        for question, response in zip(questions, responses):
+            self.session.add_message(question)
+            self.session.add_message(response)
+        
+        return list(responses)
+    
+    async def _respond(self, 
+                       message: str, 
+                       history: List[AgentMessage],
+                       max_tokens: Optional[int] = None,
+                       response_format: Optional[str] = None) -> AgentMessage:
+        """Answer ``message`` given the earlier ``history``, via the semantic cache."""
+        # Answer near-duplicate prompts from the semantic cache
+        cache_namespace = self._response_cache_namespace(history, max_tokens, response_format)
+        response = await self._cached_response(message, cache_namespace)
+        if response:
+            return response
+        
+        # Generate response
+        response = await self._generate_response(message, history, max_tokens, response_format)
+        await self._cache_response(message, response, cache_namespace)
+        return response
+    
+    async def embed_prompts(self, messages: List[str]) -> None:
+        """Embed upcoming messages for the semantic cache in one batch.
+        
+        Call this before dispatching several messages at once; each one's
+        cache lookup and insert then reuse the batched embedding.
+        """
+        if not self.response_cache:
+            return
+        pending = [m for m in dict.fromkeys(messages) if m not in self._prompt_embeddings]
+        embeddings = await asyncio.to_thread(self.response_cache.embed_many, pending)
+        self._prompt_embeddings.update(zip(pending, embeddings))
+    
+    async def _cached_response(self, message: str, namespace: str) -> Optional[AgentMessage]:
+        """Return a fresh copy of a cached reply to a similar message, if any."""
+        if not self.response_cache:
+            return None
+        cached = await asyncio.to_thread(
+            self.response_cache.lookup, namespace, message, self._prompt_embeddings.get(message)
+        )
+        if not cached:
+            return None
+        
+        self._prompt_embeddings.pop(message, None)
+        cached_response, similarity = cached
+        logger.debug("Semantic cache hit (similarity %.3f)", similarity)
+        return cached_response.model_copy(update={
+            "id": uuid4().hex,
+            "timestamp": datetime.now(),
+            "metadata": {**cached_response.metadata, "cache_similarity": similarity}
+        })
+    
+    async def _cache_response(self, 
+                              message: str, 
+                              response: AgentMessage, 
+                              namespace: str) -> None:
+        """Store a successful reply in the semantic cache."""
+        embedding = self._prompt_embeddings.pop(message, None)
+        if self.response_cache and not response.metadata.get("error"):
+            await asyncio.to_thread(self.response_cache.insert, namespace, message, response, embedding)
+    
+    def _response_cache_namespace(self, 
+                                  history: List[AgentMessage], 
+                                  max_tokens: Optional[int] = None,
+                                  response_format: Optional[str] = None) -> str:
+        """Key cached responses on everything besides the prompt that shapes them.
+        
+        The conversation before the message (``history``) is part of the key,
+        so a reply is only reused for the same history.
+        """
+        context = self.session.context.model_dump_json() if self.session and self.session.context else ""
+        history_digest = hashlib.blake2b(digest_size=16)
+        for earlier in history:
+            history_digest.update(f"{earlier.role}\0{earlier.content}\0".encode())
+        parts = [
+            self.config.model_provider,
+            self.config.model_name,
+            str(self.config.temperature),
+            str(max_tokens or self.config.max_tokens),
+            response_format or self.config.response_format or "",
+            self.system_prompt,
+            context,
+            history_digest.hexdigest()
+        ]
+        return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+    
+    async def process_message_stream(self, 
+                                     message: str, 
+                                     session_id: Optional[str] = None,
+                                     max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Process a user message, yielding the response text as it is generated.
+        
+        The complete response is added to the session once streaming ends.
+        Providers without streaming support, and replies served from the
+        semantic cache, yield the whole response at once.
+        """
+        if self.config.model_provider != "ollama":
+            response = await self.process_message(message, session_id, max_tokens)
+            yield response.content
+            return
+        
+        if self.session is None or (session_id and self.session.session_id != session_id):
+            await self.start_session(session_id)
+        
+        history = list(self.session.messages)
+        self.session.add_message(_new_message("user", message))
+        
+        cache_namespace = self._response_cache_namespace(history, max_tokens)
+        response = await self._cached_response(message, cache_namespace)
+        if response:
+            self.session.add_message(response)
+            yield response.content
+            return
+        
+        context = self._conversation_context(history)
+        tool_calls = await self._identify_tool_calls(message, context)
+        if tool_calls:
+            tool_results = await self._execute_tool_calls(tool_calls)
+            prompt = self._build_tool_prompt(message, context, tool_calls, tool_results)
+        else:
+            tool_results = []
+            prompt = f"{context}\n\nUser: {message}\n\nAssistant:"
+        
+        parts = []
+        metadata = {}
+        try:
+            async for chunk in self._stream_ollama(prompt, max_tokens):
+                parts.append(chunk)
+                yield chunk
+        except LLMError as e:
+            metadata["error"] = True
+            parts.append(str(e))
+            yield str(e)
+        
+        response = _new_message(
+            "assistant",
+            "".join(parts),
+            metadata=metadata,
+            tool_calls=tool_calls,
+            tool_results=tool_results
+        )
+        await self._cache_response(message, response, cache_namespace)
+        self.session.add_message(response)
+    
+    async def _generate_response(self, 
+                                 user_input: str, 
+                                 history: List[AgentMessage],
+                                 max_tokens: Optional[int] = None,
+                                 response_format: Optional[str] = None) -> AgentMessage:
         """Generate a response using the LLM and available tools."""
         try:
             # Prepare conversation context
-            context = self._prepare_context()
+            context = self._conversation_context(history)
             
             # Check if tools should be used
             tool_calls = await self._identify_tool_calls(user_input, context)
@@ -166,60 +457,89 @@ When using tools:
                 
                 # Generate response with tool results
                 response_content = await self._generate_with_tools(
-                    user_input, context, tool_calls, tool_results
+                    user_input, context, tool_calls, tool_results, max_tokens, response_format
                 )
                 
-                return AgentMessage(
-                    id=str(uuid4()),
-                    timestamp=datetime.now(),
-                    role="assistant",
-                    content=response_content,
+                return _new_message(
+                    "assistant",
+                    response_content,
                     tool_calls=tool_calls,
                     tool_results=tool_results
                 )
             else:
                 # Generate simple response
-                response_content = await self._generate_simple_response(user_input, context)
-                
-                return AgentMessage(
-                    id=str(uuid4()),
-                    timestamp=datetime.now(),
-                    role="assistant", 
-                    content=response_content
+                response_content = await self._generate_simple_response(
+                    user_input, context, max_tokens, response_format
                 )
                 
+                return _new_message("assistant", response_content)
+                
+        except LLMError as e:
+            return _new_message(
+                "assistant",
+                str(e),
+                metadata={"error": True}
+            )
         except Exception as e:
             logger.error(f"Error generating response: {e}")
-            return AgentMessage(
-                id=str(uuid4()),
-                timestamp=datetime.now(),
-                role="assistant",
-                content=f"I encountered an error while processing your request: {str(e)}"
+            return _new_message(
+                "assistant",
+                f"I encountered an error while processing your request: {str(e)}",
+                metadata={"error": True}
             )
     
-    def _prepare_context(self) -> str:
-        """Prepare conversation context for the LLM."""
-        context_parts = [self.system_prompt]
+    def _conversation_context(self, history: Sequence[AgentMessage] = ()) -> str:
+        """Return the prompt prefix, or nothing if Ollama already holds it.
+        
+        With ``reuse_llm_context`` the system prompt, research context and
+        history are sent once per session; later calls continue from the
+        token context Ollama returned, so only the new turn is processed.
+        """
+        if self.config.reuse_llm_context and self._ollama_context:
+            return ""
+        return self._prepare_context(history)
+    
+    def _prompt_prefix(self) -> str:
+        """Build the static start of every prompt: instructions, research context, tools.
         
-        if self.session and self.session.context:
-            context_parts.append(f"Research Context: {self.session.context.model_dump_json()}")
+        It comes before anything turn-specific so consecutive prompts share
+        it verbatim and Ollama can serve it from its prompt cache. The
+        result is reused until the prompt, context or tool list changes.
+        """
+        research_context = self.session.context if self.session else self.config.research_context
+        key = (self.system_prompt, research_context, self.mcp_registry.tools_version)
+        if self._prompt_prefix_cache and self._prompt_prefix_cache[0] == key:
+            return self._prompt_prefix_cache[1]
+        
+        context_parts = [self.system_prompt]
+        if research_context:
+            context_parts.append(f"Research Context: {research_context.model_dump_json()}")
         
         # Add available tools
         available_tools = self.mcp_registry.get_available_tools()
         if available_tools:
-            tools_info = "Available tools:\n"
-            for tool in available_tools[:10]:  # Limit to prevent context overflow
-                tools_info += f"- {tool.name}: {tool.description}\n"
-            context_parts.append(tools_info)
+            tools_info = "".join(
+                f"- {tool.name}: {tool.description}\n"
+                for tool in available_tools[:10]  # Limit to prevent context overflow
+            )
+            context_parts.append("Available tools:\n" + tools_info)
+        
+        prefix = "\n\n".join(context_parts)
+        self._prompt_prefix_cache = (key, prefix)
+        return prefix
+    
+    def _prepare_context(self, history: Sequence[AgentMessage] = ()) -> str:
+        """Prepare conversation context for the LLM.
+        
+        ``history`` is the conversation before the current message.
+        """
+        context_parts = [self._prompt_prefix()]
         
         # Add recent conversation history
-        if self.session:
-            recent_messages = self.session.get_recent_messages(5)
-            if recent_messages:
-                history = "Recent conversation:\n"
-                for msg in recent_messages[:-1]:  # Exclude current message
-                    history += f"{msg.role}: {msg.content[:200]}...\n"
-                context_parts.append(history)
+        recent_messages = history[-4:]
+        if recent_messages:
+            recent = "".join(f"{msg.role}: {msg.content[:200]}...\n" for msg in recent_messages)
+            context_parts.append("Recent conversation:\n" + recent)
         
         return "\n\n".join(context_parts)
     
@@ -229,69 +549,94 @@ When using tools:
         # A more sophisticated version would use the LLM to decide on tool usage
         
         tool_calls = []
-        available_tools = self.mcp_registry.get_available_tools()
+        if self._tool_index_version != self.mcp_registry.tools_version:
+            self._rebuild_tool_index()
         
-        # Simple keyword-based tool identification
+        # Simple keyword-based tool identification: the first tool whose
+        # name or a description keyword appears in the user input
         user_input_lower = user_input.lower()
+        matches = [
+            positions[0] for keyword, positions in self._tool_index.items()
+            if keyword in user_input_lower
+        ]
         
-        for tool in available_tools:
-            # Check if tool name or keywords appear in user input
-            if (tool.name.lower() in user_input_lower or 
-                any(keyword in user_input_lower for keyword in 
-                    tool.description.lower().split() if len(keyword) > 4)):
-                
-                # For demo purposes, create a simple tool call
-                # In practice, this would be much more sophisticated
-                tool_call = ToolCall(
-                    tool_name=tool.name,
-                    parameters={},  # Would be extracted from user input
-                    call_id=str(uuid4())
-                )
-                tool_calls.append(tool_call)
-                break  # Only use one tool for now
+        if matches:
+            # For demo purposes, create a simple tool call
+            # In practice, this would be much more sophisticated
+            tool_call = ToolCall(
+                tool_name=self._tool_index_tools[min(matches)].name,
+                parameters={},  # Would be extracted from user input
+                call_id=uuid4().hex
+            )
+            tool_calls.append(tool_call)  # Only use one tool for now
         
         return tool_calls
     
+    def _rebuild_tool_index(self) -> None:
+        """Index every registry tool by its name and description keywords."""
+        tools = self.mcp_registry.get_available_tools()
+        index: Dict[str, List[int]] = {}
+        for position, tool in enumerate(tools):
+            keywords = {tool.name.lower()}
+            keywords.update(word for word in tool.description.lower().split() if len(word) > 4)
+            for keyword in keywords:
+                index.setdefault(keyword, []).append(position)
+        
+        self._tool_index = index
+        self._tool_index_tools = tools
+        self._tool_index_version = self.mcp_registry.tools_version
+    
     async def _execute_tool_calls(self, tool_calls: List[ToolCall]) -> List[ToolResult]:
-        """Execute the identified tool calls."""
-        results = []
-        
-        for tool_call in tool_calls:
-            try:
-                # Check if it's a BioMCP direct tool first
-                biomcp_tool = biomcp_tools.get_tool(tool_call.tool_name)
-                if biomcp_tool:
-                    # Execute BioMCP tool directly
-                    result_data = await biomcp_tools.call_tool(tool_call.tool_name, tool_call.parameters)
-                    result = ToolResult(
-                        call_id=tool_call.call_id,
-                        success=True,
-                        result=result_data
-                    )
-                else:
-                    # Try MCP registry
-                    result = await self.mcp_registry.call_tool(
-                        tool_call.tool_name,
-                        tool_call.parameters,
-                        tool_call.call_id
-                    )
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error executing tool {tool_call.tool_name}: {e}")
-                results.append(ToolResult(
+        """Execute the identified tool calls concurrently, in call order."""
+        return list(await asyncio.gather(
+            *(self._execute_tool_call(tool_call) for tool_call in tool_calls)
+        ))
+    
+    async def _execute_tool_call(self, tool_call: ToolCall) -> ToolResult:
+        """Execute one tool call, turning any failure into a failed result."""
+        try:
+            # Check if it's a BioMCP direct tool first
+            biomcp_tool = biomcp_tools.get_tool(tool_call.tool_name)
+            if biomcp_tool:
+                # Execute BioMCP tool directly
+                result_data = await biomcp_tools.call_tool(tool_call.tool_name, tool_call.parameters)
+                return ToolResult(
                     call_id=tool_call.call_id,
-                    success=False,
-                    error=str(e)
-                ))
-        
-        return results
+                    success=True,
+                    result=result_data
+                )
+            
+            # Try MCP registry
+            return await self.mcp_registry.call_tool(
+                tool_call.tool_name,
+                tool_call.parameters,
+                tool_call.call_id
+            )
+        except Exception as e:
+            logger.error("Error executing tool %s: %s", tool_call.tool_name, e)
+            return ToolResult(
+                call_id=tool_call.call_id,
+                success=False,
+                error=str(e)
+            )
     
     async def _generate_with_tools(self, 
                                  user_input: str, 
                                  context: str,
                                  tool_calls: List[ToolCall], 
-                                 tool_results: List[ToolResult]) -> str:
+                                 tool_results: List[ToolResult],
+                                 max_tokens: Optional[int] = None,
+                                 response_format: Optional[str] = None) -> str:
         """Generate response incorporating tool results."""
+        prompt = self._build_tool_prompt(user_input, context, tool_calls, tool_results)
+        return await self._call_llm(prompt, max_tokens, response_format)
+    
+    def _build_tool_prompt(self, 
+                           user_input: str, 
+                           context: str,
+                           tool_calls: List[ToolCall], 
+                           tool_results: List[ToolResult]) -> str:
+        """Build the LLM prompt for a message that used tools."""
         # Prepare prompt with tool results
         prompt_parts = [
             context,
@@ -301,80 +646,151 @@ When using tools:
         
         for i, (call, result) in enumerate(zip(tool_calls, tool_results)):
             if result.success:
-                prompt_parts.append(f"Tool {call.tool_name}: {result.result}")
+                prompt_parts.append(f"Tool {call.tool_name}: {_format_tool_result(result.result)}")
             else:
                 prompt_parts.append(f"Tool {call.tool_name} failed: {result.error}")
         
         prompt_parts.append("\nPlease provide a comprehensive response based on the tool results and your knowledge:")
         
-        prompt = "\n".join(prompt_parts)
-        
-        return await self._call_llm(prompt)
+        return "\n".join(prompt_parts)
     
-    async def _generate_simple_response(self, user_input: str, context: str) -> str:
+    async def _generate_simple_response(self, 
+                                        user_input: str, 
+                                        context: str, 
+                                        max_tokens: Optional[int] = None,
+                                        response_format: Optional[str] = None) -> str:
         """Generate a simple response without tools."""
         prompt = f"{context}\n\nUser: {user_input}\n\nAssistant:"
-        return await self._call_llm(prompt)
+        return await self._call_llm(prompt, max_tokens, response_format)
     
-    async def _call_llm(self, prompt: str) -> str:
+    async def _call_llm(self, 
+                        prompt: str, 
+                        max_tokens: Optional[int] = None,
+                        response_format: Optional[str] = None) -> str:
         """Call the configured LLM with the given prompt."""
         if self.config.model_provider == "ollama":
-            return await self._call_ollama(prompt)
+            return await self._call_ollama(prompt, max_tokens, response_format)
         else:
             # Implement other providers
             return "LLM integration not implemented for this provider yet."
     
-    async def _call_ollama(self, prompt: str) -> str:
+    async def _call_ollama(self, 
+                           prompt: str, 
+                           max_tokens: Optional[int] = None,
+                           response_format: Optional[str] = None) -> str:
         """Call Ollama API."""
         try:
             logger.debug(f"Calling Ollama with model: {self.config.model_name}")
-            response = await self._llm_client.post("/api/generate", json={
-                "model": self.config.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": self.config.temperature,
-                    "num_predict": self.config.max_tokens
-                }
-            })
+            payload = self._ollama_payload(prompt, max_tokens, response_format, stream=False)
+            response = await self._llm_client.post(
+                "/api/generate", content=_json_body(payload), headers=JSON_HEADERS
+            )
             
             if response.status_code != 200:
                 error_text = response.text if hasattr(response, 'text') else "Unknown error"
                 raise Exception(f"Ollama API error {response.status_code}: {error_text}")
             
-            result = response.json()
+            result = _json_loads(response.content)
+            self._remember_ollama_context(result)
             return result.get("response", "No response generated")
             
         except httpx.TimeoutException as e:
             logger.error(f"Ollama request timed out: {e}")
-            return f"Request timed out - try reducing prompt length or increasing timeout"
+            raise LLMError(f"Request timed out - try reducing prompt length or increasing timeout") from e
         except httpx.ConnectError as e:
             logger.error(f"Failed to connect to Ollama: {e}")
-            return f"Connection error - ensure Ollama is running on localhost:11434"
+            raise LLMError(f"Connection error - ensure Ollama is running on localhost:11434") from e
         except Exception as e:
             logger.error(f"Error calling Ollama: {type(e).__name__}: {e}")
-            return f"Error generating response: {str(e)}"
+            raise LLMError(f"Error generating response: {str(e)}") from e
+    
+    def _ollama_payload(self, 
+                        prompt: str, 
+                        max_tokens: Optional[int] = None,
+                        response_format: Optional[str] = None,
+                        stream: bool = False) -> Dict[str, Any]:
+        """Build the request body for Ollama's /api/generate."""
+        payload = {
+            "model": self.config.model_name,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": self.config.temperature,
+                "num_predict": max_tokens or self.config.max_tokens
+            }
+        }
+        if self.config.reuse_llm_context:
+            payload["options"]["num_ctx"] = self.config.context_window
+            if self._ollama_context:
+                payload["context"] = self._ollama_context
+        if self.config.keep_alive:
+            # Keep the model resident so the shared prompt prefix can be
+            # served from Ollama's prompt cache on the next call
+            payload["keep_alive"] = self.config.keep_alive
+        response_format = response_format or self.config.response_format
+        if response_format:
+            # e.g. "json" constrains Ollama to emit a single valid JSON value
+            payload["format"] = response_format
+        return payload
+    
+    async def _stream_ollama(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Stream response text from the Ollama API as it is generated."""
+        try:
+            logger.debug(f"Streaming from Ollama with model: {self.config.model_name}")
+            payload = self._ollama_payload(prompt, max_tokens, stream=True)
+            async with self._llm_client.stream(
+                "POST", "/api/generate", content=_json_body(payload), headers=JSON_HEADERS
+            ) as response:
+                if response.status_code != 200:
+                    error_text = (await response.aread()).decode(errors="replace")
+                    raise Exception(f"Ollama API error {response.status_code}: {error_text}")
+                
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        self._remember_ollama_context(chunk)
+                        break
+                        
+        except httpx.TimeoutException as e:
+            logger.error(f"Ollama request timed out: {e}")
+            raise LLMError(f"Request timed out - try reducing prompt length or increasing timeout") from e
+        except httpx.ConnectError as e:
+            logger.error(f"Failed to connect to Ollama: {e}")
+            raise LLMError(f"Connection error - ensure Ollama is running on localhost:11434") from e
+        except Exception as e:
+            logger.error(f"Error streaming from Ollama: {type(e).__name__}: {e}")
+            raise LLMError(f"Error generating response: {str(e)}") from e
+    
+    def _remember_ollama_context(self, result: Dict[str, Any]) -> None:
+        """Keep the token context from a finished Ollama generation."""
+        if self.config.reuse_llm_context and result.get("context"):
+            self._ollama_context = result["context"]
+    
+    @staticmethod
+    def _tool_info(tool: Tool) -> Dict[str, Any]:
+        return {
+            "name": tool.name,
+            "description": tool.description,
+            "server": tool.server_id,
+            "parameters": [p.model_dump() for p in tool.parameters]
+        }
     
     async def get_available_tools(self) -> List[Dict[str, Any]]:
         """Get information about available tools."""
         # Get tools from MCP registry
-        mcp_tools = self.mcp_registry.get_available_tools()
+        if self._mcp_tool_info_version != self.mcp_registry.tools_version:
+            self._mcp_tool_info = [self._tool_info(tool) for tool in self.mcp_registry.get_available_tools()]
+            self._mcp_tool_info_version = self.mcp_registry.tools_version
         
         # Get tools from BioMCP direct integration
-        biomcp_direct_tools = biomcp_tools.get_available_tools()
+        if self._biomcp_tool_info is None:
+            self._biomcp_tool_info = [self._tool_info(tool) for tool in biomcp_tools.get_available_tools()]
         
-        # Combine all tools
-        all_tools = mcp_tools + biomcp_direct_tools
-        
-        return [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "server": tool.server_id,
-                "parameters": [p.model_dump() for p in tool.parameters]
-            }
-            for tool in all_tools
-        ]
+        return self._mcp_tool_info + self._biomcp_tool_info
     
     async def get_server_status(self) -> Dict[str, Any]:
         """Get status of all MCP servers."""
@@ -383,8 +799,9 @@ When using tools:
     async def shutdown(self) -> None:
         """Shutdown the agent and cleanup resources."""
         await self.mcp_registry.disconnect_all()
+        biomcp_tools.close()
         
-        if self._llm_client:
+        if self._llm_client and self._llm_client is not self.llm_client:
             await self._llm_client.aclose()
         
         logger.info("Biomedical agent shutdown complete")
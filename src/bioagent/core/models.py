@@ -5,7 +5,10 @@ Core data models for the biomedical agent framework.
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+# Small quantized model for smoke tests that only check the plumbing
+SMOKE_TEST_MODEL = "llama3.2:1b-instruct-q4_K_M"
 
 
 class MCPServerStatus(str, Enum):
@@ -18,6 +21,8 @@ class MCPServerStatus(str, Enum):
 
 class ToolParameter(BaseModel):
     """Schema for a tool parameter."""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     type: str
     description: Optional[str] = None
@@ -27,6 +32,8 @@ class ToolParameter(BaseModel):
 
 class Tool(BaseModel):
     """Schema for an MCP tool."""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
     parameters: List[ToolParameter] = Field(default_factory=list)
@@ -36,6 +43,8 @@ class Tool(BaseModel):
 
 class ToolCall(BaseModel):
     """Schema for a tool call request."""
+    model_config = ConfigDict(frozen=True)
+
     tool_name: str
     parameters: Dict[str, Any] = Field(default_factory=dict)
     call_id: Optional[str] = None
@@ -43,6 +52,8 @@ class ToolCall(BaseModel):
 
 class ToolResult(BaseModel):
     """Schema for a tool call result."""
+    model_config = ConfigDict(frozen=True)
+
     call_id: Optional[str] = None
     success: bool
     result: Optional[Any] = None
@@ -63,6 +74,8 @@ class MCPServer(BaseModel):
 
 class AgentMessage(BaseModel):
     """Schema for agent messages."""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     timestamp: datetime
     role: str  # "user", "assistant", "system", "tool"
@@ -74,6 +87,8 @@ class AgentMessage(BaseModel):
 
 class ResearchContext(BaseModel):
     """Schema for biomedical research context."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     domain: Optional[str] = None  # e.g., "genomics", "drug_discovery", "proteomics"
     organism: Optional[str] = None
     dataset: Optional[str] = None
@@ -84,6 +99,8 @@ class ResearchContext(BaseModel):
 
 class AgentConfiguration(BaseModel):
     """Configuration for the biomedical agent."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     model_provider: str = "ollama"  # "ollama", "openai", "anthropic"
     model_name: str = "llama3.1"
     temperature: float = 0.7
@@ -92,6 +109,20 @@ class AgentConfiguration(BaseModel):
     research_context: Optional[ResearchContext] = None
     enabled_servers: List[str] = Field(default_factory=list)
     system_prompt: Optional[str] = None
+    keep_alive: Optional[str] = None  # e.g. "30m"; how long Ollama keeps the model (and its KV cache) loaded
+    response_format: Optional[str] = None  # Ollama "format", e.g. "json" for structured replies
+    reuse_llm_context: bool = False  # continue from Ollama's returned context instead of resending the prompt prefix
+    semantic_cache_threshold: Optional[float] = None  # reuse responses to prompts this similar (cosine; exact repeats only without sentence-transformers)
+    smoke_test: bool = False  # run on SMOKE_TEST_MODEL instead of model_name
+    tool_concurrency: Dict[str, int] = Field(default_factory=dict)  # per-tool caps on in-flight calls
+    default_tool_concurrency: Optional[int] = None  # cap for tools without an entry
+
+    @model_validator(mode="before")
+    @classmethod
+    def _use_smoke_test_model(cls, data: Any) -> Any:
+        if isinstance(data, dict) and data.get("smoke_test"):
+            data = {**data, "model_name": SMOKE_TEST_MODEL}
+        return data
 
 
 class SessionState(BaseModel):
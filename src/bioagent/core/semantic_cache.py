@@ -0,0 +1,191 @@
+"""
+Semantic cache for agent responses.
+"""
+
+import logging
+import re
+import shelve
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .models import AgentMessage
+
+logger = logging.getLogger(__name__)
+
+# Try to import sentence-transformers, fall back to exact matching if not installed
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "bioagent" / "responses"
+DEFAULT_THRESHOLD = 0.85
+# Replies embed live trial and variant data, so they go stale like the tool results
+DEFAULT_TTL = 60 * 60
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+Embedding = List[float]
+# Stored embeddings are packed as float32 rather than kept as lists of Python floats
+StoredEmbedding = array
+
+# Gene symbols, variants, accessions and the like: words with a digit or two capitals
+_ENTITY_RE = re.compile(r"\b(?:\w*\d\w*|\w*[A-Z]\w*[A-Z]\w*)\b")
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Reduce a prompt to its lowercased words, for exact matching."""
+    return " ".join(re.findall(r"\w+", prompt.lower()))
+
+
+def _entities(prompt: str) -> FrozenSet[str]:
+    return frozenset(match.upper() for match in _ENTITY_RE.findall(prompt))
+
+
+# (time stored, entities, embedding, response); embedding is None without sentence-transformers
+Entry = Tuple[float, FrozenSet[str], Optional[StoredEmbedding], AgentMessage]
+
+
+class SemanticCache:
+    """Reuse agent responses for prompts that mean the same thing.
+
+    With sentence-transformers installed, prompts are embedded with
+    ``all-MiniLM-L6-v2`` and a lookup hits when the cosine similarity to a
+    stored prompt reaches ``threshold`` and both name the same entities
+    (gene symbols, variants, identifiers), so "BRCA1" never answers "BRCA2".
+    Without it, only prompts with the same words (ignoring case and
+    punctuation) hit. Entries are namespaced by the caller (model,
+    temperature, context, conversation history) so a configuration change
+    never serves a stale answer, and expire after ``ttl`` seconds. Each
+    insert writes just its entry to the shelve at ``path``; the fresh
+    entries are reloaded on first use. Methods block, and are safe to call
+    from worker threads.
+    """
+
+    def __init__(self,
+                 path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 threshold: float = DEFAULT_THRESHOLD,
+                 ttl: float = DEFAULT_TTL):
+        self.path = Path(path) if path else None
+        self.threshold = threshold
+        self.ttl = ttl
+        # namespace -> normalized prompt -> entry
+        self._entries: Optional[Dict[str, Dict[str, Entry]]] = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self) -> "SentenceTransformer":
+        if self._model is None:
+            self._model = SentenceTransformer(EMBEDDING_MODEL)
+        return self._model
+
+    def _embed(self, text: str) -> Optional[Embedding]:
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return None
+        return self._get_model().encode(text, normalize_embeddings=True).tolist()
+
+    def embed_many(self, texts: List[str]) -> List[Optional[Embedding]]:
+        """Embed several prompts in one batch, for passing to ``lookup``/``insert``.
+
+        Without sentence-transformers there is nothing to embed and every item is None.
+        """
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return [None] * len(texts)
+        if not texts:
+            return []
+        return self._get_model().encode(
+            texts, batch_size=len(texts), normalize_embeddings=True
+        ).tolist()
+
+    def warm_up(self) -> None:
+        """Load the embedding model and run it once so the first lookup is fast.
+
+        Blocking; agents run it in a worker thread during ``initialize``.
+        """
+        self._embed("warmup")
+        with self._lock:
+            self._get_entries()
+
+    def _get_entries(self) -> Dict[str, Dict[str, Entry]]:
+        # Callers hold self._lock
+        if self._entries is None:
+            self._entries = {}
+            if self.path and self.path.parent.exists():
+                try:
+                    with shelve.open(str(self.path)) as db:
+                        for key, entry in db.items():
+                            if self._fresh(entry[0]):
+                                namespace, _, prompt = key.partition("\0")
+                                self._entries.setdefault(namespace, {})[prompt] = entry
+                except Exception as e:
+                    logger.warning("Ignoring unreadable response cache %s: %s", self.path, e)
+        return self._entries
+
+    def _store(self, key: str, entry: Entry) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with shelve.open(str(self.path)) as db:
+            db[key] = entry
+
+    def _fresh(self, created: float) -> bool:
+        return time.time() - created < self.ttl
+
+    def lookup(self,
+               namespace: str,
+               prompt: str,
+               embedding: Optional[Embedding] = None) -> Optional[Tuple[AgentMessage, float]]:
+        """Return the closest cached response and its similarity, if any qualifies.
+
+        ``embedding`` is the prompt's precomputed embedding, if available.
+        """
+        with self._lock:
+            entries = dict(self._get_entries().get(namespace, {}))
+        if not entries:
+            return None
+
+        exact = entries.get(_normalize_prompt(prompt))
+        if exact and self._fresh(exact[0]):
+            return exact[3], 1.0
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return None
+
+        query = embedding if embedding is not None else self._embed(prompt)
+        entities = _entities(prompt)
+        candidates = [
+            (sum(a * b for a, b in zip(query, stored)), response)
+            for created, stored_entities, stored, response in entries.values()
+            if stored is not None and stored_entities == entities and self._fresh(created)
+        ]
+        if not candidates:
+            return None
+        best_score, best_response = max(candidates, key=lambda pair: pair[0])
+        if best_score < self.threshold:
+            return None
+        return best_response, best_score
+
+    def insert(self,
+               namespace: str,
+               prompt: str,
+               response: AgentMessage,
+               embedding: Optional[Embedding] = None) -> None:
+        """Store ``response`` for ``prompt``."""
+        if embedding is None:
+            embedding = self._embed(prompt)
+        stored = array("f", embedding) if embedding is not None else None
+        normalized = _normalize_prompt(prompt)
+        entry = (time.time(), _entities(prompt), stored, response)
+        with self._lock:
+            self._get_entries().setdefault(namespace, {})[normalized] = entry
+            self._store(f"{namespace}\0{normalized}", entry)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries = {}
+            if self.path and self.path.parent.exists():
+                with shelve.open(str(self.path), flag="n"):
+                    pass
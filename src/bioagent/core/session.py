@@ -2,10 +2,15 @@
 Session management for biomedical research sessions.
 """
 
+import asyncio
 import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING, Union
 from uuid import uuid4
 
 from .models import AgentMessage, ResearchContext, SessionState
@@ -15,6 +20,12 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+RESEARCH_KEYWORDS = ("gene", "protein", "drug", "disease", "analysis", "sequence", "structure")
+# Finds every keyword occurrence (overlapping, case-insensitive) in one pass
+_RESEARCH_KEYWORD_RE = re.compile(
+    "(?=(%s))" % "|".join(map(re.escape, RESEARCH_KEYWORDS)), re.IGNORECASE
+)
+
 
 class AgentSession:
     """Manages a biomedical research session with conversation history and context."""
@@ -27,22 +38,49 @@ class AgentSession:
         self.agent = agent
         self.context = context
         self.created_at = datetime.now()
-        self.last_active = datetime.now()
+        # Activity is tracked on the monotonic clock; last_active derives a datetime on read
+        self._created_monotonic = time.monotonic()
+        self._active_monotonic = self._created_monotonic
         self.messages: List[AgentMessage] = []
         self.metadata: Dict[str, Any] = {}
         
-        logger.info(f"Started new biomedical research session: {session_id}")
+        # Kept up to date by add_message/clear_history so summaries need no rescans;
+        # tool names are in order of first use
+        self._role_counts: Counter = Counter()
+        self._tool_usage: Counter = Counter()
+        
+        logger.info("Started new biomedical research session: %s", session_id)
+    
+    @property
+    def last_active(self) -> datetime:
+        """When the session was last used."""
+        return self.created_at + timedelta(seconds=self._active_monotonic - self._created_monotonic)
+    
+    @last_active.setter
+    def last_active(self, value: datetime) -> None:
+        self._active_monotonic = self._created_monotonic + (value - self.created_at).total_seconds()
     
     def add_message(self, message: AgentMessage) -> None:
         """Add a message to the session history."""
         self.messages.append(message)
-        self.last_active = datetime.now()
+        self._count(message)
+        self._active_monotonic = time.monotonic()
         
-        # Log message for debugging
-        logger.debug(f"Added message to session {self.session_id}: {message.role} - {message.content[:100]}...")
+        # Log message for debugging; the content preview is only sliced when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Added message to session %s: %s - %s...",
+                         self.session_id, message.role, message.content[:100])
+    
+    def _count(self, message: AgentMessage) -> None:
+        self._role_counts[message.role] += 1
+        for tool_call in message.tool_calls:
+            self._tool_usage[tool_call.tool_name] += 1
     
     def get_recent_messages(self, count: int = 10) -> List[AgentMessage]:
-        """Get the most recent messages from the session."""
+        """Get the most recent messages from the session.
+        
+        A tail slice, so the cost depends on ``count``, not the session length.
+        """
         return self.messages[-count:] if len(self.messages) > count else self.messages
     
     def get_messages_by_role(self, role: str) -> List[AgentMessage]:
@@ -52,23 +90,23 @@ class AgentSession:
     def update_context(self, context: ResearchContext) -> None:
         """Update the research context for this session."""
         self.context = context
-        self.last_active = datetime.now()
+        self._active_monotonic = time.monotonic()
         
-        logger.info(f"Updated context for session {self.session_id}: {context.domain}")
+        logger.info("Updated context for session %s: %s", self.session_id, context.domain)
     
     def add_metadata(self, key: str, value: Any) -> None:
         """Add metadata to the session."""
         self.metadata[key] = value
-        self.last_active = datetime.now()
+        self._active_monotonic = time.monotonic()
     
     def get_conversation_summary(self) -> str:
         """Generate a summary of the conversation."""
         if not self.messages:
             return "No conversation yet."
         
-        user_messages = len(self.get_messages_by_role("user"))
-        assistant_messages = len(self.get_messages_by_role("assistant"))
-        tool_calls = sum(len(msg.tool_calls) for msg in self.messages)
+        user_messages = self._role_counts["user"]
+        assistant_messages = self._role_counts["assistant"]
+        tool_calls = sum(self._tool_usage.values())
         
         summary = f"Session {self.session_id}:\n"
         summary += f"- Duration: {self.last_active - self.created_at}\n"
@@ -84,21 +122,18 @@ class AgentSession:
         return summary
     
     def get_session_state(self) -> SessionState:
-        """Get the current session state as a Pydantic model."""
-        active_tools = []
-        for message in self.messages:
-            for tool_call in message.tool_calls:
-                if tool_call.tool_name not in active_tools:
-                    active_tools.append(tool_call.tool_name)
+        """Get the current session state as a Pydantic model.
         
-        return SessionState(
+        Its fields are already-validated session data, so validation is skipped.
+        """
+        return SessionState.model_construct(
             session_id=self.session_id,
             created_at=self.created_at,
             last_active=self.last_active,
-            messages=self.messages,
+            messages=list(self.messages),
             context=self.context,
-            active_tools=active_tools,
-            metadata=self.metadata
+            active_tools=list(self._tool_usage),
+            metadata=dict(self.metadata)
         )
     
     def export_conversation(self, format: str = "json") -> str:
@@ -110,6 +145,28 @@ class AgentSession:
         else:
             raise ValueError(f"Unsupported export format: {format}")
     
+    async def export_to_file(self, path: Union[str, Path], format: str = "json") -> Path:
+        """Export the conversation to ``path`` without blocking the event loop.
+        
+        Both serializing and writing run in a worker thread, since long
+        sessions produce large transcripts. Markdown is written line by line
+        rather than built up as one string first.
+        """
+        path = Path(path)
+        
+        def write() -> None:
+            if format.lower() != "markdown":
+                path.write_text(self.export_conversation(format), encoding="utf-8")
+                return
+            with path.open("w", encoding="utf-8") as f:
+                for i, line in enumerate(self._markdown_lines()):
+                    if i:
+                        f.write("\n")
+                    f.write(line)
+        
+        await asyncio.to_thread(write)
+        return path
+    
     def _export_json(self) -> str:
         """Export conversation as JSON."""
         session_state = self.get_session_state()
@@ -117,50 +174,48 @@ class AgentSession:
     
     def _export_markdown(self) -> str:
         """Export conversation as Markdown."""
-        lines = [
-            f"# Biomedical Research Session: {self.session_id}",
-            f"**Created:** {self.created_at.isoformat()}",
-            f"**Last Active:** {self.last_active.isoformat()}",
-            ""
-        ]
+        return "\n".join(self._markdown_lines())
+    
+    def _markdown_lines(self) -> Iterator[str]:
+        """Yield the Markdown transcript one line at a time."""
+        yield f"# Biomedical Research Session: {self.session_id}"
+        yield f"**Created:** {self.created_at.isoformat()}"
+        yield f"**Last Active:** {self.last_active.isoformat()}"
+        yield ""
         
         if self.context:
-            lines.extend([
-                "## Research Context",
-                f"**Domain:** {self.context.domain or 'General'}",
-                f"**Organism:** {self.context.organism or 'N/A'}",
-                f"**Research Question:** {self.context.research_question or 'N/A'}",
-                ""
-            ])
+            yield "## Research Context"
+            yield f"**Domain:** {self.context.domain or 'General'}"
+            yield f"**Organism:** {self.context.organism or 'N/A'}"
+            yield f"**Research Question:** {self.context.research_question or 'N/A'}"
+            yield ""
         
-        lines.append("## Conversation")
-        lines.append("")
+        yield "## Conversation"
+        yield ""
         
         for message in self.messages:
             role_title = message.role.title()
             timestamp = message.timestamp.strftime("%H:%M:%S")
             
-            lines.append(f"### {role_title} ({timestamp})")
-            lines.append("")
-            lines.append(message.content)
-            lines.append("")
+            yield f"### {role_title} ({timestamp})"
+            yield ""
+            yield message.content
+            yield ""
             
             # Add tool call information
             if message.tool_calls:
-                lines.append("**Tool Calls:**")
+                yield "**Tool Calls:**"
                 for tool_call in message.tool_calls:
-                    lines.append(f"- {tool_call.tool_name}: {tool_call.parameters}")
-                lines.append("")
+                    yield f"- {tool_call.tool_name}: {tool_call.parameters}"
+                yield ""
             
             # Add tool results
             if message.tool_results:
-                lines.append("**Tool Results:**")
+                yield "**Tool Results:**"
                 for result in message.tool_results:
                     status = "✅ Success" if result.success else "❌ Failed"
-                    lines.append(f"- {status}: {result.result or result.error}")
-                lines.append("")
-        
-        return "\n".join(lines)
+                    yield f"- {status}: {result.result or result.error}"
+                yield ""
     
     async def analyze_research_progress(self) -> Dict[str, Any]:
         """Analyze the research progress in this session."""
@@ -168,19 +223,11 @@ class AgentSession:
             "session_id": self.session_id,
             "duration_minutes": (self.last_active - self.created_at).total_seconds() / 60,
             "message_count": len(self.messages),
-            "tool_usage": {},
+            "tool_usage": dict(self._tool_usage),
             "research_themes": [],
             "next_steps": []
         }
         
-        # Analyze tool usage
-        for message in self.messages:
-            for tool_call in message.tool_calls:
-                tool_name = tool_call.tool_name
-                if tool_name not in analysis["tool_usage"]:
-                    analysis["tool_usage"][tool_name] = 0
-                analysis["tool_usage"][tool_name] += 1
-        
         # Extract research themes from context and messages
         if self.context:
             if self.context.domain:
@@ -189,12 +236,10 @@ class AgentSession:
         
         # Simple keyword extraction from user messages
         user_messages = self.get_messages_by_role("user")
-        research_keywords = ["gene", "protein", "drug", "disease", "analysis", "sequence", "structure"]
-        
         for message in user_messages:
-            content_lower = message.content.lower()
-            for keyword in research_keywords:
-                if keyword in content_lower and keyword not in analysis["research_themes"]:
+            found = {match.lower() for match in _RESEARCH_KEYWORD_RE.findall(message.content)}
+            for keyword in RESEARCH_KEYWORDS:
+                if keyword in found and keyword not in analysis["research_themes"]:
                     analysis["research_themes"].append(keyword)
         
         # Suggest next steps based on current progress
@@ -213,8 +258,13 @@ class AgentSession:
         else:
             self.messages = []
         
-        self.last_active = datetime.now()
-        logger.info(f"Cleared history for session {self.session_id}, kept last {keep_last} messages")
+        self._role_counts.clear()
+        self._tool_usage.clear()
+        for message in self.messages:
+            self._count(message)
+        
+        self._active_monotonic = time.monotonic()
+        logger.info("Cleared history for session %s, kept last %d messages", self.session_id, keep_last)
     
     def __str__(self) -> str:
         return f"AgentSession({self.session_id}, {len(self.messages)} messages)"
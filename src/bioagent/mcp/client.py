@@ -13,19 +13,44 @@ import aiohttp
 import websockets
 from pydantic import ValidationError
 
-from ..core.models import MCPServer, MCPServerStatus, Tool, ToolCall, ToolResult, ToolParameter
+from ..core.models import MCPServer, MCPServerStatus, Tool, ToolCall, ToolResult
 
 logger = logging.getLogger(__name__)
 
+# Every JSON-RPC request and response goes through these, so prefer orjson
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _json_dumps(message: Dict[str, Any]) -> str:
+    # Nested tool arguments may have non-string keys, which json.dumps coerces
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message)
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class MCPClient:
     """Client for connecting to and communicating with MCP servers."""
     
-    def __init__(self, server: MCPServer):
+    def __init__(self, server: MCPServer, http_session: Optional[aiohttp.ClientSession] = None):
         self.server = server
+        self.http_session = http_session  # shared pool, owned by the caller
         self.session: Optional[aiohttp.ClientSession] = None
         self.websocket: Optional[websockets.WebSocketServerProtocol] = None
         self._tools_cache: Dict[str, Tool] = {}
+        # WebSocket responses are matched to requests by JSON-RPC id, so calls can overlap
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
         
     async def connect(self) -> bool:
         """Connect to the MCP server."""
@@ -51,7 +76,7 @@ class MCPClient:
     
     async def _connect_http(self) -> None:
         """Connect via HTTP."""
-        self.session = aiohttp.ClientSession()
+        self.session = self.http_session or aiohttp.ClientSession()
         # Test connection with a ping/health check
         async with self.session.get(f"{self.server.endpoint}/health") as response:
             if response.status != 200:
@@ -60,69 +85,94 @@ class MCPClient:
     async def _connect_websocket(self) -> None:
         """Connect via WebSocket."""
         self.websocket = await websockets.connect(self.server.endpoint)
+        self._reader_task = asyncio.create_task(self._read_websocket())
         
         # Send initialization message
-        init_message = {
-            "jsonrpc": "2.0",
-            "id": str(uuid4()),
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {"listChanged": True}
-                },
-                "clientInfo": {
-                    "name": "biomedical-agent-framework",
-                    "version": "0.1.0"
-                }
+        result = await self._rpc("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {
+                "tools": {"listChanged": True}
+            },
+            "clientInfo": {
+                "name": "biomedical-agent-framework",
+                "version": "0.1.0"
             }
-        }
+        })
+        if not isinstance(result, dict) or "protocolVersion" not in result:
+            raise ConnectionError(f"Invalid initialize response from {self.server.name}: {result!r}")
         
-        await self.websocket.send(json.dumps(init_message))
-        response = await self.websocket.recv()
-        # TODO: Parse and validate initialization response
+        # Tell the server initialization is complete before making any other requests
+        await self.websocket.send(_json_dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}))
     
-    async def _fetch_tools(self) -> None:
-        """Fetch available tools from the server."""
+    async def _read_websocket(self) -> None:
+        """Route each incoming WebSocket response to the request waiting for it."""
         try:
-            if self.websocket:
-                await self._fetch_tools_websocket()
-            else:
-                await self._fetch_tools_http()
+            async for frame in self.websocket:
+                data = _json_loads(frame)
+                if not isinstance(data, dict):
+                    continue
+                future = self._pending.pop(data.get("id"), None)
+                if future and not future.done():
+                    future.set_result(data)
         except Exception as e:
-            logger.error(f"Failed to fetch tools from {self.server.name}: {e}")
+            logger.warning("WebSocket reader for %s stopped: %s", self.server.name, e)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket connection closed"))
+            self._pending.clear()
     
-    async def _fetch_tools_websocket(self) -> None:
-        """Fetch tools via WebSocket."""
-        if not self.websocket:
-            return
-            
-        message = {
-            "jsonrpc": "2.0",
-            "id": str(uuid4()),
-            "method": "tools/list"
-        }
-        
-        await self.websocket.send(json.dumps(message))
-        response = await self.websocket.recv()
-        data = json.loads(response)
+    async def _websocket_request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a JSON-RPC request over the WebSocket and wait for its response."""
+        if not self._reader_task or self._reader_task.done():
+            raise ConnectionError("WebSocket not connected")
         
-        if "result" in data and "tools" in data["result"]:
-            await self._parse_tools(data["result"]["tools"])
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message["id"]] = future
+        try:
+            await self.websocket.send(_json_dumps(message))
+            return await future
+        finally:
+            self._pending.pop(message["id"], None)
     
-    async def _fetch_tools_http(self) -> None:
-        """Fetch tools via HTTP."""
+    async def _http_request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a JSON-RPC request to the server's endpoint for its method."""
         if not self.session:
-            return
-            
+            raise ConnectionError("HTTP session not initialized")
+        
         async with self.session.post(
-            f"{self.server.endpoint}/tools/list",
-            json={"jsonrpc": "2.0", "id": str(uuid4()), "method": "tools/list"}
+            f"{self.server.endpoint}/{message['method']}",
+            data=_json_dumps(message),
+            headers=JSON_HEADERS
         ) as response:
-            data = await response.json()
-            
-            if "result" in data and "tools" in data["result"]:
-                await self._parse_tools(data["result"]["tools"])
+            return _json_loads(await response.read())
+    
+    async def _rpc(self,
+                   method: str,
+                   params: Optional[Dict[str, Any]] = None,
+                   request_id: Optional[str] = None) -> Any:
+        """Make a JSON-RPC call over the connected transport and return its result."""
+        message = {"jsonrpc": "2.0", "id": request_id or uuid4().hex, "method": method}
+        if params is not None:
+            message["params"] = params
+        
+        if self.websocket:
+            data = await self._websocket_request(message)
+        else:
+            data = await self._http_request(message)
+        
+        if "error" in data:
+            raise Exception(f"{method} error: {data['error']}")
+        return data.get("result")
+    
+    async def _fetch_tools(self) -> None:
+        """Fetch available tools from the server."""
+        try:
+            result = await self._rpc("tools/list")
+            if result and "tools" in result:
+                await self._parse_tools(result["tools"])
+        except Exception as e:
+            logger.error(f"Failed to fetch tools from {self.server.name}: {e}")
     
     async def _parse_tools(self, tools_data: List[Dict[str, Any]]) -> None:
         """Parse tools data and update server tools."""
@@ -135,22 +185,23 @@ class MCPClient:
                 if "inputSchema" in tool_data:
                     schema = tool_data["inputSchema"]
                     if "properties" in schema:
+                        required = set(schema.get("required", []))
                         for param_name, param_info in schema["properties"].items():
-                            parameter = ToolParameter(
-                                name=param_name,
-                                type=param_info.get("type", "string"),
-                                description=param_info.get("description"),
-                                required=param_name in schema.get("required", [])
-                            )
-                            parameters.append(parameter)
+                            parameters.append({
+                                "name": param_name,
+                                "type": param_info.get("type", "string"),
+                                "description": param_info.get("description"),
+                                "required": param_name in required
+                            })
                 
-                tool = Tool(
-                    name=tool_data["name"],
-                    description=tool_data.get("description", ""),
-                    parameters=parameters,
-                    server_id=self.server.id,
-                    schema=tool_data.get("inputSchema")
-                )
+                # Server data is untrusted, so validate it, but in a single pass
+                tool = Tool.model_validate({
+                    "name": tool_data["name"],
+                    "description": tool_data.get("description", ""),
+                    "parameters": parameters,
+                    "server_id": self.server.id,
+                    "schema": tool_data.get("inputSchema")
+                })
                 
                 tools.append(tool)
                 self._tools_cache[tool.name] = tool
@@ -173,10 +224,11 @@ class MCPClient:
                     error=f"Tool '{tool_call.tool_name}' not found"
                 )
             
-            if self.websocket:
-                result = await self._call_tool_websocket(tool_call)
-            else:
-                result = await self._call_tool_http(tool_call)
+            result = await self._rpc(
+                "tools/call",
+                {"name": tool_call.tool_name, "arguments": tool_call.parameters},
+                tool_call.call_id
+            )
             
             execution_time = time.time() - start_time
             
@@ -198,55 +250,15 @@ class MCPClient:
                 execution_time=execution_time
             )
     
-    async def _call_tool_websocket(self, tool_call: ToolCall) -> Any:
-        """Call tool via WebSocket."""
-        if not self.websocket:
-            raise ConnectionError("WebSocket not connected")
-        
-        message = {
-            "jsonrpc": "2.0",
-            "id": tool_call.call_id or str(uuid4()),
-            "method": "tools/call",
-            "params": {
-                "name": tool_call.tool_name,
-                "arguments": tool_call.parameters
-            }
-        }
-        
-        await self.websocket.send(json.dumps(message))
-        response = await self.websocket.recv()
-        data = json.loads(response)
-        
-        if "error" in data:
-            raise Exception(f"Tool call error: {data['error']}")
-        
-        return data.get("result")
-    
-    async def _call_tool_http(self, tool_call: ToolCall) -> Any:
-        """Call tool via HTTP."""
+    async def ping(self) -> bool:
+        """Check that the connected server still responds."""
+        if self.websocket:
+            await self._rpc("ping")
+            return True
         if not self.session:
-            raise ConnectionError("HTTP session not initialized")
-        
-        message = {
-            "jsonrpc": "2.0",
-            "id": tool_call.call_id or str(uuid4()),
-            "method": "tools/call",
-            "params": {
-                "name": tool_call.tool_name,
-                "arguments": tool_call.parameters
-            }
-        }
-        
-        async with self.session.post(
-            f"{self.server.endpoint}/tools/call",
-            json=message
-        ) as response:
-            data = await response.json()
-            
-            if "error" in data:
-                raise Exception(f"Tool call error: {data['error']}")
-            
-            return data.get("result")
+            return False
+        async with self.session.get(f"{self.server.endpoint}/health") as response:
+            return response.status == 200
     
     async def disconnect(self) -> None:
         """Disconnect from the MCP server."""
@@ -255,8 +267,13 @@ class MCPClient:
                 await self.websocket.close()
                 self.websocket = None
             
+            if self._reader_task:
+                self._reader_task.cancel()
+                self._reader_task = None
+            
             if self.session:
-                await self.session.close()
+                if self.session is not self.http_session:
+                    await self.session.close()
                 self.session = None
             
             self.server.status = MCPServerStatus.DISCONNECTED
@@ -4,21 +4,72 @@ Registry for managing multiple MCP server connections.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Set
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING, TypedDict
+
+import aiohttp
 
 from ..core.models import MCPServer, MCPServerStatus, Tool, ToolCall, ToolResult
 from .client import MCPClient
 
+if TYPE_CHECKING:
+    from ..biomcp.cache import ToolResultCache
+
 logger = logging.getLogger(__name__)
 
+# Recent search_tools queries whose results are kept until the tools change
+SEARCH_CACHE_SIZE = 128
+
+# Seconds to wait for each server's ping in health_check
+HEALTH_CHECK_TIMEOUT = 5.0
+
+
+class ServerStatusSummary(TypedDict):
+    """One server's entry in ``MCPRegistry.get_server_status_summary``."""
+    name: str
+    status: str
+    endpoint: str
+    tool_count: int
+    description: Optional[str]
+
 
 class MCPRegistry:
     """Registry for managing multiple MCP server connections."""
     
-    def __init__(self):
+    def __init__(self, cache: Optional['ToolResultCache'] = None):
+        """Create the registry.
+        
+        Pass ``cache`` only when the registered servers' tools are read-only:
+        successful results are then reused for identical calls to the same
+        server until they expire. Give it a path of its own; don't pass
+        ``biomcp.cache.tool_result_cache`` or another cache on its default
+        path, since separate instances don't coordinate writes to one shelve.
+        """
+        self._cache = cache
         self._servers: Dict[str, MCPServer] = {}
         self._clients: Dict[str, MCPClient] = {}
         self._tools_cache: Dict[str, Tool] = {}  # tool_name -> Tool
+        # Bumped whenever the available tools change, so callers can cache derived data
+        self.tools_version = 0
+        # (tool, lowercased name, lowercased description), rebuilt when tools change
+        self._search_index: List[Tuple[Tool, str, str]] = []
+        self._search_index_version = -1
+        self._search_results: "OrderedDict[Tuple[str, Optional[Tuple[str, ...]]], List[Tool]]" = OrderedDict()
+        self._http_session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the keep-alive HTTP pool shared by all HTTP MCP servers."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    limit_per_host=8,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300,
+                    force_close=False
+                )
+            )
+        return self._http_session
     
     def register_server(self, server: MCPServer) -> None:
         """Register a new MCP server."""
@@ -26,17 +77,11 @@ class MCPRegistry:
         self._clients[server.id] = MCPClient(server)
         logger.info(f"Registered MCP server: {server.name} ({server.id})")
     
-    def unregister_server(self, server_id: str) -> None:
-        """Unregister an MCP server."""
+    async def unregister_server(self, server_id: str) -> None:
+        """Unregister an MCP server, disconnecting it first."""
         if server_id in self._servers:
-            # Disconnect if connected
-            asyncio.create_task(self.disconnect_server(server_id))
-            
-            # Remove from caches
-            server = self._servers[server_id]
-            for tool in server.tools:
-                if tool.name in self._tools_cache:
-                    del self._tools_cache[tool.name]
+            # Also removes its tools from the cache
+            await self.disconnect_server(server_id)
             
             del self._servers[server_id]
             del self._clients[server_id]
@@ -50,12 +95,13 @@ class MCPRegistry:
             return False
         
         client = self._clients[server_id]
+        client.http_session = self._get_http_session()
         success = await client.connect()
         
         if success:
             # Update tools cache
-            for tool in client.get_available_tools():
-                self._tools_cache[tool.name] = tool
+            self._tools_cache.update((tool.name, tool) for tool in client.get_available_tools())
+            self.tools_version += 1
         
         return success
     
@@ -65,66 +111,68 @@ class MCPRegistry:
             client = self._clients[server_id]
             await client.disconnect()
             
-            # Remove tools from cache
-            server = self._servers[server_id]
-            for tool in server.tools:
-                if tool.name in self._tools_cache:
+            # Remove tools from cache, unless another server now provides them
+            for tool in self._servers[server_id].tools:
+                cached = self._tools_cache.get(tool.name)
+                if cached is not None and cached.server_id == server_id:
                     del self._tools_cache[tool.name]
+            self.tools_version += 1
+            
+            if self._cache is not None:
+                await self._cache.clear(self._cache_prefix(server_id))
     
     async def connect_all(self, server_ids: Optional[List[str]] = None) -> Dict[str, bool]:
         """Connect to all registered servers or specified servers."""
         if server_ids is None:
             server_ids = list(self._servers.keys())
         
-        results = {}
-        tasks = []
-        
-        for server_id in server_ids:
-            if server_id in self._servers:
-                task = asyncio.create_task(self.connect_server(server_id))
-                tasks.append((server_id, task))
+        server_ids = [server_id for server_id in server_ids if server_id in self._servers]
+        outcomes = await asyncio.gather(
+            *(self.connect_server(server_id) for server_id in server_ids),
+            return_exceptions=True
+        )
         
-        for server_id, task in tasks:
-            try:
-                results[server_id] = await task
-            except Exception as e:
-                logger.error(f"Failed to connect to server {server_id}: {e}")
-                results[server_id] = False
+        results = {}
+        for server_id, outcome in zip(server_ids, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to connect to server {server_id}: {outcome}")
+                outcome = False
+            results[server_id] = outcome
         
         return results
     
     async def disconnect_all(self) -> None:
         """Disconnect from all servers."""
-        tasks = []
-        
-        for server_id in self._servers:
-            task = asyncio.create_task(self.disconnect_server(server_id))
-            tasks.append(task)
+        await asyncio.gather(
+            *(self.disconnect_server(server_id) for server_id in self._servers),
+            return_exceptions=True
+        )
         
-        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._http_session:
+            await self._http_session.close()
+            self._http_session = None
     
-    async def call_tool(self, tool_name: str, parameters: Dict[str, any], call_id: Optional[str] = None) -> ToolResult:
+    async def call_tool(self, tool_name: str, parameters: Dict[str, Any], call_id: Optional[str] = None) -> ToolResult:
         """Call a tool by name across all connected servers."""
-        if tool_name not in self._tools_cache:
+        tool = self._tools_cache.get(tool_name)
+        if tool is None:
             return ToolResult(
                 call_id=call_id,
                 success=False,
                 error=f"Tool '{tool_name}' not found in any connected server"
             )
         
-        tool = self._tools_cache[tool_name]
         server_id = tool.server_id
-        
-        if server_id not in self._clients:
+        client = self._clients.get(server_id)
+        if client is None:
             return ToolResult(
                 call_id=call_id,
                 success=False,
                 error=f"Server '{server_id}' not available"
             )
         
-        client = self._clients[server_id]
-        
-        if self._servers[server_id].status != MCPServerStatus.CONNECTED:
+        # The client's server is the registered one, and its status is kept current
+        if client.server.status != MCPServerStatus.CONNECTED:
             return ToolResult(
                 call_id=call_id,
                 success=False,
@@ -137,7 +185,26 @@ class MCPRegistry:
             call_id=call_id
         )
         
-        return await client.call_tool(tool_call)
+        if self._cache is None:
+            return await client.call_tool(tool_call)
+        
+        fresh: Optional[ToolResult] = None
+        
+        async def fetch(_tool_name: str, _parameters: Dict[str, Any]) -> Any:
+            nonlocal fresh
+            fresh = await client.call_tool(tool_call)
+            # The cache never stores error results
+            return fresh.result if fresh.success else {"error": fresh.error}
+        
+        value = await self._cache.call(self._cache_prefix(server_id) + tool_name, parameters, fetch)
+        if fresh is not None:
+            return fresh
+        return ToolResult(call_id=call_id, success=True, result=value)
+    
+    @staticmethod
+    def _cache_prefix(server_id: str) -> str:
+        """Prefix of the result cache keys for a server's tools."""
+        return f"{server_id}/"
     
     def get_servers(self, status: Optional[MCPServerStatus] = None) -> List[MCPServer]:
         """Get servers, optionally filtered by status."""
@@ -177,22 +244,33 @@ class MCPRegistry:
     
     def search_tools(self, query: str, server_ids: Optional[List[str]] = None) -> List[Tool]:
         """Search for tools by name or description."""
-        tools = self.get_available_tools()
-        
-        if server_ids is not None:
-            tools = [t for t in tools if t.server_id in server_ids]
+        if self._search_index_version != self.tools_version:
+            self._search_index = [
+                (tool, tool.name.lower(), tool.description.lower())
+                for tool in self._tools_cache.values()
+            ]
+            self._search_index_version = self.tools_version
+            self._search_results.clear()
         
         query = query.lower()
-        matching_tools = []
+        key = (query, None if server_ids is None else tuple(sorted(set(server_ids))))
+        results = self._search_results.get(key)
+        if results is None:
+            servers = None if server_ids is None else set(server_ids)
+            results = [
+                tool for tool, name, description in self._search_index
+                if (servers is None or tool.server_id in servers)
+                and (query in name or query in description)
+            ]
+            self._search_results[key] = results
+            if len(self._search_results) > SEARCH_CACHE_SIZE:
+                self._search_results.popitem(last=False)
+        else:
+            self._search_results.move_to_end(key)
         
-        for tool in tools:
-            if (query in tool.name.lower() or 
-                query in tool.description.lower()):
-                matching_tools.append(tool)
-        
-        return matching_tools
+        return list(results)
     
-    def get_server_status_summary(self) -> Dict[str, Dict[str, any]]:
+    def get_server_status_summary(self) -> Dict[str, ServerStatusSummary]:
         """Get a summary of all server statuses."""
         summary = {}
         
@@ -207,20 +285,27 @@ class MCPRegistry:
         
         return summary
     
-    async def health_check(self) -> Dict[str, bool]:
-        """Perform health check on all servers."""
-        results = {}
+    async def health_check(self, timeout: float = HEALTH_CHECK_TIMEOUT) -> Dict[str, bool]:
+        """Probe every connected server concurrently.
         
-        for server_id, client in self._clients.items():
-            try:
-                server = self._servers[server_id]
-                if server.status == MCPServerStatus.CONNECTED:
-                    # Could implement a proper health check method in MCPClient
-                    results[server_id] = True
-                else:
-                    results[server_id] = False
-            except Exception as e:
-                logger.error(f"Health check failed for {server_id}: {e}")
-                results[server_id] = False
+        A server is healthy if it is connected and answers a ping within ``timeout`` seconds.
+        """
+        async def probe(client: MCPClient) -> bool:
+            if client.server.status != MCPServerStatus.CONNECTED:
+                return False
+            return await asyncio.wait_for(client.ping(), timeout)
+        
+        server_ids = list(self._clients)
+        outcomes = await asyncio.gather(
+            *(probe(self._clients[server_id]) for server_id in server_ids),
+            return_exceptions=True
+        )
+        
+        results = {}
+        for server_id, outcome in zip(server_ids, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Health check failed for {server_id}: {outcome!r}")
+                outcome = False
+            results[server_id] = outcome
         
         return results
@@ -0,0 +1,21 @@
+"""
+Event loop entry point for the demos and examples.
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run ``main`` to completion, on uvloop when it is installed.
+
+    ``uvloop.run`` replaces ``uvloop.install``, which is deprecated on
+    Python 3.12+; without uvloop this is plain ``asyncio.run``.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
@@ -3,10 +3,12 @@ Interactive UI session manager using Rich console.
 """
 
 import asyncio
+import functools
 import logging
-from typing import List, Optional
+from typing import Optional, Tuple
 
-from rich.console import Console
+from rich.console import Console, RenderableType
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
@@ -19,6 +21,48 @@ from ..core.models import ResearchContext
 console = Console()
 logger = logging.getLogger(__name__)
 
+# Rich markup for each MCPServerStatus value in /servers
+STATUS_LABELS = {
+    'connected': '[green]Connected[/green]',
+    'disconnected': '[red]Disconnected[/red]',
+    'connecting': '[yellow]Connecting[/yellow]',
+    'error': '[red]Error[/red]'
+}
+
+WELCOME_TEXT = """
+# Welcome to the Biomedical Agent Framework! 🧬
+
+I'm your research assistant specialized in biomedical research. I can help you with:
+
+- **Literature searches** and systematic reviews
+- **Genomics and proteomics** data analysis  
+- **Drug discovery** and molecular modeling
+- **Clinical data** interpretation
+- **Bioinformatics workflows**
+- **Data visualization** and statistical analysis
+
+## Available Commands:
+- `/help` - Show this help message
+- `/tools` - List available tools
+- `/servers` - Show server status
+- `/context` - Set research context
+- `/export` - Export conversation
+- `/clear` - Clear conversation history
+- `/quit` - Exit the session
+
+Just type your research question or request, and I'll help you find the answers!
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _welcome_panel() -> Panel:
+    """Build the welcome panel once; /help shows it again without reparsing the Markdown."""
+    return Panel(
+        Markdown(WELCOME_TEXT),
+        title="Biomedical Agent Framework",
+        border_style="blue"
+    )
+
 
 class InteractiveSession:
     """Interactive session manager for the biomedical agent."""
@@ -67,35 +111,7 @@ class InteractiveSession:
     
     def _show_welcome(self) -> None:
         """Show welcome message and instructions."""
-        welcome_text = """
-# Welcome to the Biomedical Agent Framework! 🧬
-
-I'm your research assistant specialized in biomedical research. I can help you with:
-
-- **Literature searches** and systematic reviews
-- **Genomics and proteomics** data analysis  
-- **Drug discovery** and molecular modeling
-- **Clinical data** interpretation
-- **Bioinformatics workflows**
-- **Data visualization** and statistical analysis
-
-## Available Commands:
-- `/help` - Show this help message
-- `/tools` - List available tools
-- `/servers` - Show server status
-- `/context` - Set research context
-- `/export` - Export conversation
-- `/clear` - Clear conversation history
-- `/quit` - Exit the session
-
-Just type your research question or request, and I'll help you find the answers!
-        """
-        
-        console.print(Panel(
-            Markdown(welcome_text),
-            title="Biomedical Agent Framework",
-            border_style="blue"
-        ))
+        console.print(_welcome_panel())
     
     async def _show_available_tools(self) -> None:
         """Show available tools from connected servers."""
@@ -135,33 +151,40 @@ Just type your research question or request, and I'll help you find the answers!
         )
     
     async def _process_message(self, message: str) -> None:
-        """Process a user message and display the response."""
-        # Show thinking indicator
-        with console.status("[bold green]Thinking..."):
-            try:
-                # Start session if needed
-                if self.session is None:
-                    self.session = await self.agent.start_session()
-                
-                # Process message
-                response = await self.agent.process_message(message)
-                
-                # Display response
-                self._display_response(response)
-                
-            except Exception as e:
-                console.print(f"[red]Error processing message: {e}[/red]")
-                logger.exception("Error processing message")
+        """Process a user message and display the response as it is generated."""
+        try:
+            # Start session if needed
+            if self.session is None:
+                self.session = await self.agent.start_session()
+            
+            # Show thinking indicator until the first chunk arrives, then the
+            # raw text as it streams; Live redraws it at most refresh_per_second
+            # times, and the Markdown is parsed once the response is complete
+            text = Text()
+            with Live(Text("Thinking...", style="bold green"), console=console, refresh_per_second=8) as live:
+                async for chunk in self.agent.process_message_stream(message):
+                    if not text:
+                        live.update(self._response_panel(text))
+                    text.append(chunk)
+                live.update(self._response_panel(Markdown(text.plain)), refresh=True)
+            
+            # Display tool usage from the completed response
+            self._display_tool_usage(self.agent.session.messages[-1])
+            
+        except Exception as e:
+            console.print(f"[red]Error processing message: {e}[/red]")
+            logger.exception("Error processing message")
     
-    def _display_response(self, response) -> None:
-        """Display the agent's response with formatting."""
-        # Main response
-        console.print(Panel(
-            Markdown(response.content),
+    def _response_panel(self, content: RenderableType) -> Panel:
+        """Frame the streaming text or the finished Markdown response."""
+        return Panel(
+            content,
             title="🤖 Agent Response",
             border_style="green"
-        ))
-        
+        )
+    
+    def _display_tool_usage(self, response) -> None:
+        """Display which tools the response used."""
         # Tool information if tools were used
         if response.tool_calls:
             console.print("\n[blue]🔧 Tools Used:[/blue]")
@@ -221,12 +244,7 @@ Just type your research question or request, and I'll help you find the answers!
             table.add_column("Endpoint", style="white")
             
             for server_id, info in status.items():
-                status_color = {
-                    'connected': '[green]Connected[/green]',
-                    'disconnected': '[red]Disconnected[/red]',
-                    'connecting': '[yellow]Connecting[/yellow]',
-                    'error': '[red]Error[/red]'
-                }.get(info['status'], info['status'])
+                status_color = STATUS_LABELS.get(info['status'], info['status'])
                 
                 table.add_row(
                     info['name'],
@@ -240,36 +258,23 @@ Just type your research question or request, and I'll help you find the answers!
         except Exception as e:
             console.print(f"[red]Error getting server status: {e}[/red]")
     
+    @staticmethod
+    def _ask_research_context() -> Tuple[str, str, str, str]:
+        """Prompt for every research context field; run in one worker thread."""
+        return (
+            Prompt.ask("Research domain (e.g., genomics, proteomics, drug_discovery)",
+                       default="", console=console),
+            Prompt.ask("Target organism (e.g., human, mouse, yeast)", default="", console=console),
+            Prompt.ask("Research question", default="", console=console),
+            Prompt.ask("Keywords (comma-separated)", default="", console=console),
+        )
+    
     async def _set_research_context(self) -> None:
         """Set research context for the session."""
         console.print("[blue]Setting Research Context[/blue]")
         
-        domain = await asyncio.to_thread(
-            Prompt.ask,
-            "Research domain (e.g., genomics, proteomics, drug_discovery)",
-            default="",
-            console=console
-        )
-        
-        organism = await asyncio.to_thread(
-            Prompt.ask,
-            "Target organism (e.g., human, mouse, yeast)",
-            default="",
-            console=console
-        )
-        
-        research_question = await asyncio.to_thread(
-            Prompt.ask,
-            "Research question",
-            default="",
-            console=console
-        )
-        
-        keywords = await asyncio.to_thread(
-            Prompt.ask,
-            "Keywords (comma-separated)",
-            default="",
-            console=console
+        domain, organism, research_question, keywords = await asyncio.to_thread(
+            self._ask_research_context
         )
         
         context = ResearchContext(
@@ -284,7 +289,7 @@ Just type your research question or request, and I'll help you find the answers!
             console.print("[green]Research context updated[/green]")
         else:
             # Store for when session is created
-            self.agent.config.research_context = context
+            self.agent.config = self.agent.config.model_copy(update={"research_context": context})
             console.print("[green]Research context will be applied to the next session[/green]")
     
     async def _export_conversation(self, format: str = 'json') -> None:
@@ -295,14 +300,13 @@ Just type your research question or request, and I'll help you find the answers!
         
         try:
             if format.lower() == 'markdown':
-                content = self.session.export_conversation('markdown')
-                filename = f"conversation_{self.session.session_id}.md"
+                format, extension = 'markdown', 'md'
             else:
-                content = self.session.export_conversation('json')
-                filename = f"conversation_{self.session.session_id}.json"
+                format, extension = 'json', 'json'
+            filename = f"conversation_{self.session.session_id}.{extension}"
             
-            with open(filename, 'w') as f:
-                f.write(content)
+            # Serialized and written in a worker thread, so long sessions don't block the loop
+            await self.session.export_to_file(filename, format)
             
             console.print(f"[green]Conversation exported to {filename}[/green]")
             
@@ -4,11 +4,12 @@ Basic tests for the biomedical agent framework.
 
 import pytest
 import asyncio
+import json
 from datetime import datetime
 
 from bioagent.core.models import (
     AgentConfiguration, AgentMessage, ResearchContext,
-    MCPServer, Tool, ToolParameter, ToolCall, ToolResult
+    MCPServer, MCPServerStatus, Tool, ToolParameter, ToolCall, ToolResult, SMOKE_TEST_MODEL
 )
 from bioagent.core.agent import BiomedicalAgent
 from bioagent.core.session import AgentSession
@@ -28,6 +29,9 @@ def test_agent_configuration():
     assert config.temperature == 0.5
     assert config.max_tokens == 2000  # default
 
+    smoke = AgentConfiguration(model_name="llama3.1", smoke_test=True)
+    assert smoke.model_name == SMOKE_TEST_MODEL
+
 
 def test_research_context():
     """Test research context creation."""
@@ -43,6 +47,22 @@ def test_research_context():
     assert len(context.keywords) == 3
 
 
+def test_configuration_is_frozen():
+    """Test that configuration models reject mutation and unknown fields."""
+    config = AgentConfiguration(research_context=ResearchContext(domain="genomics"))
+
+    with pytest.raises(ValueError):
+        config.temperature = 0.1
+    with pytest.raises(ValueError):
+        config.research_context.domain = "proteomics"
+    with pytest.raises(ValueError):
+        ResearchContext(domian="genomics")
+
+    updated = config.model_copy(update={"temperature": 0.1})
+    assert updated.temperature == 0.1
+    assert config.temperature == 0.7
+
+
 def test_mcp_server():
     """Test MCP server model."""
     server = MCPServer(
@@ -156,6 +176,130 @@ def test_mcp_registry():
     assert retrieved_server.name == "Test Server"
 
 
+@pytest.mark.asyncio
+async def test_mcp_registry_unregister_server():
+    """Test that unregistering disconnects the server and drops its tools."""
+    registry = MCPRegistry()
+    tool = Tool(name="pubmed_search", description="Search literature", server_id="test-server")
+    registry.register_server(MCPServer(id="test-server", name="Test Server",
+                                       endpoint="http://localhost:8000", tools=[tool]))
+    registry._tools_cache[tool.name] = tool
+    
+    await registry.unregister_server("test-server")
+    assert registry.get_servers() == []
+    assert registry.get_tool("pubmed_search") is None
+    
+    # A same-named tool now served by another server is kept
+    registry.register_server(MCPServer(id="test-server", name="Test Server",
+                                       endpoint="http://localhost:8000", tools=[tool]))
+    other = Tool(name="pubmed_search", description="Search literature", server_id="other")
+    registry._tools_cache[other.name] = other
+    await registry.disconnect_server("test-server")
+    assert registry.get_tool("pubmed_search") is other
+
+
+@pytest.mark.asyncio
+async def test_mcp_registry_caches_tool_results(tmp_path):
+    """Test that an opt-in result cache reuses successful MCP tool results."""
+    from unittest.mock import AsyncMock
+    from bioagent.biomcp.cache import ToolResultCache
+    
+    registry = MCPRegistry(cache=ToolResultCache(path=tmp_path / "results"))
+    server = MCPServer(id="test-server", name="Test Server", endpoint="http://localhost:8000",
+                       status=MCPServerStatus.CONNECTED)
+    registry.register_server(server)
+    registry._tools_cache["pubmed_search"] = Tool(name="pubmed_search", description="Search",
+                                                  server_id="test-server")
+    client = registry._clients["test-server"]
+    client.call_tool = AsyncMock(side_effect=[
+        ToolResult(success=False, error="timeout"),
+        ToolResult(success=True, result={"count": 3}),
+    ])
+    
+    assert not (await registry.call_tool("pubmed_search", {"query": "BRCA1"})).success
+    assert (await registry.call_tool("pubmed_search", {"query": "BRCA1"})).result == {"count": 3}
+    cached = await registry.call_tool("pubmed_search", {"query": "BRCA1"}, call_id="c3")
+    assert cached.result == {"count": 3} and cached.call_id == "c3"
+    assert client.call_tool.await_count == 2
+    
+    # Another server's tool of the same name has its own entries
+    registry.register_server(MCPServer(id="other-server", name="Other Server", endpoint="http://localhost:8001",
+                                       status=MCPServerStatus.CONNECTED))
+    registry._tools_cache["pubmed_search"] = Tool(name="pubmed_search", description="Search",
+                                                  server_id="other-server")
+    other = registry._clients["other-server"]
+    other.call_tool = AsyncMock(return_value=ToolResult(success=True, result={"count": 7}))
+    assert (await registry.call_tool("pubmed_search", {"query": "BRCA1"})).result == {"count": 7}
+    
+    # Disconnecting a server drops its cached results
+    await registry.disconnect_server("other-server")
+    registry._tools_cache["pubmed_search"] = Tool(name="pubmed_search", description="Search",
+                                                  server_id="other-server")
+    other.server.status = MCPServerStatus.CONNECTED
+    await registry.call_tool("pubmed_search", {"query": "BRCA1"})
+    assert other.call_tool.await_count == 2
+
+
+def test_mcp_registry_search_tools():
+    """Test tool search by name/description substring and server."""
+    registry = MCPRegistry()
+    for name, description, server_id in [("pubmed_search", "Search biomedical Literature", "a"),
+                                         ("variant_lookup", "Look up genomic variants", "b")]:
+        registry._tools_cache[name] = Tool(name=name, description=description, server_id=server_id)
+    registry.tools_version += 1
+    
+    assert [t.name for t in registry.search_tools("LITERATURE")] == ["pubmed_search"]
+    assert [t.name for t in registry.search_tools("_")] == ["pubmed_search", "variant_lookup"]
+    assert [t.name for t in registry.search_tools("_", server_ids=["b"])] == ["variant_lookup"]
+    assert registry.search_tools("literature") is not registry.search_tools("literature")
+    
+    del registry._tools_cache["pubmed_search"]
+    registry.tools_version += 1
+    assert registry.search_tools("literature") == []
+
+
+@pytest.mark.asyncio
+async def test_websocket_calls_are_matched_by_id():
+    """Test that concurrent WebSocket tool calls each get their own response."""
+    import websockets
+    from bioagent.mcp.client import MCPClient
+    
+    async def reply(ws, message):
+        if message["method"] == "initialize":
+            result = {"protocolVersion": "2024-11-05", "capabilities": {"tools": {}}}
+        elif message["method"] == "tools/list":
+            result = {"tools": [{"name": "echo", "description": "Echo arguments"}]}
+        elif message["method"] == "tools/call":
+            # Answer later calls first
+            await asyncio.sleep(0.1 - message["params"]["arguments"]["i"] * 0.04)
+            result = message["params"]["arguments"]
+        else:
+            result = {}
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}))
+    
+    notifications = []
+    
+    async def handler(ws):
+        async for frame in ws:
+            message = json.loads(frame)
+            if "id" in message:
+                asyncio.create_task(reply(ws, message))
+            else:
+                notifications.append(message["method"])
+    
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = next(iter(server.sockets)).getsockname()[1]
+        client = MCPClient(MCPServer(id="ws", name="WS", endpoint=f"ws://127.0.0.1:{port}"))
+        assert await client.connect()
+        assert notifications == ["notifications/initialized"]
+        
+        results = await asyncio.gather(*(
+            client.call_tool(ToolCall(tool_name="echo", parameters={"i": i})) for i in range(3)
+        ))
+        assert [result.result for result in results] == [{"i": 0}, {"i": 1}, {"i": 2}]
+        await client.disconnect()
+
+
 def test_agent_session():
     """Test agent session functionality."""
     from unittest.mock import Mock
@@ -189,6 +333,51 @@ def test_agent_session():
     assert "User messages: 1" in summary
 
 
+@pytest.mark.asyncio
+async def test_session_tool_usage_counts():
+    """Test that session summaries track roles and tool usage as messages arrive."""
+    from unittest.mock import Mock
+    
+    session = AgentSession(session_id="session-456", agent=Mock())
+    calls = [ToolCall(tool_name="gene_getter"), ToolCall(tool_name="article_searcher"),
+             ToolCall(tool_name="gene_getter")]
+    session.add_message(AgentMessage(id="1", timestamp=datetime.now(), role="user", content="BRCA1 gene"))
+    session.add_message(AgentMessage(id="2", timestamp=datetime.now(), role="assistant",
+                                     content="Done", tool_calls=calls))
+    
+    assert "Tool calls: 3" in session.get_conversation_summary()
+    assert session.get_session_state().active_tools == ["gene_getter", "article_searcher"]
+    analysis = await session.analyze_research_progress()
+    assert analysis["tool_usage"] == {"gene_getter": 2, "article_searcher": 1}
+    assert analysis["research_themes"] == ["gene"]
+    
+    session.clear_history(keep_last=1)
+    summary = session.get_conversation_summary()
+    assert "User messages: 0" in summary
+    assert "Assistant messages: 1" in summary
+    assert "Tool calls: 3" in summary
+
+
+@pytest.mark.asyncio
+async def test_session_export_to_file(tmp_path):
+    """Test exporting a session transcript to disk."""
+    from unittest.mock import Mock
+    
+    session = AgentSession(session_id="session-123", agent=Mock())
+    session.add_message(AgentMessage(
+        id="msg-1",
+        timestamp=datetime.now(),
+        role="user",
+        content="Test message"
+    ))
+    
+    path = await session.export_to_file(tmp_path / "session.json")
+    assert path.read_text() == session.export_conversation("json")
+    
+    path = await session.export_to_file(str(tmp_path / "session.md"), "markdown")
+    assert path.read_text() == session.export_conversation("markdown")
+
+
 @pytest.mark.asyncio
 async def test_biomedical_agent_creation():
     """Test biomedical agent creation."""
@@ -213,5 +402,307 @@ async def test_biomedical_agent_creation():
     assert len(servers) == 1
 
 
+@pytest.mark.asyncio
+async def test_ollama_context_reuse():
+    """Test that a returned Ollama context replaces the prompt prefix."""
+    agent = BiomedicalAgent(AgentConfiguration(reuse_llm_context=True))
+    await agent.start_session()
+    assert agent._conversation_context() == agent._prepare_context()
+    assert "context" not in agent._ollama_payload("prompt")
+    
+    agent._remember_ollama_context({"response": "ok", "done": True, "context": [1, 2, 3]})
+    assert agent._conversation_context() == ""
+    assert agent._ollama_payload("prompt")["context"] == [1, 2, 3]
+    
+    await agent.start_session()
+    assert agent._ollama_context is None
+
+
+@pytest.mark.asyncio
+async def test_prompt_prefix_is_shared():
+    """Test that every prompt starts with the same static prefix."""
+    agent = BiomedicalAgent(AgentConfiguration(research_context=ResearchContext(domain="genomics")))
+    prefix = agent._prompt_prefix()
+    assert "genomics" in prefix
+    
+    await agent.start_session()
+    agent.session.add_message(AgentMessage(id="msg-1", timestamp=datetime.now(), role="user", content="Hi"))
+    assert agent._prompt_prefix() is prefix
+    assert agent._prepare_context().startswith(prefix)
+    
+    agent.session.update_context(ResearchContext(domain="proteomics"))
+    assert "proteomics" in agent._prompt_prefix()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_messages_keep_their_own_context():
+    """Test that concurrent messages are prompted with only the history before them."""
+    agent = BiomedicalAgent(AgentConfiguration())
+    prompts = {}
+    
+    async def call_llm(prompt, max_tokens=None, response_format=None):
+        question = prompt.rsplit("User: ", 1)[1].split("\n")[0]
+        prompts[question] = prompt
+        await asyncio.sleep(0)
+        return f"answer to {question}"
+    
+    agent._call_llm = call_llm
+    await agent.process_message("STEP0")
+    responses = await agent.process_messages(["STEP1", "STEP2", "STEP3"])
+    assert [response.content for response in responses] == ["answer to STEP1", "answer to STEP2", "answer to STEP3"]
+    for step in ("STEP1", "STEP2", "STEP3"):
+        assert "answer to STEP0" in prompts[step]
+        assert [s for s in ("STEP1", "STEP2", "STEP3") if s in prompts[step]] == [step]
+        assert prompts[step].count(step) == 1
+    assert [m.content for m in agent.session.messages[2:]] == [
+        "STEP1", "answer to STEP1", "STEP2", "answer to STEP2", "STEP3", "answer to STEP3"
+    ]
+    
+    # Concurrent single messages never see their own question twice
+    await asyncio.gather(agent.process_message("STEP4"), agent.process_message("STEP5"))
+    assert prompts["STEP4"].count("STEP4") == 1 and "STEP5" not in prompts["STEP4"]
+    assert prompts["STEP5"].count("STEP5") == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_llm_errors():
+    """Test that a failed stream yields the error text and is marked as an error."""
+    from bioagent.core.agent import LLMError
+    
+    agent = BiomedicalAgent(AgentConfiguration())
+    
+    async def failing_stream(prompt, max_tokens=None):
+        yield "partial "
+        raise LLMError("Connection error")
+    
+    agent._stream_ollama = failing_stream
+    chunks = [chunk async for chunk in agent.process_message_stream("Hello")]
+    
+    assert chunks == ["partial ", "Connection error"]
+    assert agent.session.messages[-1].content == "partial Connection error"
+    assert agent.session.messages[-1].metadata == {"error": True}
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_runs_concurrently():
+    """Test that tool calls overlap and results keep call order."""
+    agent = BiomedicalAgent(AgentConfiguration())
+    running = []
+    
+    async def call_tool(tool_name, parameters, call_id=None):
+        running.append(tool_name)
+        await asyncio.sleep(0.01)
+        assert len(running) == 2
+        if tool_name == "broken":
+            raise RuntimeError("boom")
+        return ToolResult(call_id=call_id, success=True, result=tool_name)
+    
+    agent.mcp_registry.call_tool = call_tool
+    results = await agent._execute_tool_calls([
+        ToolCall(tool_name="working", parameters={}, call_id="a"),
+        ToolCall(tool_name="broken", parameters={}, call_id="b"),
+    ])
+    
+    assert [r.call_id for r in results] == ["a", "b"]
+    assert results[0].result == "working"
+    assert not results[1].success and results[1].error == "boom"
+
+
+def test_tool_prompt_serializes_results():
+    """Test that structured tool results reach the prompt as JSON."""
+    agent = BiomedicalAgent(AgentConfiguration())
+    calls = [ToolCall(tool_name="gget_info", parameters={}), ToolCall(tool_name="pubmed_search", parameters={})]
+    results = [
+        ToolResult(call_id="a", success=True, result={"ENSG1": {"symbol": "BRCA1", "length": None}}),
+        ToolResult(call_id="b", success=True, result="3 articles"),
+    ]
+    prompt = agent._build_tool_prompt("Tell me about BRCA1", "", calls, results)
+    
+    line = next(l for l in prompt.splitlines() if l.startswith("Tool gget_info: "))
+    assert json.loads(line[len("Tool gget_info: "):]) == {"ENSG1": {"symbol": "BRCA1", "length": None}}
+    assert "Tool pubmed_search: 3 articles" in prompt
+
+
+@pytest.mark.asyncio
+async def test_identify_tool_calls_uses_keyword_index():
+    """Test keyword-based tool selection and index rebuilds."""
+    agent = BiomedicalAgent(AgentConfiguration())
+    registry = agent.mcp_registry
+    for name, description in [("pubmed_search", "Search biomedical literature"),
+                              ("variant_lookup", "Look up genomic variants")]:
+        registry._tools_cache[name] = Tool(name=name, description=description, server_id="test")
+    registry.tools_version += 1
+    
+    calls = await agent._identify_tool_calls("Find literature and variants for BRCA1", "")
+    assert [call.tool_name for call in calls] == ["pubmed_search"]
+    assert await agent._identify_tool_calls("Hello", "") == []
+    
+    del registry._tools_cache["pubmed_search"]
+    registry.tools_version += 1
+    calls = await agent._identify_tool_calls("Find literature and variants for BRCA1", "")
+    assert [call.tool_name for call in calls] == ["variant_lookup"]
+
+
+@pytest.mark.asyncio
+async def test_available_tools_are_described_once():
+    """Test that BioMCP tool descriptions are built once and reused."""
+    agent = BiomedicalAgent(AgentConfiguration())
+    first = await agent.get_available_tools()
+    second = await agent.get_available_tools()
+    
+    assert first == second
+    assert first[0] is second[0]
+    assert {"name", "description", "server", "parameters"} <= set(first[0])
+
+
+@pytest.mark.asyncio
+async def test_response_cache_namespace_includes_token_cap():
+    """Test that replies capped by max_tokens are cached apart from full-length ones."""
+    agent = BiomedicalAgent(AgentConfiguration(max_tokens=2000))
+    await agent.start_session()
+    assert agent._response_cache_namespace([], 128) != agent._response_cache_namespace([])
+    assert agent._response_cache_namespace([], 2000) == agent._response_cache_namespace([])
+
+
+def test_semantic_cache(tmp_path):
+    """Test semantic cache lookups, namespaces and persistence."""
+    from bioagent.core.semantic_cache import SemanticCache
+    
+    response = AgentMessage(id="msg-1", timestamp=datetime.now(), role="assistant", content="BRCA1 answer")
+    cache = SemanticCache(path=tmp_path / "responses", threshold=0.85)
+    assert cache.lookup("llama3.1", "What does BRCA1 do?") is None
+    
+    cache.insert("llama3.1", "What does BRCA1 do?", response)
+    hit, similarity = cache.lookup("llama3.1", "what does BRCA1 do")
+    assert hit.content == "BRCA1 answer"
+    assert similarity >= 0.85
+    assert cache.lookup("llama3.1", "Summarize clinical trials for TP53 inhibitors") is None
+    assert cache.lookup("other-model", "What does BRCA1 do?") is None
+    # Prompts differing only by gene symbol never share an answer
+    assert cache.lookup("llama3.1", "What does BRCA2 do?") is None
+    
+    # Entries expire after the TTL
+    expired = SemanticCache(path=None, threshold=0.85, ttl=0)
+    expired.insert("llama3.1", "What does BRCA1 do?", response)
+    assert expired.lookup("llama3.1", "What does BRCA1 do?") is None
+    
+    # Batched embeddings can stand in for embedding the prompt again
+    embeddings = cache.embed_many(["what does BRCA1 do", "TP53 inhibitor trials"])
+    assert len(embeddings) == 2
+    assert cache.lookup("llama3.1", "what does BRCA1 do", embeddings[0])[0].content == "BRCA1 answer"
+    assert cache.lookup("llama3.1", "TP53 inhibitor trials", embeddings[1]) is None
+    
+    # A fresh instance reads the entries back from disk
+    reloaded = SemanticCache(path=tmp_path / "responses", threshold=0.85)
+    assert reloaded.lookup("llama3.1", "What does BRCA1 do?")[0].content == "BRCA1 answer"
+    
+    reloaded.clear()
+    assert reloaded.lookup("llama3.1", "What does BRCA1 do?") is None
+
+
+@pytest.mark.asyncio
+async def test_tool_result_cache(tmp_path):
+    """Test tool result cache keys and persistence."""
+    from bioagent.biomcp.cache import ToolResultCache
+    
+    key = ToolResultCache.make_key("article_searcher", {"keywords": "SNCA", "page_size": 5})
+    assert key == ToolResultCache.make_key("article_searcher", {"page_size": 5, "keywords": "SNCA"})
+    
+    cache = ToolResultCache(path=tmp_path / "results")
+    assert await cache.get(key) == (False, None)
+    await cache.set(key, "cached result")
+    
+    # A fresh instance reads the entry back from disk
+    reloaded = ToolResultCache(path=tmp_path / "results")
+    assert await reloaded.get(key) == (True, "cached result")
+    
+    expired = ToolResultCache(path=tmp_path / "results", ttl=0)
+    assert await expired.get(key) == (False, None)
+    
+    per_tool = ToolResultCache(path=tmp_path / "results", ttl=0, tool_ttls={"article_searcher": 60})
+    assert await per_tool.get(key) == (True, "cached result")
+    
+    # Per-tool TTLs also apply to the server-prefixed keys MCPRegistry uses
+    server_key = ToolResultCache.make_key("biomcp/article_searcher", {"keywords": "SNCA"})
+    await per_tool.set(server_key, "server result")
+    assert await per_tool.get(server_key) == (True, "server result")
+
+
+@pytest.mark.asyncio
+async def test_biomcp_client_cache(tmp_path):
+    """Test that the BioMCP client serves repeat calls from its cache."""
+    from bioagent.biomcp.cache import ToolResultCache
+    from bioagent.biomcp.client import BioMCPClient
+    
+    client = BioMCPClient(cache=ToolResultCache(path=tmp_path / "results"))
+    calls = []
+    
+    async def invoke(tool_name, params):
+        calls.append(tool_name)
+        return f"{tool_name} result"
+    
+    client._invoke = invoke
+    call = ToolCall(tool_name="pubmed_search", parameters={"query": "BRCA1"})
+    first = await client.call_tool(call)
+    second = await client.call_tool(call)
+    
+    assert first.result == second.result == "pubmed_search result"
+    assert calls == ["pubmed_search"]
+
+
+@pytest.mark.asyncio
+async def test_biomcp_client_coalesces_inflight_calls():
+    """Test that identical concurrent calls share one upstream request."""
+    from bioagent.biomcp.client import BioMCPClient
+    
+    client = BioMCPClient()
+    calls = []
+    
+    async def invoke(tool_name, params):
+        calls.append(tool_name)
+        await asyncio.sleep(0.01)
+        return f"{tool_name} result"
+    
+    client._invoke = invoke
+    results = await asyncio.gather(
+        client.call_tool(ToolCall(tool_name="pubmed_search", parameters={"query": "BRCA1"}, call_id="a")),
+        client.call_tool(ToolCall(tool_name="pubmed_search", parameters={"query": "BRCA1"}, call_id="b")),
+        client.call_tool(ToolCall(tool_name="pubmed_search", parameters={"query": "TP53"}, call_id="c"))
+    )
+    
+    assert [r.call_id for r in results] == ["a", "b", "c"]
+    assert all(r.success for r in results)
+    assert calls == ["pubmed_search", "pubmed_search"]
+    assert client._inflight == {}
+    
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_tool_call_keeps_its_pool_slot(monkeypatch):
+    """Test that a timed-out call holds its pool slot until its work finishes."""
+    import time
+    from bioagent.biomcp import tools as tools_module
+    
+    monkeypatch.setitem(tools_module.TOOL_TIMEOUTS, "slow_tool", 0.05)
+    tools = tools_module.BioMCPTools()
+    tools.set_concurrency_limits({"slow_tool": 1})
+    events = []
+    
+    async def dispatch(tool_name, params):
+        events.append(("start", params["n"]))
+        await asyncio.to_thread(time.sleep, 0.2)
+        events.append(("end", params["n"]))
+        return params["n"]
+    
+    tools._dispatch = dispatch
+    with pytest.raises(asyncio.TimeoutError):
+        await tools.call_tool("slow_tool", {"n": 1})
+    
+    monkeypatch.setitem(tools_module.TOOL_TIMEOUTS, "slow_tool", 1.0)
+    assert await tools.call_tool("slow_tool", {"n": 2}) == 2
+    assert events == [("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])